@@ -0,0 +1,97 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Offline benchmark of the Blueprint, Deployment and teardown flows.
+
+Replays a cassette through Session, so each flow runs through the whole
+client stack with no network. Pass a cassette recorded from a real org
+(see caspyr.cassette) to replay its traffic. Without one, a synthetic
+cassette with the given number of deployments is used.
+
+Usage: python -m benchmarks.bench_flows [deployments] [latency_ms] [cassette]
+"""
+
+import sys
+import time
+
+from caspyr import Blueprint, Cassette, Deployment, Session
+
+BLUEPRINT_ID = 'blueprint-1'
+PAGE_SIZE = 200
+
+
+def synthetic_cassette(count):
+    cassette = Cassette()
+    baseurl = Session('token').baseurl
+    deployments = [{'id': f'deployment-{i}',
+                    'name': f'web-{i}',
+                    'description': '',
+                    'templateLink': '',
+                    'iconLink': '',
+                    'createdAt': '2019-09-01T00:00:00Z',
+                    'createdBy': 'user',
+                    'updatedAt': '2019-09-01T00:00:00Z',
+                    'updatedBy': 'user',
+                    'inputs': {'count': 1},
+                    'resourceLinks': []}
+                   for i in range(count)]
+    cassette.add('GET', f'{baseurl}/blueprint/api/blueprints/?page=0&size={PAGE_SIZE}',
+                 body={'content': [{'id': BLUEPRINT_ID, 'name': 'web'}],
+                       'totalElements': 1})
+    cassette.add('GET', f'{baseurl}/blueprint/api/blueprints/{BLUEPRINT_ID}/inputs-schema',
+                 body={'type': 'object', 'properties': {'count': {'type': 'integer'}}})
+    cassette.add('POST', f'{baseurl}/blueprint/api/blueprint-requests',
+                 status=202, body={'id': 'request-1', 'status': 'STARTED'})
+    # List methods follow every page of page and size, as Session does.
+    for skip in range(0, max(count, 1), PAGE_SIZE):
+        cassette.add('GET', f'{baseurl}/deployment/api/deployments'
+                            f'?page={skip // PAGE_SIZE}&size={PAGE_SIZE}',
+                     body={'content': deployments[skip:skip + PAGE_SIZE],
+                           'totalElements': count})
+    for d in deployments:
+        cassette.add('GET', f'{baseurl}/deployment/api/deployments/{d["id"]}', body=d)
+        cassette.add('DELETE', f'{baseurl}/deployment/api/deployments/{d["id"]}',
+                     body={'id': d['id']})
+    cassette.add('DELETE', f'{baseurl}/blueprint/api/blueprints/{BLUEPRINT_ID}',
+                 status=204)
+    return cassette
+
+
+def blueprint_flow(session):
+    for blueprint in Blueprint.list(session):
+        Blueprint.get_inputs(session, blueprint['id'])
+        Blueprint.request(session, blueprint['id'], 'web', 'project-1',
+                          inputs={'count': 1})
+
+
+def deployment_flow(session):
+    for d in Deployment.list(session):
+        Deployment.describe(session, d['id'])
+
+
+def teardown_flow(session):
+    for d in Deployment.list(session):
+        Deployment.delete(session, d['id'])
+    Blueprint.delete(session, BLUEPRINT_ID)
+
+
+def main(count=200, latency_ms=0, path=None):
+    cassette = Cassette(path) if path else synthetic_cassette(count)
+    session = Session('token', transport=cassette.player(latency=latency_ms / 1000))
+    print(f'{len(cassette.interactions)} recorded interactions, '
+          f'{latency_ms} ms replay latency')
+    for name, flow in (('blueprint', blueprint_flow),
+                       ('deployment', deployment_flow),
+                       ('teardown', teardown_flow)):
+        cassette.rewind()
+        started = time.perf_counter()
+        flow(session)
+        elapsed = time.perf_counter() - started
+        print(f'{name:>10}: {elapsed * 1000:8.2f} ms')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    main(*[int(a) for a in args[:2]], *args[2:3])
@@ -0,0 +1,72 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Import-time benchmark of the caspyr package.
+
+Runs each statement in a fresh interpreter under python -X importtime,
+several times, and reports the best cumulative import time of caspyr and
+of requests, and whether requests was imported at all. import caspyr
+and importing a resource class should not pull in requests; only
+Session does. With a budget in milliseconds, exits non-zero if import
+caspyr takes longer, so it can guard against regressions in CI.
+
+-X importtime needs Python 3.7 or later.
+
+Usage: python -m benchmarks.bench_import [repeats] [budget_ms]
+"""
+
+import subprocess
+import sys
+
+STATEMENTS = ('import caspyr',
+              'from caspyr import Project, Machine',
+              'from caspyr import Session')
+
+
+def import_times(statement):
+    """
+    Returns the microseconds spent importing caspyr and its submodules,
+    including everything they import, and the names of every module
+    imported, from one fresh interpreter running statement.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True)
+    total = 0
+    modules = set()
+    started = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # Everything at the top level from caspyr on was imported by the
+        # statement. Submodules loaded on first attribute access are not
+        # listed themselves, but what they import is, at the top level.
+        started = started or name.strip() == 'caspyr'
+        if started and not name.startswith('  '):
+            total += int(cumulative)
+    return total, modules
+
+
+def main(repeats=5, budget_ms=None):
+    for statement in STATEMENTS:
+        runs = [import_times(statement) for _ in range(repeats)]
+        best = min(total for total, _ in runs)
+        requests = 'requests' in runs[0][1]
+        print(f'{statement:<36} {best / 1000:7.2f} ms, '
+              f'requests {"imported" if requests else "not imported"}')
+        if statement == 'import caspyr':
+            import_caspyr = best
+    if budget_ms is not None and import_caspyr > budget_ms * 1000:
+        print(f'import caspyr took {import_caspyr / 1000:.2f} ms, over the '
+              f'{budget_ms} ms budget')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
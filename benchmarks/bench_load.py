@@ -0,0 +1,53 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Load test of paging through machines on the local fake CAS API.
+
+Starts caspyr.fakeserver with synthetic machines and a lognormal latency,
+then fetches every page of /iaas/api/machines from a thread pool sharing
+one Session, once for each worker count, to compare pool and concurrency
+settings.
+
+Usage: python -m benchmarks.bench_load [machines] [latency_ms] [page_size]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from caspyr import Session
+from caspyr.fakeserver import FakeCAS
+
+
+def fetch_all(session, total, page_size, workers):
+    url = f'{session.baseurl}/iaas/api/machines'
+
+    def page(skip):
+        return session._request(f'{url}?$top={page_size}&$skip={skip}')['content']
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(len(p) for p in pool.map(page, range(0, total, page_size)))
+
+
+def main(machines=100000, latency_ms=20, page_size=200):
+    latency = FakeCAS.lognormal(latency_ms / 1000, 0.5) if latency_ms else None
+    with FakeCAS(machines=machines, latency=latency) as server:
+        print(f'{machines} machines, {page_size} per page, '
+              f'{latency_ms} ms median latency')
+        for workers in (1, 4, 16, 32):
+            with Session.login('refresh',
+                               baseurl=server.url,
+                               csp_url=server.url,
+                               pool_maxsize=workers,
+                               auto_refresh=False) as session:
+                started = time.perf_counter()
+                count = fetch_all(session, machines, page_size, workers)
+                elapsed = time.perf_counter() - started
+            print(f'{workers:>3} workers: {count} machines in {elapsed:6.2f} s, '
+                  f'{count / elapsed:9.0f} machines/s')
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:4]])
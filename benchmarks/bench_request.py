@@ -0,0 +1,89 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Micro-benchmark for the Session._request hot path.
+
+Serves a large canned /iaas/api/machines listing from a stubbed transport
+and compares the current _request with the previous implementation, which
+decoded the body once for the debug line and again for the return value
+and built its log messages even with DEBUG disabled. The current path is
+timed with both the standard library codec and the default codec.
+
+Usage: python -m benchmarks.bench_request [machines] [repeats]
+"""
+
+import json
+import logging
+import sys
+import timeit
+from unittest import mock
+
+import requests
+
+from caspyr import Session
+from caspyr.codec import JSONCodec, default_codec
+
+logger = logging.getLogger('caspyr.session')
+
+
+def canned_machines(count):
+    machines = []
+    for i in range(count):
+        machines.append({
+            'id': f'machine-{i}',
+            'name': f'Cloud_Machine_{i}',
+            'powerState': 'ON',
+            'address': f'10.0.{i // 256 % 256}.{i % 256}',
+            'externalRegionId': 'us-west-1',
+            'customProperties': {f'property{n}': f'value{n}' for n in range(20)},
+            '_links': {'network-interfaces': {
+                'hrefs': [f'/iaas/api/machines/machine-{i}/network-interfaces/0']
+            }}
+        })
+    return json.dumps({'content': machines,
+                       'totalElements': count}).encode()
+
+
+def canned_response(body):
+    r = requests.Response()
+    r.status_code = 200
+    r._content = body
+    r.encoding = 'utf-8'
+    return r
+
+
+def legacy_request(session, url):
+    """The GET branch of Session._request before the single-decode change."""
+    r = session._send('GET', url)
+    logger.debug(f'GET to {url} \n'
+                 f'with headers {session.headers} \n'
+                 f'Status code" {r.status_code} \n'
+                 )
+    logger.debug(f'Request response: {r.json()}')
+    r.raise_for_status()
+    return r.json()
+
+
+def main(count=5000, repeats=20):
+    body = canned_machines(count)
+    session = Session('token')
+    url = f'{session.baseurl}/iaas/api/machines'
+    logger.setLevel(logging.INFO)
+    print(f'{count} machines, {len(body) / 1e6:.1f} MB body, '
+          f'best of {repeats} runs, DEBUG disabled')
+    fast = Session('token', codec=default_codec())
+    stdlib = Session('token', codec=JSONCodec())
+    cases = (('legacy', session, lambda: legacy_request(session, url)),
+             ('json', stdlib, lambda: stdlib._request(url)),
+             (fast.codec.name, fast, lambda: fast._request(url)))
+    for name, s, fn in cases:
+        with mock.patch.object(s._http, 'request',
+                               side_effect=lambda *a, **k: canned_response(body)):
+            best = min(timeit.repeat(fn, number=1, repeat=repeats))
+        print(f'{name:>8}: {best * 1000:8.2f} ms per call')
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
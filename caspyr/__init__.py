@@ -3,33 +3,83 @@ Grant Orchard. It allows you to interact with the
 VMware Cloud Automation Services APIs in a programmatic manner.
 """
 
+import importlib
+import sys
 
-from .session import Session
-from .blueprint import Blueprint
-from .cloudaccount import CloudAccount
-from .cloudaccount import CloudAccountAws
-from .cloudaccount import CloudAccountAzure
-from .cloudaccount import CloudAccountvSphere
-from .cloudaccount import CloudAccountNSXT
-from .request import Request
-from .region import Region
-from .deployment import Deployment
-from .project import Project
-from .fabric import Image
-from .fabric import AzureStorageAccount
-from .fabric import NetworkFabric
-from .fabric import Flavor
-from .mapping import FlavorMapping
-from .mapping import ImageMapping
-from .mapping import StorageProfile
-from .mapping import StorageProfileAWS
-from .mapping import StorageProfileAzure
-from .mapping import StorageProfilevSphere
-from .mapping import NetworkProfile
-from .zone import CloudZone
-from .codestream import CodeStream
-from .user import User
-from .iaas import Machine, Network
-from .datacollector import DataCollector
-from .extensibility import Subscription,Action
-from .integration import Source,Integration,CatalogSource
+# Public names and the submodules defining them. A submodule, and with it
+# requests, is only imported the first time one of its names is used, so
+# that import caspyr stays cheap for short-lived processes.
+_EXPORTS = {
+    'Session': 'session',
+    'SessionPool': 'pool',
+    'AsyncSession': 'aio',
+    'RetryPolicy': 'retry',
+    'RateLimiter': 'ratelimit',
+    'ResponseCache': 'cache',
+    'SingleFlight': 'singleflight',
+    'TokenCache': 'tokencache',
+    'DeadlineExceeded': 'deadline',
+    'CircuitBreaker': 'breaker',
+    'CircuitOpen': 'breaker',
+    'Cassette': 'cassette',
+    'RequestStats': 'stats',
+    'Blueprint': 'blueprint',
+    'CloudAccount': 'cloudaccount',
+    'CloudAccountAws': 'cloudaccount',
+    'CloudAccountAzure': 'cloudaccount',
+    'CloudAccountvSphere': 'cloudaccount',
+    'CloudAccountNSXT': 'cloudaccount',
+    'Request': 'request',
+    'Region': 'region',
+    'Deployment': 'deployment',
+    'Project': 'project',
+    'Image': 'fabric',
+    'AzureStorageAccount': 'fabric',
+    'NetworkFabric': 'fabric',
+    'Flavor': 'fabric',
+    'FlavorMapping': 'mapping',
+    'ImageMapping': 'mapping',
+    'StorageProfile': 'mapping',
+    'StorageProfileAWS': 'mapping',
+    'StorageProfileAzure': 'mapping',
+    'StorageProfilevSphere': 'mapping',
+    'NetworkProfile': 'mapping',
+    'CloudZone': 'zone',
+    'CodeStream': 'codestream',
+    'User': 'user',
+    'Machine': 'iaas',
+    'Network': 'iaas',
+    'DataCollector': 'datacollector',
+    'Subscription': 'extensibility',
+    'Action': 'extensibility',
+    'Source': 'integration',
+    'Integration': 'integration',
+    'CatalogSource': 'integration',
+}
+
+# Submodules that import caspyr used to make available as attributes.
+_SUBMODULES = frozenset(_EXPORTS.values()) | {
+    'bulk', 'codec', 'odata', 'stream', 'tracing'}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) needs Python 3.7, so import eagerly.
+    for _name in _EXPORTS:
+        __getattr__(_name)
@@ -0,0 +1,856 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for driving the CAS APIs from asyncio.
+
+AsyncSession is the awaitable counterpart of Session, and the classes in
+this module are awaitable versions of the resource classes. They do not
+repeat any URI or payload construction: each call is planned by running
+the synchronous method against a stand-in session that captures the
+request it would make, and the captured request is then awaited on the
+AsyncSession. Results are built with the same model classes.
+
+Requires aiohttp (pip install caspyr[async]).
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+import requests
+
+from . import blueprint as _blueprint
+from . import cloudaccount as _cloudaccount
+from . import deployment as _deployment
+from . import iaas as _iaas
+from . import mapping as _mapping
+from . import project as _project
+from . import request as _request
+from . import zone as _zone
+from . import bulk
+from . import deadline
+from . import tracing
+from .codec import default_codec
+from .retry import RetryPolicy
+from .session import Session, _body_size, _has_next, _page_url
+from .stats import RequestStats, route
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Planned(Exception):
+    """
+    Raised by _PlanningSession to hand back the request a method makes.
+    """
+    def __init__(self, url, request_method, payload):
+        super().__init__(url)
+        self.url = url
+        self.request_method = request_method
+        self.payload = payload
+
+
+class _PlanningSession(object):
+    """
+    Stands in for a Session and captures the first call made through it.
+    """
+    def __init__(self, session):
+        self.baseurl = session.baseurl
+        self.csp_url = session.csp_url
+        self.headers = session.headers
+        self.token = session.token
+
+    def _request(self,
+                 url,
+                 request_method='GET',
+                 payload=None,
+                 **kwargs
+                 ):
+        raise _Planned(url, request_method, payload)
+
+    def _list(self, url, lazy=False, key='content', prefetch=0):
+        raise _Planned(url, 'GET', None)
+
+    def _pages(self, url, key='content', page_size=200, prefetch=0):
+        raise _Planned(url, 'GET', None)
+
+
+def _plan(fn, session, *args, **kwargs):
+    try:
+        fn(_PlanningSession(session), *args, **kwargs)
+    except _Planned as p:
+        return p
+    raise TypeError(f'{fn.__qualname__} does not make a request.')
+
+
+class AsyncSession(object):
+    """
+    Session class for instantiating a logged in asyncio session
+    for VMware Cloud Services.
+
+    Requires refresh token from VMware Cloud Services portal to instantiate.
+    The underlying aiohttp connection pool is created on first use inside
+    the running event loop. Call close() when finished, or use the session
+    as an async context manager.
+
+    Sessions created with login() track when their access token expires and
+    refresh it before a request is sent with a stale one.
+    """
+    refresh_margin = Session.refresh_margin
+
+    def __init__(self,
+                 auth_token,
+                 limit=100,
+                 limit_per_host=10,
+                 retry=None,
+                 rate_limiter=None,
+                 codec=None,
+                 cache=None,
+                 single_flight=None,
+                 timeout=(10, 60),
+                 breaker=None,
+                 request_stats=None,
+                 on_request=None,
+                 on_response=None,
+                 on_error=None,
+                 tracer=None,
+                 baseurl='https://api.mgmt.cloud.vmware.com',
+                 csp_url='https://console.cloud.vmware.com'
+                 ):
+        """
+        :param auth_token: The access token used to authenticate requests.
+        :param limit: The total number of connections the pool may hold,
+        defaults to 100.
+        :param limit_per_host: The number of connections held per host,
+        defaults to 10.
+        :param retry: The RetryPolicy applied to idempotent requests,
+        defaults to RetryPolicy().
+        :param rate_limiter: A RateLimiter throttling requests per host.
+        It may be shared with other sessions. Defaults to None (no limit).
+        :param codec: The JSON codec for request and response bodies, any
+        object with dumps and loads. Defaults to orjson when installed,
+        otherwise the standard library.
+        :param cache: A ResponseCache for GET responses, which may be shared
+        with other sessions. Defaults to None (no caching).
+        :param single_flight: A SingleFlight that lets identical concurrent
+        GETs share one request. It may be shared with other sessions.
+        Defaults to None.
+        :param timeout: The connect and read timeouts in seconds, as a
+        tuple or one number for both. Defaults to (10, 60). Inside a
+        deadline block the total time is limited to the time left.
+        :param breaker: A CircuitBreaker that fails fast on an endpoint
+        family after repeated failures. It may be shared with other
+        sessions. Defaults to None.
+        :param request_stats: The RequestStats recording every HTTP call,
+        which may be shared with other sessions. Defaults to a new one.
+        :param on_request: Called as on_request(method, url, headers,
+        data) before each HTTP call, including retries.
+        :param on_response: Called as on_response(method, url, response,
+        elapsed) after each HTTP call that gets a response.
+        :param on_error: Called as on_error(method, url, exception,
+        elapsed) after each HTTP call that fails to connect or times out.
+        :param tracer: An OpenTelemetry compatible tracer to open a span
+        for each HTTP call. Defaults to None.
+        :param baseurl: The CAS API endpoint, defaults to the public cloud.
+        :param csp_url: The Cloud Services Portal endpoint used to log in
+        and manage users, defaults to the public cloud.
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncSession requires aiohttp. '
+                              'Install it with pip install caspyr[async].')
+        self.baseurl = baseurl
+        self.csp_url = csp_url
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.codec = codec if codec is not None else default_codec()
+        self.cache = cache
+        self.single_flight = single_flight
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        self.timeout = timeout
+        self.breaker = breaker
+        self.request_stats = (request_stats if request_stats is not None
+                              else RequestStats())
+        self.on_request = on_request
+        self.on_response = on_response
+        self.on_error = on_error
+        self.tracer = tracer
+        self._http = None
+        self.refresh_token = None
+        self._refresh_lock = asyncio.Lock()
+        self._set_token(auth_token)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes all pooled connections held by this session.
+        """
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    _set_token = Session._set_token
+    _token_stale = Session._token_stale
+    _out_of_time = staticmethod(Session._out_of_time)
+    deadline = staticmethod(Session.deadline)
+    stats = Session.stats
+    prometheus_stats = Session.prometheus_stats
+
+    async def map(self, fn, items, max_workers=8, progress=None):
+        """
+        The awaitable counterpart of Session.map, for async resource
+        methods such as aio.Deployment.delete.
+        """
+        return await bulk.map_async(fn, self, items, max_workers, progress)
+
+    def _timeout(self, left):
+        """
+        Returns the session timeouts, with the total time limited to the
+        time left before the current deadline.
+        """
+        return aiohttp.ClientTimeout(total=left,
+                                     sock_connect=self.timeout[0],
+                                     sock_read=self.timeout[1]
+                                     )
+
+    def _client(self):
+        if self._http is None:
+            connector = aiohttp.TCPConnector(limit=self._limit,
+                                             limit_per_host=self._limit_per_host
+                                             )
+            self._http = aiohttp.ClientSession(connector=connector)
+        return self._http
+
+    async def _throttle(self, url):
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    @classmethod
+    async def login(cls, refresh_token, **kwargs):
+        """
+        Exchanges a refresh token for an access token.
+        :param refresh_token: The API token from the Cloud Services portal.
+        :param kwargs: Passed through to the AsyncSession constructor.
+        :return: A logged in session.
+        """
+        session = cls(None, **kwargs)
+        session.refresh_token = refresh_token
+        try:
+            await session.refresh()
+        except aiohttp.ClientResponseError:
+            await session.close()
+            raise
+        return session
+
+    async def _authorize(self):
+        """
+        Exchanges the refresh token for an access token with CSP.
+        :return: The access token and the time it expires at.
+        """
+        baseurl = f'{self.csp_url}/csp/gateway/am/api'
+        uri = f'/auth/api-tokens/authorize?refresh_token={self.refresh_token}'
+        headers = {'Content-Type': 'application/json'}
+
+        await self._throttle(baseurl)
+        timeout = self._timeout(deadline.check(baseurl))
+        if self.breaker is not None:
+            family = self.breaker.allow(baseurl)
+        success = False
+        try:
+            r = await self._client().post(f'{baseurl}{uri}',
+                                          headers=headers,
+                                          timeout=timeout)
+            success = r.status < 500
+        finally:
+            if self.breaker is not None:
+                self.breaker.record(family, success)
+        async with r:
+            j = self.codec.loads(await r.read())
+            logger.debug('Status code" %s \n'
+                         'Response: %s \n',
+                         r.status, j)
+            if r.status >= 400:
+                logger.error('Failed to authenticate.')
+                logger.error('Error message %s', j['message'],
+                             exc_info=False)
+                r.raise_for_status()
+        logger.info('Authenticated successfully.')
+        expires_at = None
+        if 'expires_in' in j:
+            expires_at = time.time() + j['expires_in']
+        return j['access_token'], expires_at
+
+    async def refresh(self):
+        """
+        Replaces the access token with a fresh one.
+        """
+        async with self._refresh_lock:
+            self._set_token(*await self._authorize())
+
+    async def _ensure_token(self):
+        if self._token_stale():
+            async with self._refresh_lock:
+                if self._token_stale():
+                    self._set_token(*await self._authorize())
+
+    async def _send(self, request_method, url, data=None, headers=None):
+        """
+        Sends a request over the pooled transport, retrying it according
+        to the retry policy.
+        :param headers: Headers to send in addition to the session headers.
+        :return: The final response, with its body not yet read.
+        """
+        await self._ensure_token()
+        if headers:
+            headers = {**self.headers, **headers}
+        else:
+            headers = self.headers
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            await self._throttle(url)
+            timeout = self._timeout(deadline.check(url))
+            family = None
+            if self.breaker is not None:
+                family = self.breaker.allow(url)
+            try:
+                r = await self._attempt(request_method, url, headers, data,
+                                        timeout, family)
+            except (aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError) as e:
+                delay = self.retry.sleep_for(request_method,
+                                             attempt,
+                                             time.monotonic() - started
+                                             )
+                if delay is None or self._out_of_time(delay):
+                    raise
+                logger.warning(f'{request_method} to {url} failed with {e}, '
+                               f'retrying in {delay:.2f}s.')
+            else:
+                delay = self.retry.sleep_for(request_method,
+                                             attempt,
+                                             time.monotonic() - started,
+                                             status=r.status,
+                                             retry_after=r.headers.get('Retry-After')
+                                             )
+                if delay is None or self._out_of_time(delay):
+                    return r
+                logger.warning(f'{request_method} to {url} returned '
+                               f'{r.status}, retrying in {delay:.2f}s.')
+                r.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(self,
+                       request_method,
+                       url,
+                       headers,
+                       data,
+                       timeout,
+                       family=None
+                       ):
+        """
+        The awaitable counterpart of Session._attempt.
+        """
+        success = False
+        try:
+            if self.on_request is not None:
+                self.on_request(request_method, url, headers, data)
+            with tracing.span(self.tracer,
+                              f'{request_method} {route(url)}',
+                              {'http.method': request_method, 'http.url': url}
+                              ) as span:
+                sent = time.monotonic()
+                try:
+                    r = await self._client().request(request_method,
+                                                     url,
+                                                     headers=headers,
+                                                     data=data,
+                                                     timeout=timeout)
+                except (aiohttp.ClientConnectionError,
+                        asyncio.TimeoutError) as e:
+                    elapsed = time.monotonic() - sent
+                    self.request_stats.record(request_method, url, elapsed,
+                                              error=True,
+                                              bytes_out=_body_size(data))
+                    if self.on_error is not None:
+                        self.on_error(request_method, url, e, elapsed)
+                    raise
+                elapsed = time.monotonic() - sent
+                span.set_attribute('http.status_code', r.status)
+                self.request_stats.record(request_method, url, elapsed,
+                                          error=r.status >= 400,
+                                          bytes_in=r.content_length or 0,
+                                          bytes_out=_body_size(data))
+                success = r.status < 500
+                if self.on_response is not None:
+                    self.on_response(request_method, url, r, elapsed)
+                return r
+        finally:
+            if family is not None:
+                self.breaker.record(family, success)
+
+    async def _request(self,
+                       url,
+                       request_method='GET',
+                       payload=None,
+                       **kwargs
+                       ):
+        """
+        The awaitable counterpart of Session._request.
+        :param url: The complete uri for the requested resource.
+        :param request_method: An HTTP method that one of
+        PUT, POST, PATCH, DELETE or GET
+        :param payload: Used to store a resource that is used in either
+        POST, PATCH or PUT operations
+        :param kwargs: Unused currently
+        :return: The response JSON, or the status code for DELETE.
+        """
+        if request_method == 'GET':
+            if self.cache is not None:
+                j = self.cache.get(self.token, url)
+                if j is not None:
+                    logger.debug('GET to %s served from cache', url)
+                    return j
+            if self.single_flight is not None:
+                return await self.single_flight.do_async((self.token, url),
+                                                         lambda: self._get(url))
+            return await self._get(url)
+
+        data = None
+        if request_method in ('PUT', 'POST', 'PATCH') and payload:
+            data = self.codec.dumps(payload) if type(payload) == dict else payload
+        elif request_method != 'DELETE':
+            return None
+
+        r = await self._send(request_method, url, data=data)
+        if self.cache is not None:
+            self.cache.invalidate(url)
+
+        async with r:
+            logger.debug('%s to %s \nStatus code" %s',
+                         request_method, url, r.status
+                         )
+            if r.status >= 400:
+                j = self.codec.loads(await r.read())
+                if request_method == 'DELETE':
+                    logger.error(j['message'], exc_info=False)
+                else:
+                    logger.error(j, exc_info=False)
+                return None
+            if request_method == 'DELETE':
+                return r.status
+            return self.codec.loads(await r.read())
+
+    async def _get(self, url):
+        """
+        The awaitable counterpart of Session._get.
+        """
+        conditional = None
+        if self.cache is not None:
+            conditional = self.cache.conditional_headers(self.token, url)
+        r = await self._send('GET', url, headers=conditional)
+        if r.status == 304 and conditional:
+            r.release()
+            j = self.cache.revalidate(self.token, url)
+            if j is not None:
+                logger.debug('GET to %s not modified', url)
+                return j
+            r = await self._send('GET', url)
+
+        async with r:
+            logger.debug('GET to %s \nStatus code" %s', url, r.status)
+            j = self.codec.loads(await r.read())
+        if r.status >= 400:
+            logger.error(j, exc_info=False)
+            return None
+        if self.cache is not None:
+            self.cache.set(self.token,
+                           url,
+                           j,
+                           etag=r.headers.get('ETag'),
+                           last_modified=r.headers.get('Last-Modified')
+                           )
+        return j
+
+    async def _perform(self, fn, *args, **kwargs):
+        """
+        Awaits the request that the synchronous method fn would make.
+        :param fn: A synchronous resource method taking a session first.
+        :param args: The arguments of fn, starting with this session, as
+        in session._perform(Project.describe, session, id).
+        :return: The response of _request.
+        """
+        p = _plan(fn, *args, **kwargs)
+        return await self._request(p.url,
+                                   request_method=p.request_method,
+                                   payload=p.payload
+                                   )
+
+    async def _perform_list(self, fn, *args, **kwargs):
+        """
+        Awaits every page of the collection that the synchronous list
+        method fn would list.
+        :return: The items of every page, see _list.
+        """
+        p = _plan(fn, *args, **kwargs)
+        return await self._list(p.url)
+
+    async def _list(self, url, key='content', page_size=200):
+        """
+        The awaitable counterpart of Session._paginate.
+        :return: A list of the items of every page.
+        """
+        pages = await self._pages(url, key, page_size)
+        return [item for j in pages for item in j.get(key) or []]
+
+    async def _pages(self, url, key='content', page_size=200):
+        """
+        The awaitable counterpart of Session._pages, fetching one page
+        after another until _has_next finds the end of the collection. A
+        page that fails raises HTTPError rather than ending the
+        collection early.
+        :return: A list of the pages as returned.
+        """
+        pages = []
+        skip = 0
+        while True:
+            page_url = _page_url(url, skip, page_size)
+            j = await self._request(page_url)
+            if j is None:
+                raise requests.exceptions.HTTPError(
+                    f'GET {page_url} failed, so the collection could not '
+                    f'be listed in full.')
+            pages.append(j)
+            count = len(j.get(key) or [])
+            skip += count
+            if not _has_next(j, count, skip, page_size):
+                return pages
+            page_size = min(page_size, count)
+
+
+class Blueprint(_blueprint.Blueprint):
+    """
+    Awaitable methods for Blueprints.
+    """
+    @staticmethod
+    async def list(session):
+        return await session._perform_list(_blueprint.Blueprint.list, session)
+
+    @classmethod
+    async def describe(cls, session, blueprint_id):
+        return cls(await session._perform(_blueprint.Blueprint.describe,
+                                          session,
+                                          blueprint_id
+                                          ))
+
+    @classmethod
+    async def create(cls, session, *args, **kwargs):
+        i = await session._perform(_blueprint.Blueprint.create,
+                                   session,
+                                   *args,
+                                   **kwargs
+                                   )
+        return await cls.describe(session, blueprint_id=i['id'])
+
+    @staticmethod
+    async def delete(session, blueprint_id):
+        return await session._perform(_blueprint.Blueprint.delete,
+                                      session,
+                                      blueprint_id
+                                      )
+
+
+class Deployment(_deployment.Deployment):
+    """
+    Awaitable methods for Deployments.
+    """
+    @staticmethod
+    async def list(session):
+        return await session._perform_list(_deployment.Deployment.list, session)
+
+    @classmethod
+    async def describe(cls, session, id):
+        return cls(await session._perform(_deployment.Deployment.describe,
+                                          session,
+                                          id
+                                          ))
+
+    @staticmethod
+    async def delete(session, id):
+        return await session._perform(_deployment.Deployment.delete,
+                                      session,
+                                      id
+                                      )
+
+
+class Request(_request.Request):
+    """
+    Awaitable methods for blueprint requests.
+    """
+    @classmethod
+    async def list(cls, session):
+        j = await session._perform(_request.Request.list, session)
+        return [{"id": os.path.split(i)[1]} for i in j['links']]
+
+    @classmethod
+    async def describe(cls, session, id):
+        return cls(await session._perform(_request.Request.describe,
+                                          session,
+                                          id
+                                          ))
+
+    @classmethod
+    async def list_incomplete(cls, session, max_workers=8):
+        url = _plan(_request.Request.list_incomplete, session).url
+        pages = await session._pages(url)
+        if 'content' in pages[0]:
+            return [{"id": d['id']} for j in pages
+                    for d in j.get('content') or []
+                    if d.get('status') == 'STARTED']
+        ids = [os.path.split(i)[1] for i in pages[0]['links']]
+        outcomes = await session.map(cls.describe, ids, max_workers)
+        data = []
+        for outcome in outcomes:
+            if not outcome.ok:
+                raise outcome.error
+            if outcome.result.status == 'STARTED':
+                data.append({"id": outcome.result.id})
+        return data
+
+
+class Project(_project.Project):
+    """
+    Awaitable methods for Projects.
+    """
+    @classmethod
+    async def list(cls, session):
+        return await session._perform_list(_project.Project.list, session)
+
+    @classmethod
+    async def describe(cls, session, id):
+        return cls(await session._perform(_project.Project.describe,
+                                          session,
+                                          id
+                                          ))
+
+    @classmethod
+    async def create(cls, session, *args, **kwargs):
+        return cls(await session._perform(_project.Project.create,
+                                          session,
+                                          *args,
+                                          **kwargs
+                                          ))
+
+    @staticmethod
+    async def delete(session, id):
+        return await session._perform(_project.Project.delete,
+                                      session,
+                                      id
+                                      )
+
+
+class CloudZone(_zone.CloudZone):
+    """
+    Awaitable methods for Cloud Zones.
+    """
+    @staticmethod
+    async def list(session):
+        return await session._perform_list(_zone.CloudZone.list, session)
+
+    @classmethod
+    async def describe(cls, session, id):
+        return cls(await session._perform(_zone.CloudZone.describe,
+                                          session,
+                                          id
+                                          ))
+
+    @classmethod
+    async def create(cls, session, *args, **kwargs):
+        return cls(await session._perform(_zone.CloudZone.create,
+                                          session,
+                                          *args,
+                                          **kwargs
+                                          ))
+
+    @staticmethod
+    async def delete(session, id):
+        return await session._perform(_zone.CloudZone.delete,
+                                      session,
+                                      id
+                                      )
+
+
+class _CloudAccountMixin(object):
+    """
+    Awaitable methods shared by all Cloud Account classes. The synchronous
+    class being mirrored is the next Cloud Account class in the MRO.
+    """
+    @classmethod
+    def _sync(cls):
+        return cls.__mro__[cls.__mro__.index(_CloudAccountMixin) + 1]
+
+    @classmethod
+    async def list(cls, session):
+        return await session._perform_list(cls._sync().list, session)
+
+    @classmethod
+    async def describe(cls, session, cloud_account_id):
+        return cls(await session._perform(cls._sync().describe,
+                                          session,
+                                          cloud_account_id
+                                          ))
+
+    @classmethod
+    async def create(cls, session, *args, **kwargs):
+        return cls(await session._perform(cls._sync().create,
+                                          session,
+                                          *args,
+                                          **kwargs
+                                          ))
+
+    @classmethod
+    async def delete(cls, session, cloud_account_id):
+        return await session._perform(cls._sync().delete,
+                                      session,
+                                      cloud_account_id
+                                      )
+
+
+class CloudAccount(_CloudAccountMixin, _cloudaccount.CloudAccount):
+    pass
+
+
+class CloudAccountAws(_CloudAccountMixin, _cloudaccount.CloudAccountAws):
+    pass
+
+
+class CloudAccountAzure(_CloudAccountMixin, _cloudaccount.CloudAccountAzure):
+    pass
+
+
+class CloudAccountvSphere(_CloudAccountMixin,
+                          _cloudaccount.CloudAccountvSphere):
+    pass
+
+
+class CloudAccountNSXT(_CloudAccountMixin, _cloudaccount.CloudAccountNSXT):
+    pass
+
+
+class _ProfileMixin(object):
+    """
+    Awaitable list and delete shared by the mapping and profile classes.
+    The synchronous class being mirrored is the first class in the MRO
+    that is not one of these mixins.
+    """
+    @classmethod
+    def _sync(cls):
+        return next(c for c in cls.__mro__[1:]
+                    if not issubclass(c, _ProfileMixin))
+
+    @classmethod
+    async def list(cls, session):
+        return await session._perform_list(cls._sync().list, session)
+
+    @classmethod
+    async def delete(cls, session, id):
+        return await session._perform(cls._sync().delete,
+                                      session,
+                                      id
+                                      )
+
+
+class _DescribeMixin(_ProfileMixin):
+    """
+    Adds an awaitable describe, for synchronous classes that have one.
+    """
+    @classmethod
+    async def describe(cls, session, id):
+        return cls(await session._perform(cls._sync().describe,
+                                          session,
+                                          id
+                                          ))
+
+
+class _CreateMixin(_ProfileMixin):
+    """
+    Adds an awaitable create, for synchronous classes that have one.
+    """
+    @classmethod
+    async def create(cls, session, *args, **kwargs):
+        return cls(await session._perform(cls._sync().create,
+                                          session,
+                                          *args,
+                                          **kwargs
+                                          ))
+
+
+class StorageProfile(_ProfileMixin, _mapping.StorageProfile):
+    pass
+
+
+class StorageProfileAWS(_DescribeMixin,
+                        _CreateMixin,
+                        _mapping.StorageProfileAWS):
+    pass
+
+
+class StorageProfileAzure(_DescribeMixin,
+                          _CreateMixin,
+                          _mapping.StorageProfileAzure):
+    pass
+
+
+class StorageProfilevSphere(_ProfileMixin, _mapping.StorageProfilevSphere):
+    pass
+
+
+class ImageMapping(_CreateMixin, _mapping.ImageMapping):
+    @classmethod
+    async def describe(cls, session, id):
+        uri = f'/iaas/api/image-profiles/{id}'
+        return cls(await session._request(f'{session.baseurl}{uri}'))
+
+
+class FlavorMapping(_CreateMixin, _mapping.FlavorMapping):
+    pass
+
+
+class NetworkProfile(_DescribeMixin,
+                     _CreateMixin,
+                     _mapping.NetworkProfile):
+    pass
+
+
+class Machine(_iaas.Machine):
+    """
+    Awaitable methods for Machines.
+    """
+    @staticmethod
+    async def list(session):
+        return await session._perform_list(_iaas.Machine.list, session)
+
+    @classmethod
+    async def describe(cls, session, id):
+        return await session._perform(_iaas.Machine.describe, session, id)
+
+    @staticmethod
+    async def delete(session, id):
+        return await session._perform(_iaas.Machine.delete, session, id)
@@ -6,9 +6,6 @@
 """Module for interacting with Blueprints.
 """
 
-import os
-import requests
-
 
 class Blueprint:
     """
@@ -46,22 +43,21 @@ class Blueprint:
         self.updated_by = blueprint['updatedBy']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         """Retrieves list of all blueprints that the logged-in
         user has access to.
 
         :param session: The session object.
         :type session: object
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
         :return: A list of blueprint ids.
         :rtype: list
         """
 
         uri = '/blueprint/api/blueprints/'
-        #return session._request(url=f'{session.baseurl}{uri}')['content']
-        j = session._request(f'{session.baseurl}{uri}')
-        if 'content' in j:
-            return j['content']
-        return []
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @classmethod
     def describe(cls, session, blueprint_id):
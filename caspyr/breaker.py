@@ -0,0 +1,131 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for failing fast on a degraded CAS service.
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+# API prefixes that are tracked as one endpoint family each. Any other
+# path is grouped by its first segment.
+FAMILIES = ('/iaas/api',
+            '/blueprint/api',
+            '/deployment/api',
+            '/pipeline/api',
+            '/event-broker/api',
+            '/provisioning/uerp',
+            '/csp'
+            )
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpen(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request to an endpoint family whose
+    circuit is open.
+    """
+
+
+class _Circuit(object):
+    __slots__ = ('state', 'failures', 'opened_at', 'probing')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class CircuitBreaker(object):
+    """
+    A thread-safe circuit breaker per host and API prefix.
+
+    After failure_threshold consecutive failures (connection errors,
+    timeouts or 5xx responses) the circuit for that family opens and
+    requests to it raise CircuitOpen at once. After reset_timeout seconds
+    one probe request is let through: if it succeeds the circuit closes,
+    otherwise it opens again. Other families are not affected. One breaker
+    may be shared by several sessions.
+    """
+    def __init__(self,
+                 failure_threshold=5,
+                 reset_timeout=30,
+                 families=FAMILIES
+                 ):
+        """
+        :param failure_threshold: The consecutive failures that open a
+        circuit, defaults to 5.
+        :param reset_timeout: The seconds a circuit stays open before a
+        probe is allowed, defaults to 30.
+        :param families: The API prefixes tracked as one family each.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.families = tuple(sorted(families, key=len, reverse=True))
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def family(self, url):
+        """
+        Returns the (host, prefix) endpoint family of url.
+        """
+        parts = urlsplit(url)
+        for prefix in self.families:
+            if parts.path.startswith(prefix):
+                return parts.netloc, prefix
+        return parts.netloc, '/' + parts.path.lstrip('/').split('/', 1)[0]
+
+    def state(self, url):
+        """
+        Returns 'closed', 'open' or 'half-open' for the family of url.
+        """
+        with self._lock:
+            circuit = self._circuits.get(self.family(url))
+            return circuit.state if circuit is not None else CLOSED
+
+    def allow(self, url):
+        """
+        Checks that a request to url may be sent, and returns its family
+        for record(). Raises CircuitOpen if the circuit is open.
+        """
+        family = self.family(url)
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                circuit = self._circuits[family] = _Circuit()
+            if circuit.state == CLOSED:
+                return family
+            if (circuit.state == OPEN
+                    and time.monotonic() - circuit.opened_at >= self.reset_timeout):
+                circuit.state = HALF_OPEN
+                circuit.probing = False
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return family
+        raise CircuitOpen(f'Circuit for {family[0]}{family[1]} is open.')
+
+    def record(self, family, success):
+        """
+        Records the outcome of a request allowed by allow().
+        """
+        with self._lock:
+            circuit = self._circuits[family]
+            if success:
+                circuit.state = CLOSED
+                circuit.failures = 0
+            else:
+                circuit.failures += 1
+                if (circuit.state == HALF_OPEN
+                        or circuit.failures >= self.failure_threshold):
+                    circuit.state = OPEN
+                    circuit.opened_at = time.monotonic()
+            circuit.probing = False
@@ -0,0 +1,121 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for running a resource method over many items at once.
+
+Session.map and AsyncSession.map call fn(session, item) for every item
+with bounded parallelism, so serial loops such as
+
+for d in Deployment.list(session):
+    Deployment.delete(session, d['id'])
+
+become
+
+session.map(Deployment.delete, [d['id'] for d in Deployment.list(session)])
+
+Session.imap does the same but yields each outcome as its call finishes.
+"""
+
+import asyncio
+import contextvars
+from collections import namedtuple
+from concurrent.futures import (FIRST_COMPLETED, ThreadPoolExecutor,
+                                as_completed, wait)
+from itertools import islice
+
+
+class Outcome(namedtuple('Outcome', ('item', 'result', 'error'))):
+    """
+    The result of fn for one item, or the exception it raised.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _call(fn, session, item):
+    try:
+        return Outcome(item, fn(session, item), None)
+    except Exception as e:
+        return Outcome(item, None, e)
+
+
+def map_threads(fn, session, items, max_workers=8, progress=None):
+    """
+    Calls fn(session, item) for each item from a thread pool.
+    :param max_workers: The number of calls in flight at once.
+    :param progress: Called as progress(done, total, outcome) as each
+    call finishes, in completion order.
+    :return: A list of Outcome in the order of items.
+    """
+    items = list(items)
+    outcomes = [None] * len(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(contextvars.copy_context().run,
+                               _call, fn, session, item): i
+                   for i, item in enumerate(items)}
+        for done, future in enumerate(as_completed(futures), 1):
+            outcome = outcomes[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(items), outcome)
+    return outcomes
+
+
+def imap_threads(fn, session, items, max_workers=8):
+    """
+    Calls fn(session, item) for each item from a thread pool, yielding
+    each Outcome as soon as its call finishes, in completion order. Items
+    are taken from the iterable as calls finish, so no more than
+    max_workers are submitted at a time, and calls not yet started are
+    cancelled if the caller stops early.
+    """
+    items = iter(items)
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    pending = set()
+
+    def submit(count):
+        for item in islice(items, count):
+            pending.add(pool.submit(contextvars.copy_context().run,
+                                    _call, fn, session, item))
+
+    try:
+        submit(max_workers)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(done)
+            submit(len(done))
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+async def map_async(fn, session, items, max_workers=8, progress=None):
+    """
+    The awaitable counterpart of map_threads, for an fn returning an
+    awaitable.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(max_workers)
+    done = 0
+
+    async def call(item):
+        nonlocal done
+        async with semaphore:
+            try:
+                outcome = Outcome(item, await fn(session, item), None)
+            except Exception as e:
+                outcome = Outcome(item, None, e)
+        done += 1
+        if progress is not None:
+            progress(done, len(items), outcome)
+        return outcome
+
+    return await asyncio.gather(*(call(item) for item in items))
@@ -0,0 +1,167 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for caching GET responses in memory.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+class _Entry(object):
+    __slots__ = ('path', 'value', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, path, value, expires, etag=None, last_modified=None):
+        self.path = path
+        self.value = value
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ResponseCache(object):
+    """
+    A thread-safe TTL and LRU bounded cache of parsed GET responses.
+
+    Entries are keyed by access token and URL, so one cache can be shared
+    by sessions for different orgs. A POST, PUT, PATCH or DELETE through
+    the session invalidates every cached entry in the collection it
+    writes to. Cached responses are shared between callers and should be
+    treated as read-only.
+
+    Responses that carry an ETag or Last-Modified validator are kept after
+    they expire, and the session revalidates them with a conditional
+    request; a 304 Not Modified reuses the cached parsed response. With a
+    ttl of 0 for a resource, every read of it is revalidated.
+    """
+    # Writes to these paths change collections listed under other paths.
+    related = {
+        '/api/cloud-accounts': ('/iaas/cloud-accounts',
+                                '/iaas/api/cloud-accounts'),
+        '/blueprint/api/blueprint-requests': ('/deployment/api/deployments',),
+    }
+
+    def __init__(self, maxsize=256, ttl=30, ttls=None):
+        """
+        :param maxsize: The maximum number of responses held, defaults
+        to 256. The least recently used response is dropped first.
+        :param ttl: The seconds a response stays fresh, defaults to 30.
+        :param ttls: A dict of path prefix to ttl overriding the default
+        for that resource, eg. {'/iaas/api/fabric-images': 600}. The
+        longest matching prefix wins.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, path):
+        """
+        Returns the ttl in seconds for a request path.
+        """
+        best = None
+        for prefix in self.ttls:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.ttls[best] if best is not None else self.ttl
+
+    def get(self, token, url):
+        """
+        Returns the cached response for url, or None if there is no fresh
+        entry.
+        """
+        key = (token, url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires <= time.monotonic():
+                self.misses += 1
+                if entry is not None and not (entry.etag or entry.last_modified):
+                    del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def conditional_headers(self, token, url):
+        """
+        Returns the If-None-Match/If-Modified-Since headers for a stale
+        entry of url, or None if it has no validators.
+        """
+        with self._lock:
+            entry = self._entries.get((token, url))
+            if entry is None:
+                return None
+            headers = {}
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+            return headers or None
+
+    def revalidate(self, token, url):
+        """
+        Marks the entry for url fresh again after a 304 Not Modified and
+        returns its cached response, or None if it has been evicted.
+        """
+        key = (token, url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires = time.monotonic() + self.ttl_for(entry.path)
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            return entry.value
+
+    def set(self, token, url, value, etag=None, last_modified=None):
+        """
+        Stores a parsed response for url, with the validators the server
+        sent for it.
+        """
+        path = urlsplit(url).path
+        ttl = self.ttl_for(path)
+        if value is None or (ttl <= 0 and not (etag or last_modified)):
+            return
+        key = (token, url)
+        with self._lock:
+            self._entries[key] = _Entry(path,
+                                        value,
+                                        time.monotonic() + ttl,
+                                        etag,
+                                        last_modified
+                                        )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url):
+        """
+        Drops every entry in the collection that a write to url changes:
+        the parent of the written path and everything beneath it, along
+        with any related collections.
+        """
+        path = urlsplit(url).path.rstrip('/')
+        prefixes = [path.rsplit('/', 1)[0] or path]
+        for written, others in self.related.items():
+            if path.startswith(written):
+                prefixes.extend(others)
+        prefixes = tuple(prefixes)
+        with self._lock:
+            for key in [k for k, e in self._entries.items()
+                        if e.path.startswith(prefixes)]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Drops every cached response.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,270 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for recording HTTP exchanges and replaying them offline.
+
+A Cassette is a JSON file of request/response pairs. Passing
+cassette.recorder() as a session's transport records every exchange with
+the real API, and cassette.player() serves them back without a network,
+so flows such as Blueprint.request or Deployment.delete can be tested and
+benchmarked on a laptop.
+
+Example:
+cassette = Cassette('blueprint_flow.json')
+with Session.login(refresh_token, transport=cassette.recorder()) as session:
+    Blueprint.request(session, ...)
+cassette.save()
+
+session = Session('token', transport=Cassette('blueprint_flow.json').player(latency=0.05))
+
+Credentials are scrubbed before they are kept: the Authorization and
+csp-auth-token headers, the refresh_token query parameter and any token
+fields in response bodies.
+"""
+
+import base64
+import json
+import threading
+import time
+from collections import defaultdict
+from http.client import responses
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+SCRUBBED = '<scrubbed>'
+
+SECRET_HEADERS = {'authorization', 'csp-auth-token', 'cookie', 'set-cookie'}
+
+SECRET_PARAMS = {'refresh_token', 'access_token'}
+
+SECRET_FIELDS = {'access_token', 'refresh_token', 'id_token', 'token'}
+
+# Headers describing the body on the wire, which no longer apply once it
+# has been decoded.
+_WIRE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """
+    Raised when a replayed request has no recorded response.
+    """
+
+
+def scrub_url(url):
+    """
+    Returns url with the values of credential query parameters scrubbed.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if not SECRET_PARAMS.intersection(k for k, _ in query):
+        return url
+    query = [(k, SCRUBBED if k in SECRET_PARAMS else v) for k, v in query]
+    return urlunsplit(parts._replace(query=urlencode(query, safe='/$:,')))
+
+
+def scrub_headers(headers):
+    """
+    Returns a copy of headers with credentials scrubbed.
+    """
+    return {k: SCRUBBED if k.lower() in SECRET_HEADERS else v
+            for k, v in headers.items()}
+
+
+def _scrub_body(body):
+    try:
+        j = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(j, dict) or not SECRET_FIELDS.intersection(j):
+        return body
+    return json.dumps({k: SCRUBBED if k in SECRET_FIELDS else v
+                       for k, v in j.items()})
+
+
+def _encode_body(content):
+    if not content:
+        return {'text': ''}
+    try:
+        return {'text': _scrub_body(content.decode('utf-8'))}
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(content).decode('ascii')}
+
+
+def _decode_body(body):
+    if 'base64' in body:
+        return base64.b64decode(body['base64'])
+    return body['text'].encode('utf-8')
+
+
+class Cassette(object):
+    """
+    A file of recorded HTTP interactions.
+
+    Interactions are matched on method and URL, with credentials scrubbed.
+    Requests for the same method and URL get the recorded responses in
+    order, and the last one again once they run out, so a recorded flow
+    can be replayed many times in a benchmark.
+    """
+    def __init__(self, path=None):
+        """
+        :param path: The cassette file. It is loaded if it exists.
+        Defaults to None, an in-memory cassette.
+        """
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path) as f:
+                    self.interactions = json.load(f)['interactions']
+            except FileNotFoundError:
+                pass
+        self.rewind()
+
+    def rewind(self):
+        """
+        Starts replaying every method and URL from its first response.
+        """
+        with self._lock:
+            self._played = defaultdict(int)
+            self._index = defaultdict(list)
+            for interaction in self.interactions:
+                request = interaction['request']
+                self._index[(request['method'], request['url'])].append(interaction)
+
+    def save(self, path=None):
+        """
+        Writes the cassette to path, defaulting to the file it was
+        loaded from.
+        """
+        with self._lock, open(path or self.path, 'w') as f:
+            json.dump({'interactions': self.interactions}, f, indent=1)
+
+    def add(self,
+            request_method,
+            url,
+            status=200,
+            body=b'',
+            headers=None,
+            request_body=None,
+            elapsed=0.0
+            ):
+        """
+        Appends an interaction, scrubbing its credentials.
+        :param body: The response body as bytes, or an object to store as
+        JSON.
+        :param elapsed: The seconds the server took to respond.
+        """
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        if isinstance(request_body, str):
+            request_body = request_body.encode('utf-8')
+        interaction = {
+            'request': {'method': request_method,
+                        'url': scrub_url(url),
+                        'body': _encode_body(request_body)},
+            'response': {'status': status,
+                         'headers': scrub_headers(headers or {}),
+                         'body': _encode_body(body),
+                         'elapsed': elapsed}
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index[(request_method, interaction['request']['url'])].append(interaction)
+
+    def play(self, request_method, url):
+        """
+        Returns the next recorded response for a request, or raises
+        CassetteMiss.
+        """
+        key = (request_method, scrub_url(url))
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                raise CassetteMiss(f'No recorded response for {request_method} {key[1]}.')
+            n = self._played[key]
+            self._played[key] = n + 1
+            return recorded[min(n, len(recorded) - 1)]['response']
+
+    def recorder(self, **kwargs):
+        """
+        Returns a transport that sends requests to the real API and
+        records them. kwargs are passed to the HTTPAdapter.
+        """
+        return RecordingAdapter(self, HTTPAdapter(**kwargs))
+
+    def player(self, latency=0.0):
+        """
+        Returns a transport that replays recorded responses.
+        :param latency: The delay before each response in seconds, a
+        callable returning one, or 'recorded' for the recorded times.
+        Defaults to 0.
+        """
+        return ReplayAdapter(self, latency)
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    A transport adapter that records every exchange into a cassette.
+    """
+    def __init__(self, cassette, adapter):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        r = self.adapter.send(request, **kwargs)
+        headers = {k: v for k, v in r.headers.items()
+                   if k.lower() not in _WIRE_HEADERS}
+        self.cassette.add(request.method,
+                          request.url,
+                          status=r.status_code,
+                          body=r.content,
+                          headers=headers,
+                          request_body=request.body,
+                          elapsed=r.elapsed.total_seconds())
+        return r
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    A transport adapter that answers from a cassette without a network.
+    """
+    def __init__(self, cassette, latency=0.0):
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+
+    def _delay(self, recorded):
+        if self.latency == 'recorded':
+            return recorded['elapsed']
+        if callable(self.latency):
+            return self.latency()
+        return self.latency
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        recorded = self.cassette.play(request.method, request.url)
+        delay = self._delay(recorded)
+        if delay > 0:
+            time.sleep(delay)
+        r = requests.Response()
+        r.status_code = recorded['status']
+        r.headers = CaseInsensitiveDict(recorded['headers'])
+        r._content = _decode_body(recorded['body'])
+        r._content_consumed = True
+        r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+        r.reason = responses.get(r.status_code, '')
+        r.url = request.url
+        r.request = request
+        return r
+
+    def close(self):
+        pass
@@ -36,10 +36,11 @@ class Base(metaclass=ABCMeta):
 
     @classmethod
     @abstractmethod
-    def list(self, session, uri):
-        """ Returns a list of cloud account ids.
+    def list(self, session, uri, lazy=False):
+        """ Returns a list of cloud account ids, or an iterator fetching
+        a page at a time when lazy.
         """
-        return (session._request(url=f'{session.baseurl}{uri}'))['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @classmethod
     @abstractmethod
@@ -94,9 +95,9 @@ class CloudAccount(Base):
         super().__init__(cloudaccount)
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/cloud-accounts'
-        return super().list(session, uri)
+        return super().list(session, uri, lazy)
 
     @classmethod
     def describe(cls, session, cloud_account_id):
@@ -130,9 +131,9 @@ class CloudAccountAws(Base):
         super().__init__(cloudaccount)
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/cloud-accounts-aws'
-        return super().list(session, uri)#['content']
+        return super().list(session, uri, lazy)
 
     @classmethod
     def describe(cls, session, cloud_account_id):
@@ -178,9 +179,9 @@ class CloudAccountAws(Base):
 class CloudAccountAzure(Base):
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/cloud-accounts-azure'
-        return super().list(session, uri)#['content']
+        return super().list(session, uri, lazy)
 
     @classmethod
     def describe(cls, session, cloud_account_id):
@@ -230,9 +231,9 @@ class CloudAccountAzure(Base):
 class CloudAccountvSphere(Base):
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/cloud-accounts-vsphere'
-        return super().list(session, uri)
+        return super().list(session, uri, lazy)
 
     @classmethod
     def describe(cls, session, cloud_account_id):
@@ -308,9 +309,9 @@ class CloudAccountvSphere(Base):
 class CloudAccountNSXT(Base):
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/cloud-accounts-nsx-t'
-        return super().list(session, uri)['content']
+        return super().list(session, uri, lazy)
 
     @staticmethod
     def describe(session, cloud_account_id):
@@ -0,0 +1,62 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for the JSON codecs used to encode requests and decode responses.
+
+A codec is any object with dumps(obj) and loads(data) callables, so a
+module such as ujson can be passed to a Session directly.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec(object):
+    """
+    The standard library codec.
+    """
+    name = 'json'
+
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class OrjsonCodec(object):
+    """
+    A codec backed by orjson, which is several times faster on the large
+    listings returned by the CAS APIs.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson. '
+                              'Install it with pip install caspyr[fast].')
+
+    @staticmethod
+    def dumps(obj):
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+
+def default_codec():
+    """
+    Returns OrjsonCodec when orjson is installed, otherwise JSONCodec.
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
@@ -6,6 +6,8 @@
 import sys
 import requests
 
+from .tracing import traced
+
 
 class CodeStream(object):
     @staticmethod
@@ -13,7 +15,7 @@ class CodeStream(object):
         uri = f'/pipeline/api/endpoints'
         try:
             data = list()
-            r = requests.get(f'{session.baseurl}{uri}', headers = session.headers)
+            r = session._http.get(f'{session.baseurl}{uri}', headers = session.headers, timeout = session.timeout)
             r.raise_for_status()
             j=r.json()
             print(j)
@@ -27,6 +29,7 @@ class CodeStream(object):
         pass
 
     @staticmethod
+    @traced
     def pipeline_list(session):
         uri = '/pipeline/api/pipelines'
         r = session._request(f'{session.baseurl}{uri}')['links']
@@ -57,7 +60,7 @@ class CodeStream(object):
             "tags" : []
             }
         try:
-            r = requests.post(f'{session.baseurl}{uri}', headers = session.headers, json=body)
+            r = session._http.post(f'{session.baseurl}{uri}', headers = session.headers, json=body, timeout = session.timeout)
             r.raise_for_status()
             j=r.json()
             return j
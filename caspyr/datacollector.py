@@ -8,16 +8,11 @@ class DataCollector(object):
         pass
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/data-collectors/'
-        data = []
-        j = session._request(f'{session.baseurl}{uri}')['content']
-        for i in j:
-            content = {}
-            content['id'] = i['dcId']
-            content['name'] = i['name']
-            data.append(content)
-        return data
+        data = ({'id': i['dcId'], 'name': i['name']}
+                for i in session._list(f'{session.baseurl}{uri}', lazy=True))
+        return data if lazy else list(data)
 
     @classmethod
     def describe(cls, session, id):
@@ -0,0 +1,69 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for end-to-end deadlines across several requests.
+
+A deadline is held in a context variable, so it applies to every request
+made inside the block, including those made by helpers such as
+Machine.get_ip or Project.find_by_name, in threads and asyncio tasks alike.
+
+Example:
+with deadline(30):
+    ip = Machine.get_ip(session, machine_id)
+"""
+
+import contextlib
+import contextvars
+import time
+
+import requests
+
+_deadline = contextvars.ContextVar('caspyr_deadline', default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """
+    Raised instead of sending a request once the deadline has passed.
+    """
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """
+    Limits the total time of all requests made inside the block. A nested
+    deadline can only shorten the one around it.
+    :param seconds: The time allowed for the whole block.
+    """
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        expires = min(expires, outer)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """
+    Returns the seconds left before the current deadline, or None when
+    no deadline is set.
+    """
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def check(url):
+    """
+    Raises DeadlineExceeded if the current deadline has passed, otherwise
+    returns the seconds left, or None.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f'Deadline exceeded before request to {url}.')
+    return left
@@ -23,9 +23,10 @@ class Deployment(object):
         self.resource_links = deployment['resourceLinks']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False, prefetch=4):
         uri = '/deployment/api/deployments'
-        return session._request(url=f'{session.baseurl}{uri}')['content']
+        return session._list(f'{session.baseurl}{uri}', lazy,
+                             prefetch=prefetch)
 
     @staticmethod
     def delete(session, id):
@@ -19,18 +19,20 @@ class Subscription:
         self.type = subscription['type']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         """Retrieves list of all subscriptions that the logged-in
         user has access to.
 
         :param session: The session object.
         :type session: object
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
         :return: A list of subscriptions.
         :rtype: list
         """
         uri =f"/event-broker/api/subscriptions?$filter=(type ne 'SUBSCRIBABLE')"
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def describe(session, id):
@@ -81,18 +83,20 @@ class Action:
         self.selfLink = action['selfLink']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         """Retrieves list of all Actions that the logged-in
         user has access to.
 
         :param session: The session object.
         :type session: object
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
         :return: A list of Actions.
         :rtype: list
         """
         uri = '/abx/api/resources/actions/'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def describe(session, selfLink):
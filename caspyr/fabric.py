@@ -9,24 +9,48 @@ underlying information for creating Image Mappings, Flavor Mappings, Network
 Profiles and Storage Profiles.
 """
 
+from .odata import eq, select, where
+
 
 class Image(object):
     def __init__(self, image):
-        try:
-            self.os_family = image['osFamily']
-        except KeyError:
-            pass
-        self.external_region_id = image['externalRegionId']
-        self.is_private = image['isPrivate']
-        self.external_id = image['externalId']
-        self.name = image['name']
-        self.description = image['description']
-        self.id = image['id']
-        self.updated_at = image['updatedAt']
-        self._links = image['_links']
+        self.os_family = image.get('osFamily')
+        self.external_region_id = image.get('externalRegionId')
+        self.is_private = image.get('isPrivate')
+        self.external_id = image.get('externalId')
+        self.name = image.get('name')
+        self.description = image.get('description')
+        self.id = image.get('id')
+        self.updated_at = image.get('updatedAt')
+        self._links = image.get('_links')
+
+    @staticmethod
+    def list(session, stream=False, lazy=False, prefetch=4, fields=None):
+        """
+        Used to list all of the fabric images across all regions.
+        :param session: An instance of the Session class.
+        :type session: Session
+        :param stream: Return a generator that decodes images as each
+        page arrives instead of a list. Defaults to False.
+        :type stream: bool
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
+        :param prefetch: The number of pages fetched concurrently once the
+        size of the collection is known, defaults to 4.
+        :type prefetch: int
+        :param fields: Only return these properties of each image, eg.
+        ('id', 'name', '_links'). Defaults to all of them.
+        :type fields: list
+        :return: Returns a list of images.
+        """
+        url = select(f'{session.baseurl}/iaas/api/fabric-images', fields)
+        if stream:
+            return session._stream(url, page_size=200)
+        return session._list(url, lazy, prefetch=prefetch)
 
     @classmethod
-    def describe(cls, session, image, region):
+    def describe(cls, session, image, region, fields=None):
         """
         Used to create an instance of the image class. Image details are
         unique by 'region', so the region must be provided.
@@ -36,13 +60,17 @@ class Image(object):
         :type image: string
         :param region: The external region id value (friendly name of the
         :type region - eg. westus or us-west-1).
+        :param fields: Only return these properties of each image, eg.
+        ('id', 'name', '_links'). Defaults to all of them.
+        :type fields: list
         :return: Returns an instance of the image claass.
         :rtype: Image
         """
 
-        uri = f'/iaas/api/fabric-images?$filter=(name eq \'{image}\') and (externalRegionId eq \'{region}\')'
-
-        j = session._request(f'{session.baseurl}{uri}')['content'][0]
+        url = where(f'{session.baseurl}/iaas/api/fabric-images',
+                    eq('name', image),
+                    eq('externalRegionId', region))
+        j = session._request(select(url, fields))['content'][0]
         return cls(j)
 
 
@@ -53,7 +81,7 @@ class AzureStorageAccount(object):
     a storage profile for azure unmanaged disks (see Mapping module).
     """
 
-    def __init(self, account):
+    def __init__(self, account):
         self.type = account["type"]
         self.external_region_id = account["externalRegionId"]
         self.external_id = account["externalId"]
@@ -65,16 +93,23 @@ class AzureStorageAccount(object):
         self._links = account["_links"]
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False, prefetch=4):
         """
         Used to list all of the storage accounts associated with Azure
         unmanaged disks.
         :param session: An instance of the Session class.
         :type session: Session
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
+        :param prefetch: The number of pages fetched concurrently once the
+        size of the collection is known, defaults to 4.
+        :type prefetch: int
         :return: Returns a list of storage accounts.
         """
         uri = f'/iaas/api/fabric-azure-storage-account'
-        return session._request(f'{session.baseurl}{uri}')['content']
+        return session._list(f'{session.baseurl}{uri}', lazy,
+                             prefetch=prefetch)
 
     @classmethod
     def describe_by_name(cls, session, name):
@@ -85,58 +120,62 @@ class AzureStorageAccount(object):
         :type session: Session
         :param name: The name of the unmanaged disk.
         :type name: string
-        :return: Returns an instance of the StorageAccountAzure class.
+        :return: Returns an instance of the StorageAccountAzure class, or
+        None when there is no storage account of that name.
         :rtype: StorageAccountAzure
         """
-        j = cls.list(session)
-        for i in j:
-            if i['name'] == name:
-                return cls(i)
+        url = where(f'{session.baseurl}/iaas/api/fabric-azure-storage-account',
+                    eq('name', name))
+        for i in session._request(url)['content']:
+            return cls(i)
 
 
 class NetworkFabric(object):
     def __init__(self, network):
-        self.external_region_id = network['externalRegionId']
-        self.name = network['name']
-        self.id = network['id']
-        self.created_at = network['createdAt']
-        self.updated_at = network['updatedAt']
-        self.organization_id = network['organizationId']
-        self._links = network['_links']
-        try:
-            self.is_public = network['isPublic']
-        except KeyError:
-            pass
-        try:
-            self.is_default = network['isDefault']
-        except KeyError:
-            pass
-        try:
-            self.cidr = network['cidr']
-        except KeyError:
-            pass
+        self.external_region_id = network.get('externalRegionId')
+        self.name = network.get('name')
+        self.id = network.get('id')
+        self.created_at = network.get('createdAt')
+        self.updated_at = network.get('updatedAt')
+        self.organization_id = network.get('organizationId')
+        self._links = network.get('_links')
+        self.is_public = network.get('isPublic')
+        self.is_default = network.get('isDefault')
+        self.cidr = network.get('cidr')
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False, prefetch=4, fields=None):
         """
         :param session: An instance of the Session class.
         :type session: Session
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
+        :param prefetch: The number of pages fetched concurrently once the
+        size of the collection is known, defaults to 4.
+        :type prefetch: int
+        :param fields: Only return these properties of each network, eg.
+        ('id', 'name', '_links'). Defaults to all of them.
+        :type fields: list
         :return: [description]
         :rtype: [type]
         """
-        uri = f'/iaas/api/fabric-networks'
-        return session._request(f'{session.baseurl}{uri}')['content']
+        url = select(f'{session.baseurl}/iaas/api/fabric-networks', fields)
+        return session._list(url, lazy, prefetch=prefetch)
 
     @classmethod
-    def list_by_region(cls, session, region="*"):
-        uri = f'/iaas/api/fabric-networks?$filter=externalRegionId eq {region}'
-        return session._request(f'{session.baseurl}{uri}')['content']
+    def list_by_region(cls, session, region="*", lazy=False, prefetch=4,
+                       fields=None):
+        url = where(f'{session.baseurl}/iaas/api/fabric-networks',
+                    _region(region))
+        return session._list(select(url, fields), lazy, prefetch=prefetch)
 
     @classmethod
     def describe_by_name(cls, session, name, region="*"):
-        uri = (f'/iaas/api/fabric-networks?$filter=(name eq {name}) and '
-               '(externalRegionId eq {region})')
-        return cls(session._request(f'{session.baseurl}{uri}')['content'])
+        url = where(f'{session.baseurl}/iaas/api/fabric-networks',
+                    eq('name', name),
+                    _region(region))
+        return cls(session._request(url)['content'][0])
 
     @classmethod
     def describe(cls, session, id):
@@ -185,3 +224,11 @@ class Flavor(object):
     def describe(session):
         uri = f'/iaas/api/fabric-flavors'
         print(session._request(f'{session.baseurl}{uri}')['content'][0])
+
+
+def _region(region):
+    """
+    Returns a clause matching external region id region, or None for *,
+    meaning every region.
+    """
+    return None if region == '*' else eq('externalRegionId', region)
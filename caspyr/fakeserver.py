@@ -0,0 +1,415 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for a local stand-in of the CAS and CSP APIs.
+
+FakeCAS serves the routes caspyr calls from in-memory collections, so
+concurrency settings and hot paths can be load tested without touching a
+real org. Any collection under /iaas/api, /blueprint/api, /deployment/api,
+/pipeline/api and /event-broker/api supports GET with paging, POST, PUT,
+PATCH and DELETE, and the CSP authorize and orgs routes issue tokens and
+answer org and user lookups. Responses can be delayed by a latency
+distribution, and a share of them answered with 429.
+
+Example:
+with FakeCAS(machines=100000, latency=FakeCAS.lognormal(0.05, 0.5)) as server:
+    session = Session.login('refresh-token',
+                            baseurl=server.url,
+                            csp_url=server.url)
+    machines = Machine.list(session)
+
+Usage: python -m caspyr.fakeserver [port] [machines]
+"""
+
+import collections
+import gzip
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIXES = ('/iaas/api/',
+                '/blueprint/api/',
+                '/deployment/api/',
+                '/pipeline/api/',
+                '/event-broker/api/')
+
+_AUTHORIZE = '/csp/gateway/am/api/auth/api-tokens/authorize'
+_ORG = re.compile(r'^/csp/gateway/am/api/orgs/([^/]+)/?$')
+_INVITATIONS = re.compile(r'^/csp/gateway/am/api/orgs/([^/]+)/invitations$')
+_USERS = re.compile(r'^/csp/gateway/portal/api(?:/v2)?/orgs/([^/]+)/users/?$')
+_USER_SEARCH = re.compile(r'^/csp/gateway/portal/api/orgs/([^/]+)/users/search$')
+_EQ = re.compile(r"([\w.]+) eq '((?:[^']|'')*)'")
+
+
+def synthetic_machine(i):
+    """
+    Returns the machine document for index i.
+    """
+    return {
+        'id': f'machine-{i}',
+        'name': f'Cloud_Machine_{i}',
+        'powerState': 'ON',
+        'address': f'10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}',
+        'projectId': f'project-{i % 10}',
+        'externalRegionId': ('us-west-1', 'us-east-1', 'eu-west-1')[i % 3],
+        'cloudAccountIds': [f'cloud-account-{i % 3}'],
+        'tags': [{'key': 'env', 'value': ('dev', 'prod')[i % 2]}],
+        'customProperties': {'osType': 'LINUX', 'cpuCount': '2'},
+        'createdAt': '2019-09-01',
+        'updatedAt': '2019-09-01',
+        '_links': {
+            'network-interfaces': {
+                'hrefs': [f'/iaas/api/machines/machine-{i}/network-interfaces/0']
+            },
+            'self': {'href': f'/iaas/api/machines/machine-{i}'}
+        }
+    }
+
+
+def _values(document, name):
+    """
+    Returns the values of the dotted property name in document, where an
+    item segment stands for every element of a list, eg. tags.item.key.
+    """
+    values = [document]
+    for part in name.split('.'):
+        found = []
+        for value in values:
+            if isinstance(value, list) and part == 'item':
+                found.extend(value)
+            elif isinstance(value, dict) and part in value:
+                found.append(value[part])
+        values = found
+    return values
+
+
+class FakeCAS(object):
+    """
+    An in-memory fake of the CAS and CSP APIs served over local HTTP.
+
+    Collections are created on first use and hold documents by id. GETs
+    of a collection accept $top and $skip, or page and size, a $filter
+    of eq comparisons joined by and, on properties such as name or
+    tags.item.key, and a $select of properties. A GET of a missing
+    document in an existing collection is answered with 404. Requests
+    other than the authorize call must carry a bearer token. The number
+    of requests served per method and path is kept in hits.
+    """
+    def __init__(self,
+                 machines=0,
+                 latency=None,
+                 throttle=0.0,
+                 retry_after=1,
+                 page_size=200,
+                 max_page_size=None,
+                 token_ttl=1799,
+                 compress=False,
+                 tokens=(),
+                 host='127.0.0.1',
+                 port=0,
+                 seed=None
+                 ):
+        """
+        :param machines: The number of synthetic machines under
+        /iaas/api/machines, defaults to 0.
+        :param latency: The delay before each response in seconds, or a
+        callable returning one, such as FakeCAS.lognormal(0.05, 0.5).
+        Defaults to None, no delay.
+        :param throttle: The share of API requests answered with 429,
+        defaults to 0.
+        :param retry_after: The Retry-After seconds sent with a 429.
+        :param page_size: The page size when a request asks for none,
+        defaults to 200.
+        :param max_page_size: The most items served in a page, however
+        many a request asks for, as some servers cap it. Defaults to None,
+        no cap.
+        :param token_ttl: The lifetime in seconds of issued access tokens.
+        :param compress: Whether to gzip bodies for clients that accept it,
+        defaults to False.
+        :param tokens: Access tokens accepted without logging in.
+        :param port: The port to listen on, defaults to any free port.
+        :param seed: Seeds the latency and throttling draws.
+        """
+        self.latency = latency
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.token_ttl = token_ttl
+        self.compress = compress
+        self.hits = collections.Counter()
+        self.collections = collections.defaultdict(dict)
+        self.orgs = {}
+        self.tokens = set(tokens)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        machine_docs = self.collections['/iaas/api/machines']
+        for i in range(machines):
+            machine = synthetic_machine(i)
+            machine_docs[machine['id']] = machine
+        self._server = _ThreadingHTTPServer((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @staticmethod
+    def lognormal(median, sigma):
+        """
+        Returns a latency distribution with the given median in seconds,
+        and a long tail set by sigma.
+        """
+        rng = random.Random()
+        return lambda: rng.lognormvariate(0, sigma) * median
+
+    def start(self):
+        """
+        Serves requests from a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops serving and closes the listening socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add(self, collection, document):
+        """
+        Stores a document in a collection, giving it an id and selfLink
+        if it has none, and returns it.
+        """
+        document.setdefault('id', str(uuid.uuid4()))
+        document.setdefault('selfLink', f'{collection}/{document["id"]}')
+        with self._lock:
+            self.collections[collection][document['id']] = document
+        return document
+
+    def _delay(self):
+        if self.latency is None:
+            return 0
+        if callable(self.latency):
+            return self.latency()
+        return self.latency
+
+    def _throttled(self):
+        with self._lock:
+            return self._random.random() < self.throttle
+
+    def handle(self, method, path, query, headers, body):
+        """
+        Answers one request.
+        :return: The status, the JSON response (or None) and extra headers.
+        """
+        with self._lock:
+            self.hits[(method, path)] += 1
+        if path == _AUTHORIZE and method == 'POST':
+            return self._authorize(query)
+        token = (headers.get('csp-auth-token')
+                 or headers.get('Authorization', '').replace('Bearer ', '', 1))
+        if token not in self.tokens:
+            return 401, {'message': 'Unauthorized'}, {}
+        if self.throttle and self._throttled():
+            return 429, {'message': 'Too many requests'}, {'Retry-After': str(self.retry_after)}
+        if path.startswith('/csp/'):
+            return self._csp(method, path, query, body)
+        if path.startswith(API_PREFIXES):
+            return self._api(method, path, query, body)
+        return 404, {'message': f'No route for {path}'}, {}
+
+    def _authorize(self, query):
+        refresh_token = query.get('refresh_token', [''])[0]
+        if not refresh_token:
+            return 400, {'message': 'Missing refresh_token'}, {}
+        access_token = uuid.uuid4().hex
+        with self._lock:
+            self.tokens.add(access_token)
+        return 200, {'access_token': access_token,
+                     'refresh_token': refresh_token,
+                     'token_type': 'bearer',
+                     'expires_in': self.token_ttl}, {}
+
+    def _org(self, org_id):
+        with self._lock:
+            if org_id not in self.orgs:
+                self.orgs[org_id] = {'name': org_id,
+                                     'displayName': f'Org {org_id}',
+                                     'refLink': f'/csp/gateway/am/api/orgs/{org_id}',
+                                     'metadata': {},
+                                     'users': []}
+            return self.orgs[org_id]
+
+    def _csp(self, method, path, query, body):
+        match = _ORG.match(path)
+        if match and method == 'GET':
+            org = self._org(match.group(1))
+            return 200, {k: v for k, v in org.items() if k != 'users'}, {}
+        match = _USER_SEARCH.match(path)
+        if match and method == 'GET':
+            term = query.get('userSearchTerm', [''])[0]
+            users = self._org(match.group(1))['users']
+            return 200, {'results': [u for u in users if term in u['username']]}, {}
+        match = _USERS.match(path)
+        if match and method == 'GET':
+            return 200, {'results': self._org(match.group(1))['users']}, {}
+        if match and method == 'PATCH':
+            org = self._org(match.group(1))
+            emails = set(body.get('emails', []))
+            with self._lock:
+                org['users'] = [u for u in org['users'] if u['username'] not in emails]
+            return 200, {}, {}
+        match = _INVITATIONS.match(path)
+        if match and method == 'POST':
+            org = self._org(match.group(1))
+            with self._lock:
+                org['users'].extend({'username': u} for u in body.get('usernames', []))
+            return 200, {}, {}
+        return 404, {'message': f'No route for {path}'}, {}
+
+    def _api(self, method, path, query, body):
+        path = path.rstrip('/')
+        collection, _, item_id = path.rpartition('/')
+        with self._lock:
+            parent = self.collections.get(collection)
+            item = parent.get(item_id) if parent is not None else None
+        if item is None:
+            if method == 'GET' and parent is None:
+                return self._list(path, query)
+            if method == 'POST':
+                return 201, self.add(path, dict(body or {})), {}
+            return 404, {'message': f'{path} not found'}, {}
+        if method == 'GET':
+            return 200, item, {}
+        if method in ('PUT', 'PATCH'):
+            with self._lock:
+                if method == 'PUT':
+                    item = {'id': item['id'], 'selfLink': item['selfLink']}
+                item.update(body or {})
+                self.collections[collection][item_id] = item
+            return 200, item, {}
+        if method == 'DELETE':
+            with self._lock:
+                self.collections[collection].pop(item_id, None)
+            return 204, None, {}
+        return 405, {'message': f'{method} not allowed'}, {}
+
+    def _size(self, requested):
+        size = int(requested)
+        if self.max_page_size is not None:
+            return min(size, self.max_page_size)
+        return size
+
+    def _list(self, path, query):
+        with self._lock:
+            documents = list(self.collections.get(path, {}).values())
+        if '$filter' in query:
+            clauses = _EQ.findall(query['$filter'][0])
+            documents = [d for d in documents
+                         if all(v.replace("''", "'") in map(str, _values(d, k))
+                                for k, v in clauses)]
+        total = len(documents)
+        if 'page' in query or 'size' in query:
+            size = self._size(query.get('size', [self.page_size])[0])
+            page = int(query.get('page', [0])[0])
+            skip = page * size
+        else:
+            size = self._size(query.get('$top', [self.page_size])[0])
+            skip = int(query.get('$skip', [0])[0])
+            page = skip // size if size else 0
+        content = documents[skip:skip + size]
+        if '$select' in query:
+            fields = query['$select'][0].split(',')
+            content = [{k: d[k] for k in fields if k in d} for d in content]
+        if path.startswith('/pipeline/api/'):
+            links = [d['selfLink'] for d in content]
+            return 200, {'count': len(content),
+                         'totalCount': total,
+                         'links': links,
+                         'documents': {d['selfLink']: d for d in content}}, {}
+        return 200, {'content': content,
+                     'totalElements': total,
+                     'numberOfElements': len(content),
+                     'totalPages': -(-total // size) if size else 0,
+                     'number': page,
+                     'size': size}, {}
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer is only in Python 3.7 and later.
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        fake = self.server.fake
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+        parts = urlsplit(self.path)
+        delay = fake._delay()
+        if delay > 0:
+            time.sleep(delay)
+        status, j, headers = fake.handle(self.command,
+                                         parts.path,
+                                         parse_qs(parts.query),
+                                         self.headers,
+                                         body)
+        content = b'' if j is None else json.dumps(j).encode()
+        self.send_response(status)
+        if content:
+            self.send_header('Content-Type', 'application/json')
+            if (fake.compress
+                    and 'gzip' in self.headers.get('Accept-Encoding', '')):
+                content = gzip.compress(content, compresslevel=1)
+                self.send_header('Content-Encoding', 'gzip')
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+def main(port=8080, machines=100000):
+    server = FakeCAS(machines=machines, port=port)
+    print(f'Serving {machines} machines on {server.url}')
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -3,15 +3,19 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
+from .odata import eq, ne, select, tag, where
+from .tracing import traced
+
+
 class Network(object):
     def __init__(self, network):
         pass
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False, prefetch=4):
         uri = f'/iaas/api/networks'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy,
+                             prefetch=prefetch)
 
     @classmethod
     def describe(cls, session, id):
@@ -31,10 +35,28 @@ class Machine(object):
         pass
 
     @staticmethod
-    def list(session):
-        uri = f'/iaas/api/machines'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+    def list(session, stream=False, lazy=False, prefetch=4, fields=None):
+        """Lists machines.
+
+        :param session: The Session object
+        :type session: cls
+        :param stream: Return a generator that decodes machines as each
+            page arrives instead of a list. Defaults to False.
+        :type stream: bool
+        :param lazy: Return an iterator that fetches a page at a time as
+            it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
+        :param prefetch: The number of pages fetched concurrently once
+            the number of machines is known, defaults to 4.
+        :type prefetch: int
+        :param fields: Only return these properties of each machine, eg.
+            ('id', 'name', '_links'). Defaults to all of them.
+        :type fields: list
+        """
+        url = select(f'{session.baseurl}/iaas/api/machines', fields)
+        if stream:
+            return session._stream(url, page_size=200)
+        return session._list(url, lazy, prefetch=prefetch)
 
     @classmethod
     def describe(cls, session, id):
@@ -42,6 +64,7 @@ class Machine(object):
         return session._request(f'{session.baseurl}{uri}')
 
     @staticmethod
+    @traced
     def get_ip(session,
                machine_id,
                nic_index=0,
@@ -77,17 +100,26 @@ class Machine(object):
                          )
 
     @staticmethod
-    def find_by_user(session, user):
-        uri = (f"/iaas/api/machines?$filter=(((type eq 'VM_GUEST') and "
-               f"(lifecycleState ne 'RETIRED')) and "
-               f"(tenantLinks.item eq "
-               f"'/owner/provisioning/auth/csp/users/{user}'))"
-               )
-        return session._request(f'{session.baseurl}{uri}')['content']
+    def find_by_user(session, user, lazy=False):
+        url = where(f'{session.baseurl}/iaas/api/machines',
+                    eq('type', 'VM_GUEST'),
+                    ne('lifecycleState', 'RETIRED'),
+                    eq('tenantLinks.item',
+                       f'/owner/provisioning/auth/csp/users/{user}'))
+        return session._list(url, lazy)
+
+    @staticmethod
+    def find_by_tag(session, key, value=None, lazy=False):
+        """Lists machines tagged key, or key:value when value is given."""
+        url = where(f'{session.baseurl}/iaas/api/machines', tag(key, value))
+        return session._list(url, lazy)
 
     @staticmethod
-    def list_orphaned(session):
+    def list_orphaned(session, stream=False):
         uri = f'/provisioning/uerp/resources/compute?$filter=customProperties.__groupResourcePlacementLink eq *'
+        if stream:
+            return session._stream(f'{session.baseurl}{uri}',
+                                   key='documentLinks')
         return session._request(f'{session.baseurl}{uri}')['documentLinks']
 
     @staticmethod
@@ -3,6 +3,8 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
+from .tracing import traced
+
 
 class Integration: 
     """
@@ -16,6 +18,7 @@ class Integration:
         self.id = integration['id']
 
     @staticmethod
+    @traced
     def list(session):
         """Retrieves list of all resource endpoints.
 
@@ -66,18 +69,20 @@ class Source:
         self.id = source['name']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         """Retrieves list of all integration source within a
         Organization
 
         :param session: The session object.
         :type session: object
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
         :return: A list of sources.
         :rtype: list
         """
         uri = '/content/api/sources/'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def delete(session,id):
@@ -101,18 +106,20 @@ class CatalogSource:
         self.id = source['name']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         """Retrieves list of all integration source within a
         Organization
 
         :param session: The session object.
         :type session: object
+        :param lazy: Return an iterator that fetches a page at a time as
+        it is consumed instead of a list. Defaults to False.
+        :type lazy: bool
         :return: A list of sources.
         :rtype: list
         """
         uri = '/catalog/api/admin/sources/'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def delete(session,id):
@@ -6,6 +6,8 @@
 
 from abc import ABCMeta
 
+from .odata import eq, where
+
 
 class StorageProfile(metaclass=ABCMeta):
     """
@@ -36,9 +38,9 @@ class StorageProfile(metaclass=ABCMeta):
             pass
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/storage-profiles'
-        return session._request(f'{session.baseurl}{uri}')['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def delete(session, id):
@@ -53,9 +55,9 @@ class StorageProfileAzure(StorageProfile):
         super().__init__(storageprofile)
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/storage-profiles-azure/'
-        return session._request(f'{session.baseurl}{uri}')['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @classmethod
     def describe(cls, session, id):
@@ -132,9 +134,9 @@ class StorageProfileAWS(StorageProfile):
         super().__init__(storageprofile)
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/storage-profiles-aws/'
-        return session._request(f'{session.baseurl}{uri}')['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def delete(session, id):
@@ -205,10 +207,9 @@ class StorageProfilevSphere(StorageProfile):
         super().__init__(storageprofile)
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/storage-profiles-vsphere'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def delete(session, id):
@@ -230,10 +231,9 @@ class ImageMapping(object):
         self.image_mappings = mapping['imageMappings']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/image-profiles'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     def describe(self, session, id):
         uri = f'/iaas/api/image-profiles/{id}'
@@ -275,7 +275,10 @@ class ImageMapping(object):
 
 class Flavor(object):
     def __init__(self, flavor):
-        pass
+        self.id = flavor.get('id')
+        self.name = flavor.get('name')
+        self.external_region_id = flavor.get('externalRegionId')
+        self._links = flavor.get('_links')
 
     @staticmethod
     def describe(session):
@@ -284,8 +287,8 @@ class Flavor(object):
 
     @classmethod
     def describe_by_name(cls, session, name):
-        uri = f'/iaas/api/flavors/'
-        j = session._request(f'{session.baseurl}{uri}')['content'][0]
+        url = where(f'{session.baseurl}/iaas/api/flavors/', eq('name', name))
+        j = session._request(url)['content'][0]
         return cls(j)
 
 
@@ -304,10 +307,9 @@ class FlavorMapping(object):
         self.flavor_mappings = mapping['flavorMappings']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = '/iaas/api/flavor-profiles'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @staticmethod
     def delete(session, id):
@@ -365,10 +367,9 @@ class NetworkProfile(object):
         self._links = network['_links']
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/api/network-profiles'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @classmethod
     def create(cls,
@@ -0,0 +1,91 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for building the OData query options of /iaas/api requests.
+
+select trims the properties returned, and where adds a $filter built from
+clauses such as eq('name', name), so lookups are answered by the API
+rather than by downloading a whole collection.
+"""
+
+from urllib.parse import quote
+
+
+def select(url, fields):
+    """
+    Returns url with a $select of fields, so the API returns only those
+    properties of each document, or url unchanged when fields is empty.
+    The models that can be built from trimmed documents, such as Image,
+    NetworkFabric and CloudZone, set the properties left out to None.
+    :param fields: Property names, eg. ('id', 'name', '_links').
+    """
+    if not fields:
+        return url
+    if isinstance(fields, str):
+        fields = (fields,)
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}$select={quote(','.join(fields), safe=',_')}"
+
+
+def literal(value):
+    """
+    Returns value as an OData literal. Strings are single quoted, with any
+    quote inside doubled, so a name such as O'Neil cannot end the string
+    early or inject another clause.
+    """
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def eq(name, value):
+    return f'{name} eq {literal(value)}'
+
+
+def ne(name, value):
+    return f'{name} ne {literal(value)}'
+
+
+def tag(key, value=None):
+    """
+    Returns a clause matching documents tagged key, or key:value.
+    """
+    if value is None:
+        return eq('tags.item.key', key)
+    return all_of(eq('tags.item.key', key), eq('tags.item.value', value))
+
+
+def all_of(*clauses):
+    """
+    Joins clauses with and, skipping any that are None.
+    """
+    return ' and '.join(f'({c})' for c in clauses if c is not None)
+
+
+def any_of(*clauses):
+    """
+    Joins clauses with or, skipping any that are None.
+    """
+    return ' or '.join(f'({c})' for c in clauses if c is not None)
+
+
+def where(url, *clauses):
+    """
+    Returns url with a $filter of clauses joined by and, percent-encoded
+    so characters such as & and # in values survive, or url unchanged
+    when every clause is None.
+
+    Example:
+    where(f'{session.baseurl}/iaas/api/zones', eq('name', name))
+    """
+    expression = all_of(*clauses)
+    if not expression:
+        return url
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}$filter={quote(expression, safe='()')}"
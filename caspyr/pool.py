@@ -0,0 +1,161 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for driving many orgs concurrently from one process.
+"""
+
+import contextlib
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+from .session import Session
+
+
+class _Entry(object):
+    __slots__ = ('session', 'semaphore', 'lock', 'last_used', 'users')
+
+    def __init__(self, max_per_org):
+        self.session = None
+        self.semaphore = threading.BoundedSemaphore(max_per_org)
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.users = 0
+
+
+class SessionPool(object):
+    """
+    Logged in sessions keyed by refresh token, one per org.
+
+    A session is logged in the first time its refresh token is used, and
+    every session sends through one shared connection pool. session()
+    limits how many callers may use one org's session at a time, and
+    sessions left unused for idle_timeout seconds are dropped, to be
+    logged in again if needed.
+
+    Example:
+    with SessionPool(max_per_org=4) as pool:
+        with pool.session(refresh_token) as s:
+            User.invite(s, org_id, [user])
+
+    Pooled sessions share their transport, which closing one of them
+    leaves open. Close the pool to close the shared connections.
+    """
+    def __init__(self,
+                 max_per_org=4,
+                 idle_timeout=600,
+                 pool_connections=10,
+                 pool_maxsize=50,
+                 **kwargs
+                 ):
+        """
+        :param max_per_org: The number of callers that may use one org's
+        session at the same time, defaults to 4.
+        :param idle_timeout: The seconds an unused session is kept,
+        defaults to 600.
+        :param pool_connections: The number of per-host connection pools
+        to keep, defaults to 10.
+        :param pool_maxsize: The keep-alive connections held per host and
+        shared by all sessions, defaults to 50.
+        :param kwargs: Passed to Session.login, eg. retry or token_cache.
+        """
+        self.max_per_org = max_per_org
+        self.idle_timeout = idle_timeout
+        self.logins = 0
+        self._kwargs = kwargs
+        self._adapter = HTTPAdapter(pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, refresh_token):
+        with self._lock:
+            self._evict_idle()
+            entry = self._entries.get(refresh_token)
+            if entry is None:
+                entry = self._entries[refresh_token] = _Entry(self.max_per_org)
+            entry.users += 1
+            return entry
+
+    def _login(self, refresh_token, entry):
+        with entry.lock:
+            if entry.session is None:
+                entry.session = Session.login(refresh_token,
+                                              transport=self._adapter,
+                                              **self._kwargs)
+                self.logins += 1
+        return entry.session
+
+    def _release(self, entry):
+        with self._lock:
+            entry.users -= 1
+            entry.last_used = time.monotonic()
+
+    def get(self, refresh_token):
+        """
+        Returns the session for refresh_token, logging in if needed,
+        without applying the per-org limit.
+        """
+        entry = self._entry(refresh_token)
+        try:
+            return self._login(refresh_token, entry)
+        finally:
+            self._release(entry)
+
+    @contextlib.contextmanager
+    def session(self, refresh_token):
+        """
+        Yields the session for refresh_token, logging in if needed, and
+        waits while max_per_org callers are already using it.
+        """
+        entry = self._entry(refresh_token)
+        try:
+            with entry.semaphore:
+                yield self._login(refresh_token, entry)
+        finally:
+            self._release(entry)
+
+    def _evict_idle(self):
+        """
+        Drops sessions unused for idle_timeout seconds. Call while holding
+        the pool lock.
+        """
+        now = time.monotonic()
+        for refresh_token, entry in list(self._entries.items()):
+            if entry.users == 0 and now - entry.last_used >= self.idle_timeout:
+                del self._entries[refresh_token]
+                if entry.session is not None:
+                    entry.session._cancel_refresh()
+
+    def evict(self, refresh_token):
+        """
+        Drops the session for refresh_token, eg. once its org is torn down.
+        """
+        with self._lock:
+            entry = self._entries.pop(refresh_token, None)
+        if entry is not None and entry.session is not None:
+            entry.session._cancel_refresh()
+
+    def close(self):
+        """
+        Drops every session and closes the shared connections.
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries = {}
+        for entry in entries:
+            if entry.session is not None:
+                entry.session._cancel_refresh()
+        self._adapter.close()
@@ -3,6 +3,9 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
+from .odata import eq, where
+from .tracing import traced
+
 
 class Project(object):
     """
@@ -32,9 +35,9 @@ class Project(object):
         self._links = project['_links']
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, lazy=False):
         uri = '/iaas/api/projects'
-        return session._request(f'{session.baseurl}{uri}')['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @classmethod
     def describe(cls, session, id):
@@ -42,12 +45,25 @@ class Project(object):
         return cls(session._request(f'{session.baseurl}{uri}'))
 
     @classmethod
+    @traced
     def find_by_name(cls, session, name):
-        j = cls.list(session)
-        for i in j:
-            d = cls.describe(session, i['id'])
-            if d.name.lower() == name.lower():
-                return d
+        """
+        Returns the first project whose name matches name, ignoring case,
+        or None.
+
+        The API's eq is case-sensitive, so an exact match is asked for
+        first. Failing that, the projects are listed a page at a time and
+        their names compared in lower case. A failed filtered GET counts
+        as no exact match; a page of the list that fails raises HTTPError.
+        """
+        url = where(f'{session.baseurl}/iaas/api/projects', eq('name', name))
+        j = session._request(url)
+        for i in (j or {}).get('content') or []:
+            return cls(i)
+        name = name.lower()
+        for i in cls.list(session, lazy=True):
+            if i['name'].lower() == name:
+                return cls(i)
 
     @staticmethod
     def delete(session, id):
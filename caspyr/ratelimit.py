@@ -0,0 +1,98 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for client-side rate limiting of API calls.
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket. Tokens refill at rate per second up to
+    burst, and each request takes one.
+    """
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: The sustained number of requests per second.
+        :param burst: The number of requests that may be sent back to back,
+        defaults to rate (at least 1).
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token and returns how many seconds the caller must wait
+        before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter(object):
+    """
+    Limits requests per API host with one token bucket per host.
+
+    The CAS API and the CSP console are limited separately. One limiter can
+    be passed to several sessions in a process so that they share a limit.
+
+    Example:
+    limiter = RateLimiter(rate=10, burst=20,
+                          limits={'console.cloud.vmware.com': (2, 5)})
+    session = Session.login(api_token, rate_limiter=limiter)
+    """
+    def __init__(self, rate=None, burst=None, limits=None):
+        """
+        :param rate: The default requests per second for any host,
+        defaults to None which leaves hosts without a limit unthrottled.
+        :param burst: The default burst size for any host.
+        :param limits: A dict of host to (rate, burst) overriding the
+        defaults for that host.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.limits = dict(limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.limits.get(host, (self.rate, self.burst))
+                if rate is not None:
+                    bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, url):
+        """
+        Takes a token for the host of url and returns the seconds to wait.
+        """
+        bucket = self._bucket(urlsplit(url).netloc)
+        if bucket is None:
+            return 0.0
+        return bucket.reserve()
+
+    def acquire(self, url):
+        """
+        Blocks until a request to the host of url may be sent.
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
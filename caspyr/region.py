@@ -3,6 +3,8 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
+from .odata import eq, where
+
 
 class Region(object):
     """
@@ -19,10 +21,9 @@ class Region(object):
         self._links = region['_links']
 
     @staticmethod
-    def list(session):
+    def list(session, lazy=False):
         uri = f'/iaas/api/regions'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(f'{session.baseurl}{uri}', lazy)
 
     @classmethod
     def describe(cls, session, id):
@@ -30,6 +31,7 @@ class Region(object):
         return cls(session._request(f'{session.baseurl}{uri}'))
 
     def describe_by_name(self, session, name):
-        uri = f'/iaas/api/regions/?$filter=(externalRegionId eq \'{name}\')'
-        j = session._request(f'{session.baseurl}{uri}')
+        url = where(f'{session.baseurl}/iaas/api/regions/',
+                    eq('externalRegionId', name))
+        j = session._request(url)
         return j
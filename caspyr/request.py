@@ -3,8 +3,12 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
+import itertools
 import os
 
+from .odata import eq, where
+from .tracing import traced
+
 
 class Request:
     def __init__(self, request):
@@ -77,11 +81,47 @@ class Request:
 
     @classmethod
     def list_incomplete(cls,
-                        session):
-        r = cls.list(session)
-        data = []
-        for i in r:
-            d = cls.describe(session, i['id'])
-            if d.status == 'STARTED':
-                data.append({"id": d.id})
-        return data
+                        session,
+                        stream=False,
+                        max_workers=8
+                        ):
+        """
+        Lists the blueprint requests still in progress, as {"id": id}.
+
+        Asks the API for requests with status STARTED. When it answers
+        with documents, their status is read from them, page by page.
+        When it answers with links only, each request is described, up
+        to max_workers at a time, and the started ones are kept.
+        :param stream: Return a generator yielding each match as soon as
+        it is found, in no particular order, instead of a list. Requests
+        are made as it is consumed, inside the list_incomplete span.
+        :type stream: bool
+        :param max_workers: The number of describes in flight at once.
+        :type max_workers: int
+        """
+        matches = cls._incomplete(session, max_workers)
+        return matches if stream else list(matches)
+
+    @classmethod
+    @traced(name='Request.list_incomplete')
+    def _incomplete(cls, session, max_workers):
+        url = where(f'{session.baseurl}/blueprint/api/blueprint-requests/',
+                    eq('status', 'STARTED'))
+        pages = session._pages(url)
+        j = next(pages)
+        if 'content' in j:
+            for page in itertools.chain([j], pages):
+                for d in page.get('content') or []:
+                    if d.get('status') == 'STARTED':
+                        yield {"id": d['id']}
+        else:
+            ids = [os.path.split(i)[1] for i in j['links']]
+            yield from cls._started(session, ids, max_workers)
+
+    @classmethod
+    def _started(cls, session, ids, max_workers):
+        for outcome in session.imap(cls.describe, ids, max_workers):
+            if not outcome.ok:
+                raise outcome.error
+            if outcome.result.status == 'STARTED':
+                yield {"id": outcome.result.id}
@@ -0,0 +1,104 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module describing when failed requests are retried.
+"""
+
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'DELETE', 'PUT'])
+RETRY_STATUS_CODES = frozenset([429, 502, 503, 504])
+
+
+class RetryPolicy(object):
+    """
+    Decides whether a failed request is retried and how long to wait first.
+
+    Waits grow exponentially with full jitter, unless the server sends a
+    Retry-After header, which is honoured instead. Only idempotent methods
+    are retried. PATCH is left out by default as a repeated PATCH is not
+    always safe; add it to methods where it is.
+    """
+    def __init__(self,
+                 total=3,
+                 backoff_factor=0.5,
+                 max_backoff=30,
+                 budget=60,
+                 methods=IDEMPOTENT_METHODS,
+                 status_codes=RETRY_STATUS_CODES,
+                 respect_retry_after=True
+                 ):
+        """
+        :param total: The number of retries allowed per request,
+        defaults to 3. 0 disables retries.
+        :param backoff_factor: The base wait in seconds. The n-th retry waits
+        a random time up to backoff_factor * 2 ** n, defaults to 0.5.
+        :param max_backoff: The upper bound for a single wait in seconds,
+        defaults to 30.
+        :param budget: The total time in seconds a request may spend,
+        including waits, before no further retries are made. Defaults to 60.
+        :param methods: The HTTP methods that may be retried.
+        :param status_codes: The HTTP status codes that trigger a retry.
+        :param respect_retry_after: Whether to wait as long as the
+        Retry-After header asks, defaults to True.
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.methods = frozenset(methods)
+        self.status_codes = frozenset(status_codes)
+        self.respect_retry_after = respect_retry_after
+
+    def sleep_for(self,
+                  request_method,
+                  attempt,
+                  elapsed,
+                  status=None,
+                  retry_after=None
+                  ):
+        """
+        Returns how many seconds to wait before the next attempt, or None
+        if the request should not be retried.
+        :param request_method: The HTTP method of the request.
+        :param attempt: The number of retries already made.
+        :param elapsed: The seconds spent on the request so far.
+        :param status: The HTTP status code received, or None when the
+        request failed to connect.
+        :param retry_after: The value of the Retry-After header, if any.
+        """
+        if request_method not in self.methods or attempt >= self.total:
+            return None
+        if status is not None and status not in self.status_codes:
+            return None
+        delay = None
+        if self.respect_retry_after and retry_after is not None:
+            delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            cap = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+            delay = random.uniform(0, cap)
+        if elapsed + delay > self.budget:
+            return None
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Converts a Retry-After header in seconds or HTTP-date form to
+        seconds, or None if it cannot be read.
+        """
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
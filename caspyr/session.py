@@ -3,19 +3,89 @@
 
 # SPDX-License-Identifier: Apache-2.0
 
-import json
+import contextvars
 import logging
-import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from . import bulk
+from . import deadline
+from . import tracing
+from .codec import default_codec
+from .retry import RetryPolicy
+from .stats import RequestStats, route
+from .stream import ArrayItems
 
-logging.basicConfig(level=os.getenv('caspyr_log_level'),
-                    format='%(asctime)s %(name)s %(levelname)s %(message)s',
-                    filename=os.getenv('caspyr_log_file')
-                    )
 logger = logging.getLogger(__name__)
 logging.getLogger('requests').setLevel(logging.CRITICAL)
 logging.getLogger('urllib3').setLevel(logging.CRITICAL)
 
+# Collections paged with page and size rather than $top and $skip.
+PAGE_SIZE_APIS = ('/blueprint/api/',
+                  '/deployment/api/',
+                  '/event-broker/api/',
+                  '/abx/api/',
+                  '/content/api/',
+                  '/catalog/api/')
+
+
+def _page_url(url, skip, page_size):
+    """
+    Returns url for the page starting at item skip, with page and size for
+    the APIs in PAGE_SIZE_APIS and $top and $skip otherwise.
+    """
+    if urlsplit(url).path.startswith(PAGE_SIZE_APIS):
+        params = f'page={skip // page_size}&size={page_size}'
+    else:
+        params = f'$top={page_size}&$skip={skip}'
+    separator = '&' if '?' in url else '?'
+    return f'{url}{separator}{params}'
+
+
+def _has_next(j, count, skip, page_size):
+    """
+    Returns whether a collection goes on past a page of count items that
+    ends at item skip. When the page reports totalElements, paging goes
+    on until that many items or an empty page, so a server capping the
+    page size below page_size is still listed in full. Otherwise a page
+    of other than page_size items is the last; a longer one means paging
+    was ignored and the whole collection was returned.
+    :param j: The page, or the properties of it other than the items.
+    """
+    if j.get('last'):
+        return False
+    total = j.get('totalElements')
+    if total is not None:
+        return count > 0 and skip < total
+    return count == page_size
+
+
+def _body_size(data):
+    if not data:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode())
+    return len(data)
+
+
+def _response_size(r, stream):
+    """
+    Returns the bytes received, as sent on the wire where the server says.
+    """
+    length = r.headers.get('Content-Length')
+    if length is not None:
+        return int(length)
+    if stream:
+        return 0
+    return len(r.content)
+
 
 class Session(object):
     """
@@ -23,40 +93,455 @@ class Session(object):
     for VMware Cloud Services.
 
     Requires refresh token from VMware Cloud Services portal to instantiate.
+
+    Each session owns a pooled HTTP transport, so connections to
+    the CAS API and the CSP console are kept alive and reused across calls.
+    Call close() when finished, or use the session as a context manager.
+
+    Sessions created with login() track when their access token expires and
+    refresh it in the background shortly before, and again on demand if a
+    request finds it stale.
     """
-    def __init__(self, auth_token):
+    # Seconds before expiry at which the access token is refreshed.
+    refresh_margin = 300
+
+    def __init__(self,
+                 auth_token,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 pool_block=False,
+                 retry=None,
+                 rate_limiter=None,
+                 codec=None,
+                 cache=None,
+                 single_flight=None,
+                 timeout=(10, 60),
+                 breaker=None,
+                 transport=None,
+                 request_stats=None,
+                 on_request=None,
+                 on_response=None,
+                 on_error=None,
+                 tracer=None,
+                 baseurl='https://api.mgmt.cloud.vmware.com',
+                 csp_url='https://console.cloud.vmware.com'
+                 ):
+        """
+        :param auth_token: The access token used to authenticate requests.
+        :param pool_connections: The number of per-host connection pools
+        to keep, defaults to 10.
+        :param pool_maxsize: The maximum number of keep-alive connections
+        held per host, defaults to 10.
+        :param pool_block: Whether to block when all connections to a host
+        are in use, rather than opening a throwaway connection.
+        Defaults to False.
+        :param retry: The RetryPolicy applied to idempotent requests,
+        defaults to RetryPolicy().
+        :param rate_limiter: A RateLimiter throttling requests per host.
+        It may be shared between sessions. Defaults to None (no limit).
+        :param codec: The JSON codec for request and response bodies, any
+        object with dumps and loads. Defaults to orjson when installed,
+        otherwise the standard library.
+        :param cache: A ResponseCache for GET responses, which may be shared
+        between sessions. Defaults to None (no caching).
+        :param single_flight: A SingleFlight that lets identical concurrent
+        GETs share one request. It may be shared between sessions.
+        Defaults to None.
+        :param timeout: The connect and read timeouts in seconds, as a
+        tuple or one number for both. Defaults to (10, 60). Inside a
+        deadline block they are shortened to the time left.
+        :param breaker: A CircuitBreaker that fails fast on an endpoint
+        family after repeated failures. It may be shared between sessions.
+        Defaults to None.
+        :param transport: A requests transport adapter to send requests
+        through instead of the pooled HTTPAdapter, such as a Cassette
+        recorder or player. The pool arguments are then ignored, and the
+        caller keeps ownership: close() leaves the transport open.
+        :param request_stats: The RequestStats recording every HTTP call,
+        which may be shared between sessions. Defaults to a new one.
+        :param on_request: Called as on_request(method, url, headers,
+        data) before each HTTP call, including retries.
+        :param on_response: Called as on_response(method, url, response,
+        elapsed) after each HTTP call that gets a response.
+        :param on_error: Called as on_error(method, url, exception,
+        elapsed) after each HTTP call that fails to connect or times out.
+        :param tracer: An OpenTelemetry compatible tracer to open a span
+        for each HTTP call and multi-call helper. Defaults to None.
+        :param baseurl: The CAS API endpoint, defaults to the public cloud.
+        :param csp_url: The Cloud Services Portal endpoint used to log in
+        and manage users, defaults to the public cloud.
+        """
+        self.baseurl = baseurl
+        self.csp_url = csp_url
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.codec = codec if codec is not None else default_codec()
+        self.cache = cache
+        self.single_flight = single_flight
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        self.timeout = timeout
+        self.breaker = breaker
+        self.request_stats = (request_stats if request_stats is not None
+                              else RequestStats())
+        self.on_request = on_request
+        self.on_response = on_response
+        self.on_error = on_error
+        self.tracer = tracer
+        self._http = requests.Session()
+        adapter = transport
+        self._owns_transport = transport is None
+        if adapter is None:
+            adapter = HTTPAdapter(pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize,
+                                  pool_block=pool_block
+                                  )
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+        self.refresh_token = None
+        self.token_cache = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer = None
+        self._set_token(auth_token)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes all pooled connections held by this session and stops
+        refreshing its token. A transport passed in by the caller, which
+        may be shared with other sessions, is left open.
+        """
+        self._cancel_refresh()
+        if not self._owns_transport:
+            self._http.adapters.clear()
+        self._http.close()
+
+    def _set_token(self, auth_token, expires_at=None):
         self.token = auth_token
+        self.expires_at = expires_at
+        self._refresh_at = None
+        if expires_at is not None:
+            lifetime = expires_at - time.time()
+            self._refresh_at = expires_at - min(self.refresh_margin,
+                                                lifetime / 2)
         self.headers = {'Content-Type': 'application/json',
+                        'Accept-Encoding': 'gzip, deflate',
                         'Authorization': f'Bearer {self.token}',
-			'csp-auth-token': f'{self.token}'}
-        self.baseurl = 'https://api.mgmt.cloud.vmware.com'
+                        'csp-auth-token': f'{self.token}'}
 
     @classmethod
-    def login(self, refresh_token):
-            baseurl = 'https://console.cloud.vmware.com/csp/gateway/am/api'
-            uri = f'/auth/api-tokens/authorize?refresh_token={refresh_token}'
-            headers = {'Content-Type': 'application/json'}
-            payload = {}
-            logger.debug(f'POST to: {baseurl}{uri} \n'
-                         f'with headers: {headers} \n'
-                         f'and body: {payload}.\n'
-                         )
+    def login(cls,
+              refresh_token,
+              token_cache=None,
+              auto_refresh=True,
+              **kwargs
+              ):
+            """
+            Exchanges a refresh token for an access token.
+            :param refresh_token: The API token from the Cloud Services portal.
+            :param token_cache: A TokenCache shared with other processes
+            using the same refresh token, defaults to None.
+            :param auto_refresh: Whether to refresh the access token in a
+            background thread before it expires, defaults to True.
+            :param kwargs: Passed through to the Session constructor, for
+            example pool_maxsize.
+            :return: A logged in session.
+            """
+            session = cls(None, **kwargs)
+            session.refresh_token = refresh_token
+            session.token_cache = token_cache
+            try:
+                session.refresh()
+            except requests.exceptions.HTTPError:
+                session.close()
+                raise
+            if auto_refresh:
+                session._schedule_refresh()
+            return session
+
+    def _authorize(self):
+        """
+        Exchanges the refresh token for an access token with CSP.
+        :return: The access token and the time it expires at.
+        """
+        baseurl = f'{self.csp_url}/csp/gateway/am/api'
+        uri = f'/auth/api-tokens/authorize?refresh_token={self.refresh_token}'
+        headers = {'Content-Type': 'application/json'}
+        payload = {}
+        logger.debug('POST to: %s%s \n'
+                     'with headers: %s \n'
+                     'and body: %s.\n',
+                     baseurl, uri, headers, payload
+                     )
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(baseurl)
+        timeout = self._timeout(deadline.check(baseurl))
+        if self.breaker is not None:
+            family = self.breaker.allow(baseurl)
+        success = False
+        try:
+            r = self._http.post(f'{baseurl}{uri}',
+                                headers=headers,
+                                data=payload,
+                                timeout=timeout)
+            success = r.status_code < 500
+        finally:
+            if self.breaker is not None:
+                self.breaker.record(family, success)
+        j = self.codec.loads(r.content)
+        logger.debug('Status code" %s \n'
+                     'Response: %s \n',
+                     r.status_code, j)
+        try:
+            r.raise_for_status()
+        except requests.exceptions.HTTPError:
+            logger.error('Failed to authenticate.')
+            logger.error('Error message %s', j['message'],
+                         exc_info=False)
+            raise
+        logger.info('Authenticated successfully.')
+        expires_at = None
+        if 'expires_in' in j:
+            expires_at = time.time() + j['expires_in']
+        return j['access_token'], expires_at
+
+    def refresh(self):
+        """
+        Replaces the access token with a fresh one. When the session has a
+        token cache, a token another process cached is reused while it is
+        valid for longer than refresh_margin.
+        """
+        with self._refresh_lock:
+            self._refresh()
 
+    def _refresh(self):
+        if self.token_cache is None:
+            self._set_token(*self._authorize())
+            return
+        with self.token_cache.lock():
+            cached = self.token_cache.get(self.refresh_token,
+                                          min_ttl=self.refresh_margin)
+            if cached is None:
+                cached = self._authorize()
+                if cached[1] is not None:
+                    self.token_cache.put(self.refresh_token, *cached)
+            self._set_token(*cached)
+
+    def _token_stale(self):
+        return (self.refresh_token is not None
+                and self._refresh_at is not None
+                and time.time() >= self._refresh_at)
+
+    def _ensure_token(self):
+        if self._token_stale():
+            with self._refresh_lock:
+                if self._token_stale():
+                    self._refresh()
+
+    def _schedule_refresh(self, delay=None):
+        self._cancel_refresh()
+        if delay is None:
+            if self._refresh_at is None:
+                return
+            delay = max(0, self._refresh_at - time.time())
+        self._refresh_timer = threading.Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _cancel_refresh(self):
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    def _background_refresh(self):
+        try:
+            self._ensure_token()
+        except Exception:
+            logger.warning('Background token refresh failed, '
+                           'retrying in 30s.', exc_info=True)
+            self._schedule_refresh(30)
+        else:
+            self._schedule_refresh()
+
+    def _send(self,
+              request_method,
+              url,
+              data=None,
+              headers=None,
+              stream=False
+              ):
+        """
+        Sends a request over the pooled transport, retrying it according
+        to the retry policy.
+        :param headers: Headers to send in addition to the session headers.
+        :param stream: Whether to leave the body unread so it can be
+        consumed in chunks, defaults to False.
+        :return: The final response.
+        """
+        self._ensure_token()
+        if headers:
+            headers = {**self.headers, **headers}
+        else:
+            headers = self.headers
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            timeout = self._timeout(deadline.check(url))
+            family = None
+            if self.breaker is not None:
+                family = self.breaker.allow(url)
             try:
-                r = requests.post(f'{baseurl}{uri}',
-                                  headers=headers,
-                                  data=payload)
-                logger.debug(f'Status code" {r.status_code} \n'
-                             f'Response: {r.json()} \n')
-                r.raise_for_status()
-                logger.info('Authenticated successfully.')
-                auth_token = r.json()['access_token']
-                return self(auth_token)
-            except requests.exceptions.HTTPError as e:
-                logger.error('Failed to authenticate.')
-                logger.error(f'Error message {r.json()["message"]}',
-                             exc_info=False)
-                raise e
+                r = self._attempt(request_method, url, headers, data,
+                                  timeout, stream, family)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                delay = self.retry.sleep_for(request_method,
+                                             attempt,
+                                             time.monotonic() - started
+                                             )
+                if delay is None or self._out_of_time(delay):
+                    raise
+                logger.warning(f'{request_method} to {url} failed with {e}, '
+                               f'retrying in {delay:.2f}s.')
+            else:
+                delay = self.retry.sleep_for(request_method,
+                                             attempt,
+                                             time.monotonic() - started,
+                                             status=r.status_code,
+                                             retry_after=r.headers.get('Retry-After')
+                                             )
+                if delay is None or self._out_of_time(delay):
+                    return r
+                logger.warning(f'{request_method} to {url} returned '
+                               f'{r.status_code}, retrying in {delay:.2f}s.')
+                if stream:
+                    r.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _attempt(self,
+                 request_method,
+                 url,
+                 headers,
+                 data,
+                 timeout,
+                 stream,
+                 family=None
+                 ):
+        """
+        Makes one HTTP call, recording it in the stats, the circuit
+        breaker, the hooks and a tracing span.
+        :param family: The endpoint family the breaker allowed the call for.
+        Any exception records a failure, so a half-open probe always ends.
+        :return: The response.
+        """
+        success = False
+        try:
+            if self.on_request is not None:
+                self.on_request(request_method, url, headers, data)
+            with tracing.span(self.tracer,
+                              f'{request_method} {route(url)}',
+                              {'http.method': request_method, 'http.url': url}
+                              ) as span:
+                sent = time.monotonic()
+                try:
+                    r = self._http.request(request_method,
+                                           url=url,
+                                           headers=headers,
+                                           data=data,
+                                           timeout=timeout,
+                                           stream=stream)
+                except (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout) as e:
+                    elapsed = time.monotonic() - sent
+                    self.request_stats.record(request_method, url, elapsed,
+                                              error=True,
+                                              bytes_out=_body_size(data))
+                    if self.on_error is not None:
+                        self.on_error(request_method, url, e, elapsed)
+                    raise
+                elapsed = time.monotonic() - sent
+                span.set_attribute('http.status_code', r.status_code)
+                self.request_stats.record(request_method, url, elapsed,
+                                          error=r.status_code >= 400,
+                                          bytes_in=_response_size(r, stream),
+                                          bytes_out=_body_size(data))
+                success = r.status_code < 500
+                if self.on_response is not None:
+                    self.on_response(request_method, url, r, elapsed)
+                return r
+        finally:
+            if family is not None:
+                self.breaker.record(family, success)
+
+    def map(self, fn, items, max_workers=8, progress=None):
+        """
+        Calls fn(session, item) for each item with up to max_workers in
+        parallel, eg. session.map(Deployment.delete, ids). A failing item
+        does not stop the others.
+        :param progress: Called as progress(done, total, outcome) as each
+        call finishes.
+        :return: A list of Outcome(item, result, error) in the order of
+        items.
+        """
+        return bulk.map_threads(fn, self, items, max_workers, progress)
+
+    def imap(self, fn, items, max_workers=8):
+        """
+        Like map, but returns an iterator of each Outcome as its call
+        finishes, in completion order, so results can be acted on while
+        the rest are still in flight.
+        """
+        return bulk.imap_threads(fn, self, items, max_workers)
+
+    def stats(self):
+        """
+        Returns the call count, error count, bytes in and out and latency
+        histogram of every method and route called so far, see
+        RequestStats.snapshot.
+        """
+        return self.request_stats.snapshot()
+
+    def prometheus_stats(self):
+        """
+        Returns stats() in the Prometheus text exposition format.
+        """
+        return self.request_stats.prometheus()
+
+    def _timeout(self, left):
+        """
+        Returns the session timeouts, shortened to the time left before
+        the current deadline.
+        """
+        if left is None:
+            return self.timeout
+        return tuple(left if t is None else min(t, left) for t in self.timeout)
+
+    @staticmethod
+    def _out_of_time(delay):
+        left = deadline.remaining()
+        return left is not None and delay >= left
+
+    @staticmethod
+    def deadline(seconds):
+        """
+        Limits the total time of every request made inside the block,
+        including all the calls of multi-request helpers. Once it has
+        passed, further requests raise DeadlineExceeded.
+
+        Example:
+        with session.deadline(30):
+            ip = Machine.get_ip(session, machine_id)
+        """
+        return deadline.deadline(seconds)
 
     def _request(self,
                  url,
@@ -76,57 +561,232 @@ class Session(object):
         :return: The response JSON
         """
 
+        # Each body is decoded at most once, and log arguments are only
+        # formatted when the level is enabled.
+        if request_method == 'GET':
+            if self.cache is not None:
+                j = self.cache.get(self.token, url)
+                if j is not None:
+                    logger.debug('GET to %s served from cache', url)
+                    return j
+            if self.single_flight is not None:
+                return self.single_flight.do((self.token, url),
+                                             lambda: self._get(url))
+            return self._get(url)
+
         if request_method in ('PUT', 'POST', 'PATCH') and payload:
             if type(payload) == dict:
-                payload = json.dumps(payload)
-            try:
-                r = requests.request(request_method,
-                                     url=url,
-                                     headers=self.headers,
-                                     data=payload)
-                logger.debug(f'{request_method} to {url} '
-                             f'with headers {self.headers} '
-                             f'and body {payload}.'
-                             )
-                logger.debug(f'Request response: {r.json()} \n'
-                             f'Status code" {r.status_code} \n')
-                r.raise_for_status()
-                return r.json()
-            except requests.exceptions.HTTPError:
-                logger.error(r.json(),
-                             exc_info=False
-                             )
-
-        elif request_method == 'GET':
-            try:
-                r = requests.request(request_method,
-                                     url=url,
-                                     headers=self.headers)
-                logger.debug(f'{request_method} to {url} \n'
-                             f'with headers {self.headers} \n'
-                             f'Status code" {r.status_code} \n'
-                             )
-                logger.debug(f'Request response: {r.json()}')
-                r.raise_for_status()
-                return r.json()
-            except requests.exceptions.HTTPError:
-                pass
-                logger.error(r.json(),
-                             exc_info=False
-                             )
-
+                payload = self.codec.dumps(payload)
+            logger.debug('%s to %s with headers %s and body %s.',
+                         request_method, url, self.headers, payload
+                         )
+            r = self._send(request_method, url, data=payload)
         elif request_method == 'DELETE':
-            try:
-                r = requests.request(request_method,
-                                     url=url,
-                                     headers=self.headers)
-                logger.debug(f'{request_method} to {url} \n'
-                             f'with headers {self.headers} \n'
-                             f'Status code" {r.status_code} \n'
-                             )
-                r.raise_for_status()
+            logger.debug('%s to %s \nwith headers %s',
+                         request_method, url, self.headers
+                         )
+            r = self._send(request_method, url)
+        else:
+            return None
+        if self.cache is not None:
+            self.cache.invalidate(url)
+
+        logger.debug('Status code" %s', r.status_code)
+        if request_method == 'DELETE':
+            if r.ok:
                 return r.status_code
-            except requests.exceptions.HTTPError:
-                logger.error(r.json()['message'],
+            logger.error(self.codec.loads(r.content)['message'],
+                         exc_info=False
+                         )
+            return None
+
+        j = self.codec.loads(r.content)
+        logger.debug('Request response: %s', j)
+        if r.ok:
+            return j
+        logger.error(j,
+                     exc_info=False
+                     )
+
+    def _get(self, url):
+        """
+        Performs a GET, revalidating a stale cached response where the
+        cache holds validators for it.
+        :return: The response JSON.
+        """
+        conditional = None
+        if self.cache is not None:
+            conditional = self.cache.conditional_headers(self.token, url)
+        logger.debug('GET to %s \nwith headers %s', url, self.headers)
+        r = self._send('GET', url, headers=conditional)
+        if r.status_code == 304 and conditional:
+            j = self.cache.revalidate(self.token, url)
+            if j is not None:
+                logger.debug('GET to %s not modified', url)
+                return j
+            r = self._send('GET', url)
+
+        logger.debug('Status code" %s', r.status_code)
+        j = self.codec.loads(r.content)
+        logger.debug('Request response: %s', j)
+        if not r.ok:
+            logger.error(j,
+                         exc_info=False
+                         )
+            return None
+        if self.cache is not None:
+            self.cache.set(self.token,
+                           url,
+                           j,
+                           etag=r.headers.get('ETag'),
+                           last_modified=r.headers.get('Last-Modified')
+                           )
+        return j
+
+    def _stream(self, url, key='content', chunk_size=65536, page_size=None):
+        """
+        Performs a GET and yields the items of the top-level array key as
+        the body arrives, without holding the whole body or list in memory.
+        Streamed reads bypass the response cache. A failed GET raises
+        HTTPError.
+        :param url: The complete uri for the requested collection.
+        :param key: The key of the array, 'content' for /iaas/api and
+        'documentLinks' for /provisioning/uerp collections.
+        :param chunk_size: The number of bytes read at a time.
+        :param page_size: Request the collection a page of this many items
+        at a time, as _paginate does, streaming each page in turn until
+        totalElements or, without it, a short page. Defaults to None, a
+        single GET of url.
+        """
+        if page_size is None:
+            yield from self._stream_page(url, key, chunk_size)
+            return
+        skip = 0
+        while True:
+            page = ArrayItems(key)
+            count = 0
+            for item in self._stream_page(_page_url(url, skip, page_size),
+                                          key, chunk_size, page):
+                count += 1
+                yield item
+            skip += count
+            if not _has_next(page.values, count, skip, page_size):
+                return
+            page_size = min(page_size, count)
+
+    def _stream_page(self, url, key, chunk_size, items=None):
+        """
+        Yields the items of one GET of url. Given an ArrayItems, the whole
+        body is decoded into it, so that the properties following the
+        items are in its values afterwards.
+        """
+        logger.debug('GET to %s \nwith headers %s', url, self.headers)
+        r = self._send('GET', url, stream=True)
+        with r:
+            logger.debug('Status code" %s', r.status_code)
+            if not r.ok:
+                logger.error(self.codec.loads(r.content),
                              exc_info=False
                              )
+                r.raise_for_status()
+            whole = items is not None
+            if not whole:
+                items = ArrayItems(key)
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                yield from items.feed(chunk)
+                if items.done and not whole:
+                    return
+            yield from items.feed(b'', final=True)
+
+    def _list(self, url, lazy=False, key='content', prefetch=0):
+        """
+        Returns every item of a collection, as a list or, when lazy, as an
+        iterator fetching a page at a time, see _paginate.
+        """
+        items = self._paginate(url, key, prefetch=prefetch)
+        return items if lazy else list(items)
+
+    def _paginate(self, url, key='content', page_size=200, prefetch=0):
+        """
+        Yields the items of a collection, fetching the next page only when
+        the previous one has been consumed, so memory stays flat and a
+        caller that stops early makes no further requests. Pages are
+        requested with $top and $skip, or with page and size for the APIs
+        in PAGE_SIZE_APIS, until the last page or totalElements is
+        reached, or a short page when no total is reported, see
+        _has_next. A page that fails, after any retries, raises HTTPError
+        rather than ending the collection early.
+        :param url: The complete uri for the requested collection.
+        :param key: The key of the items in each page.
+        :param page_size: The number of items requested per page.
+        :param prefetch: Once the first page reports totalElements, fetch
+        up to this many of the following pages concurrently, still
+        yielding items in order. Defaults to 0, one page at a time.
+        """
+        for j in self._pages(url, key, page_size, prefetch):
+            yield from j.get(key) or []
+
+    def _pages(self, url, key='content', page_size=200, prefetch=0):
+        """
+        Yields each page of a collection as returned, for _paginate and
+        for callers that look at more of a page than its items.
+        """
+        def page(skip):
+            page_url = _page_url(url, skip, page_size)
+            j = self._request(page_url)
+            if j is None:
+                raise requests.exceptions.HTTPError(
+                    f'GET {page_url} failed, so the collection could not '
+                    f'be listed in full.')
+            return j
+
+        skip = 0
+        while True:
+            j = page(skip)
+            items = j.get(key) or []
+            skip += len(items)
+            if not _has_next(j, len(items), skip, page_size):
+                yield j
+                return
+            # A server capping the page size serves fewer items than
+            # asked for. Ask for that many from now on, so the page
+            # numbers of the APIs paged with page and size follow skip.
+            page_size = min(page_size, len(items))
+            total = j.get('totalElements')
+            if prefetch and total is not None:
+                yield from self._prefetch(page, j,
+                                          range(skip, total, page_size),
+                                          prefetch)
+                return
+            yield j
+
+    @staticmethod
+    def _prefetch(page, first, offsets, workers):
+        """
+        Yields first and then the pages at offsets, keeping up to workers
+        pages in flight and yielding them in order. Nothing is prefetched
+        until first has been consumed, and pages not yet fetched are
+        cancelled if the caller stops early.
+        """
+        offsets = iter(offsets)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        pending = deque()
+
+        def fill():
+            for skip in islice(offsets, workers - len(pending)):
+                # Run in a copy of the caller's context so deadlines and
+                # tracing spans carry over into the worker threads.
+                pending.append(pool.submit(contextvars.copy_context().run,
+                                           page, skip))
+
+        try:
+            yield first
+            fill()
+            while pending:
+                j = pending.popleft().result()
+                fill()
+                yield j
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
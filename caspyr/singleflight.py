@@ -0,0 +1,98 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for coalescing identical concurrent requests.
+"""
+
+import asyncio
+import threading
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Lets concurrent callers asking for the same key share one call.
+
+    The first caller for a key makes the call and every caller that arrives
+    while it is in flight waits for and receives the same result, or the
+    same exception. Threads use do() and coroutines use do_async(). The
+    number of calls saved is kept in coalesced.
+
+    Sessions key GET requests by access token and URL, so one SingleFlight
+    can be shared by sessions for different orgs. Results are shared
+    between callers and should be treated as read-only.
+    """
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Returns fn(), sharing one call between threads that ask for the
+        same key at the same time.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, fn):
+        """
+        Returns await fn(), sharing one call between coroutines that ask
+        for the same key at the same time.
+        """
+        future = self._futures.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        # get_event_loop returns the running loop inside a coroutine, and
+        # unlike get_running_loop is available on Python 3.6.
+        future = self._futures[key] = asyncio.get_event_loop().create_future()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else is waiting.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._futures[key]
+        return result
@@ -0,0 +1,142 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for per-endpoint request statistics.
+"""
+
+import bisect
+import re
+import threading
+from urllib.parse import urlsplit
+
+# Upper bounds in seconds of the latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_VERSION = re.compile(r'^v\d+$')
+_DIGIT = re.compile(r'\d')
+
+
+def route(url):
+    """
+    Returns the path of url with resource ids replaced by {id}, eg.
+    /iaas/api/machines/{id} for /iaas/api/machines/8f2c...?$top=1.
+    A segment holding a digit is taken for an id, except an API version.
+    """
+    path = urlsplit(url).path
+    segments = [('{id}' if _DIGIT.search(s) and not _VERSION.match(s) else s)
+                for s in path.split('/')]
+    return '/'.join(segments)
+
+
+class _Route(object):
+    __slots__ = ('count', 'errors', 'bytes_in', 'bytes_out',
+                 'latency_sum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+
+class RequestStats(object):
+    """
+    Thread-safe counters and latency histograms per method and route.
+
+    Sessions record every HTTP call, including each retry, so recording
+    is one dict lookup and a few additions under a lock. One RequestStats
+    may be shared by several sessions to aggregate them.
+    """
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self,
+               request_method,
+               url,
+               elapsed,
+               error=False,
+               bytes_in=0,
+               bytes_out=0
+               ):
+        """
+        Records one HTTP call.
+        :param elapsed: The seconds the call took.
+        :param error: Whether it failed, with a connection error, a
+        timeout or a 4xx or 5xx status.
+        """
+        key = (request_method, route(url))
+        bucket = bisect.bisect_left(BUCKETS, elapsed)
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = _Route()
+            stats.count += 1
+            stats.errors += error
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.latency_sum += elapsed
+            stats.buckets[bucket] += 1
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def snapshot(self):
+        """
+        Returns a dict of (method, route) to a dict with count, errors,
+        bytes_in, bytes_out, latency_sum and latency_buckets, a dict of
+        bucket upper bound to the number of calls that fell in it.
+        """
+        with self._lock:
+            routes = [(k, s, list(s.buckets)) for k, s in self._routes.items()]
+        return {
+            k: {'count': s.count,
+                'errors': s.errors,
+                'bytes_in': s.bytes_in,
+                'bytes_out': s.bytes_out,
+                'latency_sum': s.latency_sum,
+                'latency_buckets': dict(zip(BUCKETS + (float('inf'),), buckets))}
+            for k, s, buckets in routes
+        }
+
+    def prometheus(self, prefix='caspyr'):
+        """
+        Returns the statistics in the Prometheus text exposition format.
+        """
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+        counters = (('requests_total', 'count', 'HTTP calls made.'),
+                    ('request_errors_total', 'errors', 'HTTP calls that failed.'),
+                    ('request_bytes_total', 'bytes_out', 'Request body bytes sent.'),
+                    ('response_bytes_total', 'bytes_in', 'Response body bytes received.'))
+        for name, field, help_text in counters:
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for (method, path), s in snapshot:
+                lines.append(f'{prefix}_{name}{{{_labels(method, path)}}} {s[field]}')
+        name = f'{prefix}_request_duration_seconds'
+        lines.append(f'# HELP {name} HTTP call latency.')
+        lines.append(f'# TYPE {name} histogram')
+        for (method, path), s in snapshot:
+            labels = _labels(method, path)
+            cumulative = 0
+            for bound, n in s['latency_buckets'].items():
+                cumulative += n
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {s["latency_sum"]}')
+            lines.append(f'{name}_count{{{labels}}} {s["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(method, path):
+    return f'method="{_escape(method)}",route="{_escape(path)}"'
@@ -0,0 +1,152 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for decoding large list responses as they arrive.
+
+The CAS APIs return collections as one JSON object with the items in a
+top-level array, 'content' for the /iaas/api collections and
+'documentLinks' for /provisioning/uerp. ArrayItems picks the items of
+that array out of the body chunk by chunk, so neither the whole raw body
+nor the whole list has to be held in memory.
+"""
+
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+_START, _KEY, _COLON, _VALUE, _ITEMS, _END = range(6)
+
+
+class ArrayItems(object):
+    """
+    An incremental decoder for the items of one top-level array.
+
+    Feed it the body in chunks of bytes, and each call returns the items
+    completed so far. Values of other keys are kept in values, so
+    feeding the rest of the body after the array is done picks up
+    properties such as totalElements that follow it.
+    """
+    def __init__(self, key='content'):
+        """
+        :param key: The top-level key holding the array, defaults to
+        'content'.
+        """
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._text = ''
+        self._state = _START
+        self._current = None
+        self._array_done = False
+        self.values = {}
+
+    @property
+    def done(self):
+        """
+        Whether the array, or the whole object, has been decoded.
+        """
+        return self._array_done or self._state == _END
+
+    def _value(self, text, pos, final):
+        """
+        Decodes the value at pos, or returns None if it is incomplete. A
+        value that ends exactly at the end of the text may be a number cut
+        in half, so it counts as incomplete until more text arrives.
+        """
+        try:
+            value, end = self._decoder.raw_decode(text, pos)
+        except ValueError:
+            if final:
+                raise
+            return None
+        if end == len(text) and not final:
+            return None
+        return value, end
+
+    def feed(self, chunk, final=False):
+        """
+        Adds a chunk of the body and returns the items it completed.
+        :param chunk: The next bytes of the body.
+        :param final: Whether this is the last chunk.
+        :return: A list of decoded items.
+        """
+        items = []
+        if self._state == _END:
+            return items
+        text = self._text + self._utf8.decode(chunk, final=final)
+        pos = 0
+        length = len(text)
+        while self._state != _END:
+            while pos < length and text[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= length:
+                break
+            c = text[pos]
+            if self._state == _START:
+                if c != '{':
+                    raise ValueError(f'Expected a JSON object, found {c!r}.')
+                pos += 1
+                self._state = _KEY
+            elif self._state == _KEY:
+                if c == '}':
+                    self._state = _END
+                elif c == ',':
+                    pos += 1
+                else:
+                    decoded = self._value(text, pos, final)
+                    if decoded is None:
+                        break
+                    self._current, pos = decoded
+                    self._state = _COLON
+            elif self._state == _COLON:
+                if c != ':':
+                    raise ValueError(f'Expected \':\', found {c!r}.')
+                pos += 1
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if self._current == self.key and c == '[':
+                    pos += 1
+                    self._state = _ITEMS
+                else:
+                    decoded = self._value(text, pos, final)
+                    if decoded is None:
+                        break
+                    value, pos = decoded
+                    if self._current == self.key:
+                        self._array_done = True
+                    else:
+                        self.values[self._current] = value
+                    self._state = _KEY
+            elif self._state == _ITEMS:
+                if c == ']':
+                    pos += 1
+                    self._array_done = True
+                    self._state = _KEY
+                elif c == ',':
+                    pos += 1
+                else:
+                    decoded = self._value(text, pos, final)
+                    if decoded is None:
+                        break
+                    item, pos = decoded
+                    items.append(item)
+        self._text = text[pos:] if self._state != _END else ''
+        if final and not self.done:
+            raise ValueError('The response body ended unexpectedly.')
+        return items
+
+
+def iter_items(chunks, key='content'):
+    """
+    Yields the items of the top-level array key from an iterable of
+    byte chunks.
+    """
+    items = ArrayItems(key)
+    for chunk in chunks:
+        yield from items.feed(chunk)
+        if items.done:
+            return
+    yield from items.feed(b'', final=True)
@@ -0,0 +1,104 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for sharing access tokens between processes through a file.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class TokenCache(object):
+    """
+    A file of access tokens keyed by a hash of their refresh token.
+
+    Sessions logging in with the same refresh token reuse a cached access
+    token while it remains valid, so many short-lived worker processes make
+    a single call to /auth/api-tokens/authorize between them. Reads and
+    writes happen under an exclusive file lock, and the file is only
+    readable by its owner.
+    """
+    def __init__(self, path=None):
+        """
+        :param path: The cache file, defaults to ~/.caspyr/tokens.json.
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser('~'), '.caspyr', 'tokens.json')
+        self.path = path
+
+    @staticmethod
+    def _key(refresh_token):
+        return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+    @contextlib.contextmanager
+    def lock(self):
+        """
+        Holds an exclusive lock on the cache across processes.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(f'{self.path}.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, refresh_token, min_ttl=0):
+        """
+        Returns the cached (access_token, expires_at) for refresh_token,
+        or None if there is none valid for at least min_ttl seconds.
+        Call while holding lock().
+        """
+        entry = self._read().get(self._key(refresh_token))
+        if entry is None or entry['expires_at'] - min_ttl <= time.time():
+            return None
+        return entry['access_token'], entry['expires_at']
+
+    def put(self, refresh_token, access_token, expires_at):
+        """
+        Stores an access token for refresh_token and drops expired ones.
+        Call while holding lock().
+        """
+        now = time.time()
+        tokens = {k: v for k, v in self._read().items()
+                  if v['expires_at'] > now}
+        tokens[self._key(refresh_token)] = {'access_token': access_token,
+                                            'expires_at': expires_at}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(tokens, f)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
@@ -0,0 +1,92 @@
+# Cloud Automation Services SDK for Python
+# Copyright (c) 2019 VMware, Inc. All Rights Reserved.
+
+# SPDX-License-Identifier: Apache-2.0
+
+"""Module for tracing requests with an OpenTelemetry compatible tracer.
+
+A session given a tracer opens a span for each HTTP call, named after its
+method and route, eg. GET /iaas/api/projects/{id}. Helpers that make
+several calls, such as Machine.get_ip, open a parent span named
+after themselves, so the calls they fan out into nest under it.
+
+Any object with an OpenTelemetry style start_as_current_span(name,
+attributes=...) works as the tracer, so opentelemetry is not a dependency.
+
+Example:
+from opentelemetry import trace
+session = Session.login(refresh_token, tracer=trace.get_tracer('caspyr'))
+"""
+
+import functools
+import inspect
+
+
+class _NoSpan(object):
+    """
+    The span used when there is no tracer. contextlib.nullcontext would do,
+    but it needs Python 3.7.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(tracer, name, attributes=None):
+    """
+    Returns a context manager for a span on tracer, or one that does
+    nothing when tracer is None.
+    """
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def _tracer(args, kwargs):
+    """
+    Returns the tracer of the session a resource method is called with.
+    """
+    # Skip the class of a classmethod. The session may be passed by
+    # keyword, as in Machine.get_ip(session=s, machine_id=id).
+    positional = args[1:] if args and isinstance(args[0], type) else args
+    session = positional[0] if positional else kwargs.get('session')
+    return getattr(session, 'tracer', None)
+
+
+def traced(fn=None, name=None):
+    """
+    Runs a resource method inside a span named after it, on the tracer of
+    the session it is called with. The span of a generator stays open
+    while it is consumed, so it covers the calls made along the way.
+    :param name: The span name, defaults to the method's qualified name.
+    Use as @traced(name='Request.list_incomplete') to name the span of a
+    private helper after the public method it does the work of.
+    """
+    if fn is None:
+        return functools.partial(traced, name=name)
+    if name is None:
+        name = fn.__qualname__
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator(*args, **kwargs):
+            with span(_tracer(args, kwargs), name):
+                yield from fn(*args, **kwargs)
+        return generator
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer(args, kwargs)
+        if tracer is None:
+            return fn(*args, **kwargs)
+        with tracer.start_as_current_span(name):
+            return fn(*args, **kwargs)
+    return wrapper
@@ -26,26 +26,26 @@ class User(object):
 
     @classmethod
     def describe(cls, session, id):
-        baseurl = 'https://console.cloud.vmware.com'
+        baseurl = session.csp_url
         uri = f'/csp/gateway/am/api/orgs/{id}/'
         return cls(session._request(f'{baseurl}{uri}'))
 
     @staticmethod
     def list(session, id):
-        baseurl = 'https://console.cloud.vmware.com'
+        baseurl = session.csp_url
         uri = f'/csp/gateway/portal/api/v2/orgs/{id}/users'
         return session._request(f'{baseurl}{uri}')['results']
 
     @staticmethod
     def find(session, id, search):
-        baseurl = 'https://console.cloud.vmware.com'
+        baseurl = session.csp_url
         uri = (f'/csp/gateway/portal/api/orgs/{id}/users/search?'
                f'userSearchTerm={search}')
         return session._request(f'{baseurl}{uri}')['results']
 
     @staticmethod
     def remove(session, id, username):
-        baseurl = 'https://console.cloud.vmware.com'
+        baseurl = session.csp_url
         uri = f'/csp/gateway/portal/api/orgs/{id}/users/'
         payload = {
             "emails": [
@@ -67,7 +67,7 @@ class User(object):
                log_intelligence=False,
                network_insight=False
                ):
-        baseurl = 'https://console.cloud.vmware.com'
+        baseurl = session.csp_url
         uri = f'/csp/gateway/am/api/orgs/{id}/invitations'
         payload = {
             'usernames': usernames,
@@ -6,33 +6,33 @@
 
 import os
 
+from .odata import eq, select, where
+
 
 class CloudZone(object):
     """
     Classes for Cloud Zone methods.
     """
     def __init__(self, zone):
+        self.tags = zone.get('tags')
+        self.tags_to_match = zone.get('tagsToMatch')
+        self.placement_policy = zone.get('placementPolicy')
+        self.name = zone.get('name')
+        self.id = zone.get('id')
+        self.updated_at = zone.get('updatedAt')
+        self._links = zone.get('_links')
         try:
-            self.tags = zone['tags']
-        except KeyError:
-            pass
-        try:
-            self.tags_to_match = zone['tagsToMatch']
-        except KeyError:
-            pass
-        self.placement_policy = zone['placementPolicy']
-        self.name = zone['name']
-        self.id = zone['id']
-        self.updated_at = zone['updatedAt']
-        self._links = zone['_links']
-        self.region_id = os.path.split(self._links['region']['href'])[1]
+            self.region_id = os.path.split(self._links['region']['href'])[1]
+        except (KeyError, TypeError):
+            self.region_id = None
 
     @staticmethod
-    def list(session):
-        """Takes a single input of your session bearer token"""
+    def list(session, lazy=False, fields=None):
+        """Takes a single input of your session bearer token. When lazy,
+        returns an iterator that fetches a page at a time. When fields is
+        given, only those properties of each zone are returned."""
         uri = '/iaas/api/zones/'
-        j = session._request(f'{session.baseurl}{uri}')
-        return j['content']
+        return session._list(select(f'{session.baseurl}{uri}', fields), lazy)
 
     @classmethod
     def describe(cls,
@@ -47,8 +47,8 @@ class CloudZone(object):
                          session,
                          name
                          ):
-        uri = f'/iaas/api/zones?$filter=(name eq \'{name}\')'
-        return cls(session._request(f'{session.baseurl}{uri}')['content'][0])
+        url = where(f'{session.baseurl}/iaas/api/zones', eq('name', name))
+        return cls(session._request(url)['content'][0])
 
     @classmethod
     def create(cls,
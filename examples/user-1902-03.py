@@ -80,10 +80,11 @@ def remove_user(session, org_id, username):
                 )
 
 def cancel_active_requests(session):
-    while len(Request.list_incomplete(session)) > 0:
-        for i in Request.list_incomplete(session):
-            Request.cancel(session, i['id'])
-            time.sleep(10)
+    active = Request.list_incomplete(session)
+    while active:
+        session.map(Request.cancel, [i['id'] for i in active])
+        time.sleep(10)
+        active = Request.list_incomplete(session)
     return
 
 def delete_deployments(session):
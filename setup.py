@@ -32,7 +32,11 @@ setup(
     description='A python project for VMware Cloud Automation Services.',
     long_description=long_description,
     packages=['caspyr'],
-    install_requires=['requests'],
+    install_requires=['requests', 'contextvars;python_version<"3.7"'],
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+    },
 
     classifiers=[
         'Intended Audience :: Developers',
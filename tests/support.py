@@ -0,0 +1,67 @@
+"""Helpers shared by the offline test modules."""
+
+import asyncio
+import unittest
+
+import requests
+
+
+def response(status, body=b'{}', headers=None):
+    """
+    Returns a requests.Response with status, body and headers, as a stubbed
+    transport would.
+    """
+    r = requests.Response()
+    r.status_code = status
+    r._content = body
+    r.headers.update(headers or {})
+    return r
+
+
+def request_document(id, status):
+    """
+    Returns a blueprint request document with id and status.
+    """
+    return {'id': id, 'status': status, 'deploymentName': f'd-{id}',
+            'reason': '', 'plan': False, 'destroy': False, 'inputs': {},
+            'projectId': 'p', 'projectName': 'p', 'type': 'blueprint-request',
+            'selfLink': f'/blueprint/api/blueprint-requests/{id}',
+            'createdAt': '', 'createdBy': '', 'updatedAt': '', 'updatedBy': ''}
+
+
+def run(coroutine):
+    """
+    Runs coroutine on a new event loop, like asyncio.run on Python 3.7+.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class FakeCASTestCase(unittest.TestCase):
+    """
+    Serves a FakeCAS, built with fake_options, as self.server during each
+    test. It accepts the access token 'token' without logging in.
+    """
+    fake_options = {}
+
+    def setUp(self):
+        from caspyr.fakeserver import FakeCAS
+        self.server = FakeCAS(tokens=('token',), **self.fake_options).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _session(self):
+        from caspyr import Session
+        return Session('token', baseurl=self.server.url)
+
+    def _login(self, **kwargs):
+        from caspyr import Session
+        return Session.login('refresh',
+                             baseurl=self.server.url,
+                             csp_url=self.server.url,
+                             auto_refresh=False,
+                             **kwargs)
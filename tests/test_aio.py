@@ -0,0 +1,262 @@
+import importlib.util
+import unittest
+
+from tests.support import FakeCASTestCase, request_document, run
+
+
+def _session(respond):
+    '''
+    Returns an AsyncSession whose _request is answered by respond(method,
+    url, payload), and the list of requests made. The aiohttp check in
+    __init__ is skipped, so no connection pool is ever created.
+    '''
+    from caspyr.aio import AsyncSession
+    session = AsyncSession.__new__(AsyncSession)
+    session.baseurl = 'https://api.example.com'
+    session.csp_url = 'https://console.example.com'
+    session.headers = {}
+    session.token = 'token'
+    calls = []
+
+    async def request(url, request_method='GET', payload=None, **kwargs):
+        calls.append((request_method, url))
+        return respond(request_method, url, payload)
+
+    session._request = request
+    return session, calls
+
+
+class Async_planning_tests(unittest.TestCase):
+    '''
+    This set of tests checks that the asyncio classes reuse the URI and
+    payload construction of the synchronous classes.
+    '''
+
+    def test_01_plan_captures_create_request(self):
+        '''
+        Story: An awaitable create is planned from the synchronous method.
+        The captured request carries the same URL, method and payload.
+        '''
+        from caspyr import Session, CloudAccountAws
+        from caspyr.aio import _plan
+        session = Session('token')
+        p = _plan(CloudAccountAws.create,
+                  session,
+                  name='aws',
+                  access_key='key',
+                  secret_key='secret'
+                  )
+        self.assertEqual(p.url,
+                         f'{session.baseurl}/iaas/cloud-accounts-aws'
+                         )
+        self.assertEqual(p.request_method, 'POST')
+        self.assertEqual(p.payload['accessKeyId'], 'key')
+        with self.assertRaises(TypeError):
+            _plan(lambda session: None, session)
+        session.close()
+
+    def test_02_async_classes_mirror_sync_classes(self):
+        '''
+        Story: The awaitable classes build the same model classes.
+        '''
+        from caspyr import aio, CloudAccountAzure, NetworkProfile
+        self.assertIs(aio.CloudAccountAzure._sync(), CloudAccountAzure)
+        self.assertIs(aio.NetworkProfile._sync(), NetworkProfile)
+        self.assertTrue(issubclass(aio.NetworkProfile, NetworkProfile))
+        for name in ('StorageProfile', 'StorageProfileAWS',
+                     'StorageProfileAzure', 'StorageProfilevSphere',
+                     'ImageMapping', 'FlavorMapping', 'NetworkProfile'):
+            cls = getattr(aio, name)
+            for method in ('list', 'describe', 'create', 'delete'):
+                self.assertEqual(hasattr(cls, method),
+                                 hasattr(cls._sync(), method),
+                                 f'{name}.{method}')
+
+    def test_03_perform_describe_and_delete(self):
+        '''
+        Story: User describes a machine and deletes a project and a
+        blueprint through the awaitable classes. Each makes the request of
+        its synchronous method, with the session passed once.
+        '''
+        from caspyr import aio
+        session, calls = _session(lambda method, url, payload:
+                                  204 if method == 'DELETE' else {'id': 'm-1'})
+        machine = run(aio.Machine.describe(session, 'm-1'))
+        run(aio.Project.delete(session, 'p-1'))
+        run(aio.Blueprint.delete(session, 'b-1'))
+        self.assertEqual(machine, {'id': 'm-1'})
+        self.assertEqual(calls,
+                         [('GET', f'{session.baseurl}/iaas/api/machines/m-1'),
+                          ('DELETE', f'{session.baseurl}/iaas/api/projects/p-1'),
+                          ('DELETE', f'{session.baseurl}/blueprint/api/blueprints/b-1')])
+
+    def test_04_perform_create_with_keywords(self):
+        '''
+        Story: An awaitable create passes keyword arguments through to the
+        planned request.
+        '''
+        from caspyr import aio
+        session, calls = _session(lambda method, url, payload: dict(
+            payload, id='z-1', updatedAt='', _links={'region': {'href': '/r-1'}}))
+        zone = run(aio.CloudZone.create(session, name='zone', region_id='r-1'))
+        self.assertEqual((zone.id, zone.name, zone.region_id), ('z-1', 'zone', 'r-1'))
+        self.assertEqual(calls, [('POST', f'{session.baseurl}/iaas/api/zones/')])
+
+
+    def test_05_lists_follow_every_page(self):
+        '''
+        Story: User lists 450 machines and 250 deployments through the
+        awaitable classes. Every page is fetched, with $top and $skip for
+        /iaas/api and page and size for the deployment API.
+        '''
+        from urllib.parse import parse_qs, urlsplit
+        from caspyr import aio
+
+        def respond(method, url, payload):
+            query = parse_qs(urlsplit(url).query)
+            if 'page' in query:
+                skip = int(query['page'][0]) * int(query['size'][0])
+                total = 250
+            else:
+                skip = int(query['$skip'][0])
+                total = 450
+            ids = list(range(skip, min(skip + 200, total)))
+            return {'content': [{'id': i} for i in ids],
+                    'totalElements': total}
+
+        session, calls = _session(respond)
+        machines = run(aio.Machine.list(session))
+        deployments = run(aio.Deployment.list(session))
+        self.assertEqual([m['id'] for m in machines], list(range(450)))
+        self.assertEqual([d['id'] for d in deployments], list(range(250)))
+        self.assertEqual(len(calls), 5)
+        self.assertIn('page=1&size=200', calls[-1][1])
+
+    def test_06_failed_page_raises(self):
+        '''
+        Story: The second page of an awaitable list fails. HTTPError is
+        raised instead of returning the first page alone.
+        '''
+        import requests
+        from caspyr import aio
+        session, calls = _session(lambda method, url, payload:
+                                  None if '$skip=200' in url else
+                                  {'content': [{}] * 200, 'totalElements': 450})
+        with self.assertRaises(requests.exceptions.HTTPError):
+            run(aio.Project.list(session))
+
+
+    def test_07_list_incomplete_describes_links(self):
+        '''
+        Story: The blueprint request API answers with links only. The
+        awaitable list_incomplete describes each request and keeps the
+        started ones.
+        '''
+        from caspyr import aio
+
+        def respond(method, url, payload):
+            if '$filter' in url:
+                return {'links': [f'/blueprint/api/blueprint-requests/r-{i}'
+                                  for i in range(6)]}
+            id = url.rsplit('/', 1)[1]
+            return request_document(id, 'STARTED' if id in ('r-1', 'r-4')
+                                     else 'FINISHED')
+
+        session, calls = _session(respond)
+        incomplete = run(aio.Request.list_incomplete(session, max_workers=3))
+        self.assertEqual(incomplete, [{'id': 'r-1'}, {'id': 'r-4'}])
+        self.assertEqual(len(calls), 7)
+
+    def test_08_list_incomplete_reads_documents(self):
+        '''
+        Story: The API filters on status and answers with documents over
+        two pages. Each page is read once and nothing is described.
+        '''
+        from urllib.parse import parse_qs, urlsplit
+        from caspyr import aio
+
+        def respond(method, url, payload):
+            page = int(parse_qs(urlsplit(url).query).get('page', ['0'])[0])
+            ids = range(page * 200, min(page * 200 + 200, 300))
+            return {'content': [{'id': i, 'status': 'STARTED'} for i in ids],
+                    'totalElements': 300}
+
+        session, calls = _session(respond)
+        incomplete = run(aio.Request.list_incomplete(session))
+        self.assertEqual([r['id'] for r in incomplete], list(range(300)))
+        self.assertEqual(len(calls), 2)
+
+    def test_09_lists_follow_capped_pages(self):
+        '''
+        Story: The server serves at most 100 items a page. The awaitable
+        lists follow totalElements past the short pages, and ask for
+        deployment pages by the size actually served.
+        '''
+        from urllib.parse import parse_qs, urlsplit
+        from caspyr import aio
+
+        def respond(method, url, payload):
+            query = parse_qs(urlsplit(url).query)
+            if 'page' in query:
+                size = min(int(query['size'][0]), 100)
+                skip = int(query['page'][0]) * size
+                total = 250
+            else:
+                skip = int(query['$skip'][0])
+                total = 450
+            ids = range(skip, min(skip + 100, total))
+            return {'content': [{'id': i} for i in ids],
+                    'totalElements': total}
+
+        session, calls = _session(respond)
+        machines = run(aio.Machine.list(session))
+        deployments = run(aio.Deployment.list(session))
+        self.assertEqual([m['id'] for m in machines], list(range(450)))
+        self.assertEqual([d['id'] for d in deployments], list(range(250)))
+        self.assertIn('page=2&size=100', calls[-1][1])
+
+
+
+@unittest.skipIf(importlib.util.find_spec('aiohttp') is None,
+                 'aiohttp is not installed')
+class Async_transport_tests(FakeCASTestCase):
+    '''
+    This set of tests runs the asyncio classes over aiohttp against the
+    local fake CAS API.
+    '''
+    fake_options = {'machines': 250}
+
+    def test_01_login_list_describe_and_delete(self):
+        '''
+        Story: User logs in with an AsyncSession, lists 250 machines over
+        two pages, describes and deletes a project, and finds it gone.
+        '''
+        from caspyr import aio
+        project = self.server.add('/iaas/api/projects',
+                                  {'name': 'dev',
+                                   'organizationId': 'o',
+                                   '_links': {}})
+
+        async def flow():
+            async with await aio.AsyncSession.login(
+                    'refresh',
+                    baseurl=self.server.url,
+                    csp_url=self.server.url) as session:
+                machines = await aio.Machine.list(session)
+                described = await aio.Project.describe(session, project['id'])
+                deleted = await aio.Project.delete(session, project['id'])
+                missing = await session._request(
+                    f'{session.baseurl}/iaas/api/projects/{project["id"]}')
+                return machines, described, deleted, missing
+
+        machines, described, deleted, missing = run(flow())
+        self.assertEqual([m['id'] for m in machines],
+                         [f'machine-{i}' for i in range(250)])
+        self.assertEqual(described.name, 'dev')
+        self.assertEqual(deleted, 204)
+        self.assertIsNone(missing)
+        self.assertEqual(self.server.hits[('GET', '/iaas/api/machines')], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
@@ -0,0 +1,127 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from tests.support import response
+
+
+class Breaker_tests(unittest.TestCase):
+    '''
+    This set of tests checks the circuit breaker per endpoint family.
+    '''
+
+    def test_01_opens_after_threshold(self):
+        '''
+        Story: /iaas/api fails three times in a row with a breaker
+        threshold of 3. The next call fails fast without a request, while
+        /blueprint/api is still reachable.
+        '''
+        from caspyr import CircuitBreaker, CircuitOpen, RetryPolicy, Session
+        session = Session('token',
+                          retry=RetryPolicy(total=0),
+                          breaker=CircuitBreaker(failure_threshold=3))
+        zones = f'{session.baseurl}/iaas/api/zones'
+        with mock.patch.object(session._http, 'request',
+                               return_value=response(503)) as request:
+            for _ in range(3):
+                session._request(zones)
+            with self.assertRaises(CircuitOpen):
+                session._request(zones)
+            self.assertEqual(request.call_count, 3)
+            self.assertEqual(session.breaker.state(zones), 'open')
+            request.return_value = response(200)
+            session._request(f'{session.baseurl}/blueprint/api/blueprints')
+        self.assertEqual(request.call_count, 4)
+
+    def test_02_connection_errors_count(self):
+        '''
+        Story: Connections to /pipeline/api keep failing. After the
+        threshold the breaker raises CircuitOpen, which callers can catch
+        as a ConnectionError.
+        '''
+        from caspyr import CircuitBreaker, RetryPolicy, Session
+        session = Session('token',
+                          retry=RetryPolicy(total=0),
+                          breaker=CircuitBreaker(failure_threshold=2))
+        url = f'{session.baseurl}/pipeline/api/pipelines'
+        with mock.patch.object(session._http, 'request',
+                               side_effect=requests.exceptions.ConnectionError) as request:
+            for _ in range(3):
+                with self.assertRaises(requests.exceptions.ConnectionError):
+                    session._request(url)
+        self.assertEqual(request.call_count, 2)
+
+    def test_03_half_open_probe(self):
+        '''
+        Story: After the reset timeout one probe is let through. While it
+        is in flight other calls fail fast, a failed probe reopens the
+        circuit and a successful one closes it.
+        '''
+        from caspyr import CircuitBreaker, CircuitOpen
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        url = 'https://api.mgmt.cloud.vmware.com/deployment/api/deployments'
+        with mock.patch('caspyr.breaker.time.monotonic', return_value=0):
+            breaker.record(breaker.allow(url), False)
+            self.assertRaises(CircuitOpen, breaker.allow, url)
+        with mock.patch('caspyr.breaker.time.monotonic', return_value=10):
+            family = breaker.allow(url)
+            self.assertEqual(breaker.state(url), 'half-open')
+            self.assertRaises(CircuitOpen, breaker.allow, url)
+            breaker.record(family, False)
+            self.assertRaises(CircuitOpen, breaker.allow, url)
+        with mock.patch('caspyr.breaker.time.monotonic', return_value=20):
+            breaker.record(breaker.allow(url), True)
+            self.assertEqual(breaker.state(url), 'closed')
+            breaker.allow(url)
+
+    def test_04_families(self):
+        '''
+        Story: URLs are grouped by host and API prefix, and unknown paths
+        by their first segment.
+        '''
+        from caspyr import CircuitBreaker
+        breaker = CircuitBreaker()
+        host = 'api.mgmt.cloud.vmware.com'
+        self.assertEqual(breaker.family(f'https://{host}/iaas/api/machines?$top=1'),
+                         (host, '/iaas/api'))
+        self.assertEqual(breaker.family(f'https://{host}/iaas/cloud-accounts-aws'),
+                         (host, '/iaas'))
+        self.assertEqual(breaker.family('https://console.cloud.vmware.com/csp/gateway/am/api/orgs'),
+                         ('console.cloud.vmware.com', '/csp'))
+
+    def test_05_probe_ends_on_any_exception(self):
+        '''
+        Story: The half-open probe to /iaas/api dies with a
+        ChunkedEncodingError, and the next with an exception from the
+        on_request hook. Each counts as a failed probe, so after the
+        reset timeout another probe is let through and closes the circuit.
+        '''
+        from caspyr import CircuitBreaker, CircuitOpen, RetryPolicy, Session
+        session = Session('token',
+                          retry=RetryPolicy(total=0),
+                          breaker=CircuitBreaker(failure_threshold=1,
+                                                 reset_timeout=10))
+        zones = f'{session.baseurl}/iaas/api/zones'
+        clock = 'caspyr.breaker.time.monotonic'
+        with mock.patch.object(session._http, 'request',
+                               return_value=response(503)) as request:
+            with mock.patch(clock, return_value=0):
+                session._request(zones)
+            request.side_effect = requests.exceptions.ChunkedEncodingError
+            with mock.patch(clock, return_value=10):
+                with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                    session._request(zones)
+                self.assertEqual(session.breaker.state(zones), 'open')
+                self.assertRaises(CircuitOpen, session._request, zones)
+            request.side_effect = None
+            request.return_value = response(200)
+            session.on_request = mock.Mock(side_effect=ValueError)
+            with mock.patch(clock, return_value=20):
+                self.assertRaises(ValueError, session._request, zones)
+                self.assertEqual(session.breaker.state(zones), 'open')
+            session.on_request = None
+            with mock.patch(clock, return_value=30):
+                session._request(zones)
+        self.assertEqual(session.breaker.state(zones), 'closed')
+        self.assertEqual(request.call_count, 3)
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from tests.support import run
+
+
+class Bulk_tests(unittest.TestCase):
+    '''
+    This set of tests checks fanning a resource method out over items.
+    '''
+
+    def test_01_order_errors_and_progress(self):
+        '''
+        Story: User deletes five deployments, one of which fails. Every
+        item gets an outcome in input order and progress is reported for
+        each.
+        '''
+        from caspyr import Session
+        session = Session('token')
+        reported = []
+
+        def delete(s, id):
+            self.assertIs(s, session)
+            time.sleep(0.01 * (5 - id))
+            if id == 2:
+                raise ValueError('in use')
+            return id * 10
+
+        outcomes = session.map(delete, range(5), max_workers=5,
+                               progress=lambda done, total, o: reported.append((done, total)))
+        self.assertEqual([o.item for o in outcomes], [0, 1, 2, 3, 4])
+        self.assertEqual([o.result for o in outcomes], [0, 10, None, 30, 40])
+        self.assertIsInstance(outcomes[2].error, ValueError)
+        self.assertEqual([o.ok for o in outcomes], [True, True, False, True, True])
+        self.assertEqual(reported, [(n, 5) for n in range(1, 6)])
+
+    def test_02_parallelism_is_bounded(self):
+        '''
+        Story: User maps over twenty items with max_workers=3. No more
+        than three calls run at once.
+        '''
+        from caspyr import Session
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def call(s, item):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+        Session('token').map(call, range(20), max_workers=3)
+        self.assertEqual(peak[0], 3)
+
+    def test_03_deadline_reaches_workers(self):
+        '''
+        Story: A map runs inside a deadline. The worker threads see the
+        same deadline.
+        '''
+        from caspyr import Session
+        from caspyr.deadline import remaining
+        session = Session('token')
+        with session.deadline(5):
+            outcomes = session.map(lambda s, i: remaining(), range(3))
+        self.assertTrue(all(0 < o.result <= 5 for o in outcomes))
+
+    def test_04_async_map(self):
+        '''
+        Story: The asyncio variant bounds concurrency and keeps order.
+        '''
+        from caspyr.bulk import map_async
+        active, peak = [0], [0]
+
+        async def call(s, item):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01 * (3 - item % 3))
+            active[0] -= 1
+            if item == 4:
+                raise KeyError(item)
+            return item
+
+        outcomes = run(map_async(call, None, range(9), max_workers=2))
+        self.assertEqual([o.item for o in outcomes], list(range(9)))
+        self.assertIsInstance(outcomes[4].error, KeyError)
+        self.assertEqual(peak[0], 2)
+
+    def test_05_imap_yields_in_completion_order(self):
+        '''
+        Story: User acts on each result as soon as it is ready, then stops
+        after the first two. Calls not yet started are never made.
+        '''
+        from caspyr import Session
+        started = []
+
+        def call(s, item):
+            started.append(item)
+            time.sleep(0.02 * (2 - item % 3))
+            return item
+
+        outcomes = Session('token').imap(call, range(30), max_workers=3)
+        first = [next(outcomes).result, next(outcomes).result]
+        outcomes.close()
+        time.sleep(0.1)
+        self.assertEqual(first, [2, 1])
+        self.assertLess(len(started), 10)
@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from tests.support import response
+
+
+class ResponseCache_tests(unittest.TestCase):
+    '''
+    This set of tests checks the TTL/LRU response cache.
+    '''
+
+    def test_01_lru_bound_and_ttl(self):
+        '''
+        Story: The cache holds at most maxsize entries and honours the
+        longest matching per-resource ttl.
+        '''
+        from caspyr import ResponseCache
+        cache = ResponseCache(maxsize=2, ttl=30,
+                              ttls={'/iaas/api': 10, '/iaas/api/machines': 0})
+        base = 'https://api.mgmt.cloud.vmware.com'
+        self.assertEqual(cache.ttl_for('/iaas/api/zones'), 10)
+        self.assertEqual(cache.ttl_for('/iaas/api/machines/1'), 0)
+        self.assertEqual(cache.ttl_for('/blueprint/api/blueprints'), 30)
+        cache.set('t', f'{base}/iaas/api/machines', {'content': []})
+        self.assertIsNone(cache.get('t', f'{base}/iaas/api/machines'))
+        for uri in ('/iaas/api/zones', '/iaas/api/regions', '/iaas/api/projects'):
+            cache.set('t', f'{base}{uri}', {'content': []})
+        self.assertIsNone(cache.get('t', f'{base}/iaas/api/zones'))
+        self.assertIsNotNone(cache.get('t', f'{base}/iaas/api/projects'))
+        self.assertIsNone(cache.get('other', f'{base}/iaas/api/projects'))
+
+    def test_02_writes_invalidate_the_collection(self):
+        '''
+        Story: Deleting a deployment drops the cached deployment list but
+        keeps unrelated collections.
+        '''
+        from caspyr import ResponseCache
+        cache = ResponseCache()
+        base = 'https://api.mgmt.cloud.vmware.com'
+        cache.set('t', f'{base}/deployment/api/deployments', {'content': [1]})
+        cache.set('t', f'{base}/blueprint/api/blueprints/', {'content': [2]})
+        cache.invalidate(f'{base}/deployment/api/deployments/1?forceDelete=true')
+        self.assertIsNone(cache.get('t', f'{base}/deployment/api/deployments'))
+        self.assertIsNotNone(cache.get('t', f'{base}/blueprint/api/blueprints/'))
+
+
+class Session_cache_tests(unittest.TestCase):
+    '''
+    This set of tests checks that Session serves repeated GETs from cache.
+    '''
+
+    def test_01_repeated_list_is_served_from_cache(self):
+        '''
+        Story: Deployment.list is called twice, a deployment is deleted,
+        then Deployment.list is called again. Only the first and the last
+        list reach the API.
+        '''
+        from caspyr import Deployment, ResponseCache, Session
+        session = Session('token', cache=ResponseCache())
+        responses = [response(200, b'{"content": [{"id": "1"}]}'),
+                     response(200),
+                     response(200, b'{"content": []}')]
+        with mock.patch.object(session._http, 'request',
+                               side_effect=responses) as request:
+            self.assertEqual(len(Deployment.list(session)), 1)
+            self.assertEqual(len(Deployment.list(session)), 1)
+            Deployment.delete(session, '1')
+            self.assertEqual(len(Deployment.list(session)), 0)
+        self.assertEqual(request.call_count, 3)
+
+    def test_02_stale_entry_is_revalidated_with_etag(self):
+        '''
+        Story: /iaas/api/fabric-images is cached with ttl 0 and an ETag.
+        The second read sends If-None-Match, receives a 304 and returns
+        the cached parsed object without decoding a body.
+        '''
+        from caspyr import ResponseCache, Session
+        session = Session('token', cache=ResponseCache(ttl=0))
+        url = f'{session.baseurl}/iaas/api/fabric-images'
+        responses = [response(200, b'{"content": [{"id": "1"}]}',
+                               {'ETag': '"v1"'}),
+                     response(304, b'')]
+        with mock.patch.object(session._http, 'request',
+                               side_effect=responses) as request:
+            first = session._request(url)
+            second = session._request(url)
+        self.assertIs(first, second)
+        self.assertEqual(request.call_args[1]['headers']['If-None-Match'],
+                         '"v1"')
+        self.assertEqual(session.cache.revalidated, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from tests.support import response
+
+
+class Cassette_tests(unittest.TestCase):
+    '''
+    This set of tests checks recording and replaying HTTP exchanges.
+    '''
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        os.unlink(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def test_01_record_scrubs_and_replays(self):
+        '''
+        Story: User records a login and a deployment lookup. The cassette
+        holds no credentials, and replaying it offline returns the same
+        responses.
+        '''
+        from caspyr import Cassette, Deployment, Session
+        from caspyr.cassette import RecordingAdapter
+        cassette = Cassette(self.path)
+        recorder = cassette.recorder()
+        deployment = {'id': 'd1', 'name': 'web', 'description': '',
+                      'templateLink': '', 'iconLink': '', 'createdAt': '',
+                      'createdBy': '', 'updatedAt': '', 'updatedBy': '',
+                      'inputs': {}, 'resourceLinks': []}
+
+        def send(request, **kwargs):
+            if 'authorize' in request.url:
+                return response(200, b'{"access_token": "secret", '
+                                      b'"refresh_token": "refresh", '
+                                      b'"expires_in": 1799}')
+            return response(200, json.dumps(deployment).encode(),
+                             {'Content-Encoding': 'gzip'})
+
+        with mock.patch.object(recorder.adapter, 'send', side_effect=send):
+            with Session.login('refresh', transport=recorder,
+                               auto_refresh=False) as session:
+                Deployment.describe(session, 'd1')
+        self.assertIsInstance(recorder, RecordingAdapter)
+        cassette.save()
+        with open(self.path) as f:
+            saved = f.read()
+        self.assertNotIn('secret', saved)
+        self.assertNotIn('refresh_token=refresh', saved)
+        self.assertNotIn('gzip', saved)
+
+        replay = Cassette(self.path).player()
+        with Session.login('other', transport=replay,
+                           auto_refresh=False) as session:
+            self.assertEqual(session.token, '<scrubbed>')
+            self.assertEqual(Deployment.describe(session, 'd1').name, 'web')
+
+    def test_02_replay_latency_and_miss(self):
+        '''
+        Story: User replays with 20 ms of latency per request. An
+        unrecorded URL raises CassetteMiss instead of going to the network.
+        '''
+        from caspyr import Cassette, Session
+        from caspyr.cassette import CassetteMiss
+        cassette = Cassette()
+        session = Session('token', transport=cassette.player(latency=0.02))
+        url = f'{session.baseurl}/iaas/api/zones'
+        cassette.add('GET', url, body={'content': []})
+        started = time.monotonic()
+        self.assertEqual(session._request(url), {'content': []})
+        self.assertGreaterEqual(time.monotonic() - started, 0.02)
+        with self.assertRaises(CassetteMiss):
+            session._request(f'{session.baseurl}/iaas/api/projects')
+
+    def test_03_responses_replay_in_order(self):
+        '''
+        Story: A request polled until it completes replays each recorded
+        status in turn, then keeps the last one.
+        '''
+        from caspyr import Cassette, Session
+        cassette = Cassette()
+        session = Session('token', transport=cassette.player())
+        url = f'{session.baseurl}/iaas/api/request-tracker/r1'
+        cassette.add('GET', url, body={'status': 'INPROGRESS'})
+        cassette.add('GET', url, body={'status': 'FINISHED'})
+        statuses = [session._request(url)['status'] for _ in range(3)]
+        self.assertEqual(statuses, ['INPROGRESS', 'FINISHED', 'FINISHED'])
+        cassette.rewind()
+        self.assertEqual(session._request(url)['status'], 'INPROGRESS')
@@ -0,0 +1,60 @@
+import time
+import unittest
+from unittest import mock
+
+from tests.support import response
+
+
+class Deadline_tests(unittest.TestCase):
+    '''
+    This set of tests checks per-call timeouts and end-to-end deadlines.
+    '''
+
+    def test_01_session_timeout_is_sent(self):
+        '''
+        Story: User creates a session with a 5 second timeout.
+        Every request carries connect and read timeouts of 5 seconds.
+        '''
+        from caspyr import Session
+        session = Session('token', timeout=5)
+        with mock.patch.object(session._http, 'request',
+                               return_value=response(200)) as request:
+            session._request(f'{session.baseurl}/iaas/api/zones')
+        self.assertEqual(request.call_args[1]['timeout'], (5, 5))
+
+    def test_02_deadline_stops_multi_request_helper(self):
+        '''
+        Story: Machine.get_ip runs inside a deadline and its first call
+        uses up the time. The second call is never sent.
+        '''
+        from caspyr import DeadlineExceeded, Machine, Session
+        session = Session('token')
+
+        def slow(*args, **kwargs):
+            time.sleep(0.1)
+            return response(200, b'{"_links": {"network-interfaces": '
+                                  b'{"hrefs": ["/iaas/api/nic"]}}}')
+
+        with mock.patch.object(session._http, 'request',
+                               side_effect=slow) as request:
+            with self.assertRaises(DeadlineExceeded):
+                with session.deadline(0.05):
+                    Machine.get_ip(session, 'machine')
+        self.assertEqual(request.call_count, 1)
+        self.assertLessEqual(request.call_args[1]['timeout'][1], 0.05)
+
+    def test_03_nested_deadline_cannot_extend(self):
+        '''
+        Story: A 60 second deadline nested inside a 1 second one keeps
+        the 1 second limit.
+        '''
+        from caspyr.deadline import deadline, remaining
+        self.assertIsNone(remaining())
+        with deadline(1):
+            with deadline(60):
+                self.assertLessEqual(remaining(), 1)
+        self.assertIsNone(remaining())
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
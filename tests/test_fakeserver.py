@@ -0,0 +1,99 @@
+import time
+
+from tests.support import FakeCASTestCase
+
+
+class FakeServer_tests(FakeCASTestCase):
+    '''
+    This set of tests runs caspyr against the local fake CAS API.
+    '''
+    fake_options = {'machines': 1000, 'page_size': 100, 'seed': 1}
+
+    def test_01_login_and_page_machines(self):
+        '''
+        Story: User logs in against the fake and lists machines. A page
+        without $top holds the default page size, and later pages are
+        reached with $top and $skip.
+        '''
+        with self._login() as session:
+            self.assertIn(session.token, self.server.tokens)
+            j = session._request(f'{session.baseurl}/iaas/api/machines')
+            self.assertEqual(len(j['content']), 100)
+            j = session._request(f'{session.baseurl}/iaas/api/machines'
+                                 '?$top=300&$skip=900')
+        self.assertEqual(j['totalElements'], 1000)
+        self.assertEqual(j['content'][0]['id'], 'machine-900')
+        self.assertEqual(j['numberOfElements'], 100)
+
+    def test_02_crud_and_filter(self):
+        '''
+        Story: User creates a project, finds it with a $filter on its
+        name, renames it and deletes it.
+        '''
+        with self._login() as session:
+            url = f'{session.baseurl}/iaas/api/projects'
+            project = session._request(url, request_method='POST',
+                                       payload={'name': "O'Brien"})
+            j = session._request(f"{url}?$filter=name eq 'O''Brien'")
+            self.assertEqual([p['id'] for p in j['content']], [project['id']])
+            j = session._request(f'{url}/{project["id"]}',
+                                 request_method='PATCH',
+                                 payload={'name': 'renamed'})
+            self.assertEqual(j['name'], 'renamed')
+            self.assertEqual(session._request(f'{url}/{project["id"]}',
+                                              request_method='DELETE'), 204)
+            self.assertEqual(session._request(url)['totalElements'], 0)
+
+    def test_03_throttling_is_retried(self):
+        '''
+        Story: The fake answers half of all requests with 429 and
+        Retry-After 0. The session's retry policy still gets every
+        response.
+        '''
+        from caspyr import RetryPolicy
+        self.server.throttle = 0.5
+        self.server.retry_after = 0
+        with self._login(retry=RetryPolicy(total=20, backoff_factor=0)) as session:
+            for _ in range(10):
+                self.assertEqual(len(session._request(
+                    f'{session.baseurl}/deployment/api/deployments?page=0&size=5')['content']), 0)
+        throttled = sum(n for (method, path), n in self.server.hits.items()
+                        if path == '/deployment/api/deployments')
+        self.assertGreater(throttled, 10)
+
+    def test_04_csp_routes_and_latency(self):
+        '''
+        Story: User looks up an org and invites a user through the fake
+        CSP routes, with a fixed 20 ms latency on each response.
+        '''
+        from caspyr import User
+        self.server.latency = 0.02
+        with self._login() as session:
+            started = time.monotonic()
+            self.assertEqual(User.describe(session, 'org-1').id, 'org-1')
+            self.assertGreaterEqual(time.monotonic() - started, 0.02)
+            User.invite(session, 'org-1', ['a@example.com'])
+            self.assertEqual(User.find(session, 'org-1', 'a@'),
+                             [{'username': 'a@example.com'}])
+
+    def test_05_requires_token(self):
+        '''
+        Story: A session with an unknown token is refused with 401.
+        '''
+        from caspyr import Session
+        session = Session('unknown', baseurl=self.server.url)
+        self.assertIsNone(session._request(f'{session.baseurl}/iaas/api/zones'))
+
+    def test_06_missing_item_and_dotted_filter(self):
+        '''
+        Story: A GET of a machine id that does not exist is answered
+        with 404, not an empty page, and machines are found with a
+        $filter on tags.item.value.
+        '''
+        with self._login() as session:
+            url = f'{session.baseurl}/iaas/api/machines'
+            self.assertEqual(session._send('GET', f'{url}/machine-1').status_code, 200)
+            self.assertEqual(session._send('GET', f'{url}/missing').status_code, 404)
+            j = session._request(f"{url}?$filter=tags.item.value eq 'prod'&$top=1000")
+        self.assertEqual(j['totalElements'], 500)
+        self.assertEqual(j['content'][0]['id'], 'machine-1')
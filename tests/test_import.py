@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import unittest
+
+
+def _run(code):
+    return subprocess.run([sys.executable, '-c', code],
+                          stdout=subprocess.PIPE,
+                          universal_newlines=True,
+                          check=True).stdout.strip()
+
+
+class Import_tests(unittest.TestCase):
+    '''
+    This set of tests checks that importing caspyr is lazy and leaves the
+    host application's logging alone.
+    '''
+
+    @unittest.skipIf(sys.version_info < (3, 7),
+                     'module __getattr__ needs Python 3.7')
+    def test_01_import_does_not_load_requests(self):
+        '''
+        Story: A short-lived CLI imports caspyr and a resource class.
+        Neither requests nor any other submodule is imported until used.
+        '''
+        out = _run('import sys, caspyr\n'
+                   'from caspyr import Project\n'
+                   'print("requests" in sys.modules, "caspyr.session" in sys.modules)')
+        self.assertEqual(out, 'False False')
+
+    def test_02_public_names_are_unchanged(self):
+        '''
+        Story: Every public name resolves to the class of its submodule,
+        and submodules are still reachable as attributes.
+        '''
+        import caspyr
+        from caspyr.fabric import Image
+        from caspyr.session import Session
+        self.assertIs(caspyr.Session, Session)
+        self.assertIs(caspyr.Image, Image)
+        self.assertIs(caspyr.fabric.Image, Image)
+        for name in caspyr.__all__:
+            self.assertTrue(hasattr(caspyr, name), name)
+        with self.assertRaises(AttributeError):
+            caspyr.Nope
+
+    def test_03_logging_is_not_configured(self):
+        '''
+        Story: A host application imports Session. The root logger gets
+        no handlers from caspyr.
+        '''
+        out = _run('import logging\n'
+                   'from caspyr import Session\n'
+                   'print(len(logging.getLogger().handlers))')
+        self.assertEqual(out, '0')
@@ -0,0 +1,119 @@
+from tests.support import FakeCASTestCase
+
+
+class OData_tests(FakeCASTestCase):
+    '''
+    This set of tests checks the OData query options sent to /iaas/api,
+    against the local fake CAS API.
+    '''
+    fake_options = {'machines': 250}
+
+    def test_01_select_appends_to_the_query(self):
+        '''
+        Story: A $select is added after any query the url already has.
+        '''
+        from caspyr.odata import select
+        self.assertEqual(select('https://x/iaas/api/machines', ['id', 'name']),
+                         'https://x/iaas/api/machines?$select=id,name')
+        self.assertEqual(select('https://x/iaas/api/zones?$top=1', 'id'),
+                         'https://x/iaas/api/zones?$top=1&$select=id')
+        self.assertEqual(select('https://x/iaas/api/zones', None),
+                         'https://x/iaas/api/zones')
+
+    def test_02_machine_list_with_fields(self):
+        '''
+        Story: User lists 250 machines needing only their id and name.
+        Every page returns just those properties.
+        '''
+        from caspyr import Machine
+        with self._session() as session:
+            machines = Machine.list(session, fields=('id', 'name'))
+        self.assertEqual(len(machines), 250)
+        self.assertEqual(machines[249], {'id': 'machine-249',
+                                         'name': 'Cloud_Machine_249'})
+
+    def test_03_models_tolerate_missing_properties(self):
+        '''
+        Story: User builds zones and fabric networks from documents
+        trimmed by $select. Properties left out are None.
+        '''
+        from caspyr import CloudZone, NetworkFabric
+        self.server.add('/iaas/api/zones', {'name': 'zone-a',
+                                            'placementPolicy': 'DEFAULT'})
+        self.server.add('/iaas/api/fabric-networks', {'name': 'net-a',
+                                                      'cidr': '10.0.0.0/24'})
+        with self._session() as session:
+            zone = CloudZone(CloudZone.list(session, fields=['id', 'name'])[0])
+            network = NetworkFabric(
+                NetworkFabric.list(session, fields=['name'])[0])
+        self.assertEqual(zone.name, 'zone-a')
+        self.assertIsNone(zone.placement_policy)
+        self.assertIsNone(zone.region_id)
+        self.assertEqual(network.name, 'net-a')
+        self.assertIsNone(network.cidr)
+
+    def test_04_filter_literals_are_quoted(self):
+        '''
+        Story: A name holding quotes, ampersands or hashes stays one
+        string literal in one $filter parameter.
+        '''
+        from urllib.parse import parse_qs, urlsplit
+        from caspyr.odata import eq, tag, where
+        url = where('https://x/iaas/api/projects', eq('name', "O'Neil & #1"),
+                    None)
+        query = parse_qs(urlsplit(url).query)
+        self.assertEqual(query, {'$filter': ["(name eq 'O''Neil & #1')"]})
+        self.assertEqual(tag('env', 'prod'),
+                         "(tags.item.key eq 'env') and "
+                         "(tags.item.value eq 'prod')")
+        self.assertEqual(where('https://x/iaas/api/zones', None),
+                         'https://x/iaas/api/zones')
+
+    def test_05_find_by_name_is_one_filtered_request(self):
+        '''
+        Story: User finds one of 300 projects by a name with a quote in
+        it. One filtered request is made instead of listing and
+        describing every project. A name matching none of them is looked
+        for in the two pages of the list as well.
+        '''
+        from caspyr import Project
+        for i in range(300):
+            self.server.add('/iaas/api/projects', {'name': f"team's {i}",
+                                                   'organizationId': 'o',
+                                                   '_links': {}})
+        with self._session() as session:
+            project = Project.find_by_name(session, "team's 123")
+            missing = Project.find_by_name(session, 'nope')
+        self.assertEqual(project.name, "team's 123")
+        self.assertIsNone(missing)
+        self.assertEqual(self.server.hits[('GET', '/iaas/api/projects')], 4)
+
+    def test_06_find_by_name_ignores_case(self):
+        '''
+        Story: User finds the project Dev_Team among 250 as dev_team.
+        The exact filter finds nothing, so the projects are listed and
+        compared in lower case, without describing any of them. A
+        rejected filter counts as no exact match.
+        '''
+        from unittest import mock
+        from caspyr import Project
+        for i in range(250):
+            self.server.add('/iaas/api/projects', {'name': f'Team_{i}',
+                                                   'organizationId': 'o',
+                                                   '_links': {}})
+        self.server.add('/iaas/api/projects', {'name': 'Dev_Team',
+                                               'organizationId': 'o',
+                                               '_links': {}})
+        with self._session() as session:
+            project = Project.find_by_name(session, 'dev_team')
+            self.assertEqual(sum(self.server.hits.values()), 3)
+            request = session._request
+
+            def rejected(url, **kwargs):
+                return None if '$filter' in url else request(url, **kwargs)
+
+            with mock.patch.object(session, '_request', side_effect=rejected):
+                self.assertEqual(Project.find_by_name(session, 'TEAM_7').name,
+                                 'Team_7')
+                self.assertIsNone(Project.find_by_name(session, 'dev'))
+        self.assertEqual(project.name, 'Dev_Team')
@@ -0,0 +1,150 @@
+from tests.support import FakeCASTestCase
+
+
+class Pagination_tests(FakeCASTestCase):
+    '''
+    This set of tests checks that list methods follow every page, against
+    the local fake CAS API.
+    '''
+    fake_options = {'machines': 450}
+
+    def _pages(self, path):
+        return sum(n for (method, p), n in self.server.hits.items()
+                   if p == path)
+
+    def test_01_list_returns_every_page(self):
+        '''
+        Story: User lists 450 machines. Three pages of $top=200 are
+        fetched and no machine is dropped.
+        '''
+        from caspyr import Machine
+        with self._session() as session:
+            machines = Machine.list(session)
+        self.assertEqual([m['id'] for m in machines],
+                         [f'machine-{i}' for i in range(450)])
+        self.assertEqual(self._pages('/iaas/api/machines'), 3)
+
+    def test_02_lazy_list_stops_early(self):
+        '''
+        Story: User looks for the first powered-on machine with a lazy
+        list. Only the first page is fetched.
+        '''
+        from caspyr import Machine
+        with self._session() as session:
+            machines = Machine.list(session, lazy=True)
+            self.assertEqual(self._pages('/iaas/api/machines'), 0)
+            first = next(m for m in machines if m['powerState'] == 'ON')
+        self.assertEqual(first['id'], 'machine-0')
+        self.assertEqual(self._pages('/iaas/api/machines'), 1)
+
+    def test_03_deployments_use_page_and_size(self):
+        '''
+        Story: User lists 250 deployments. The deployment API is paged
+        with page and size.
+        '''
+        from caspyr import Deployment
+        for i in range(250):
+            self.server.add('/deployment/api/deployments', {'name': f'd{i}'})
+        with self._session() as session:
+            deployments = Deployment.list(session)
+        self.assertEqual(len(deployments), 250)
+        self.assertEqual(self._pages('/deployment/api/deployments'), 2)
+
+    def test_04_paging_ignored(self):
+        '''
+        Story: A collection ignores paging and returns everything at once.
+        The iteration ends after that one page.
+        '''
+        from unittest import mock
+        session = self._session()
+        pages = [{'content': list(range(300))}]
+        with mock.patch.object(session, '_request', side_effect=pages) as request:
+            self.assertEqual(len(session._list(f'{session.baseurl}/iaas/api/regions')), 300)
+        self.assertEqual(request.call_count, 1)
+
+    def test_05_prefetch_keeps_order(self):
+        '''
+        Story: User lists 450 machines with prefetch. The pages after the
+        first are fetched concurrently and the machines still come back
+        in order.
+        '''
+        from caspyr import Machine
+        self.server.latency = 0.05
+        with self._session() as session:
+            machines = Machine.list(session, prefetch=4)
+        self.assertEqual([m['id'] for m in machines],
+                         [f'machine-{i}' for i in range(450)])
+        self.assertEqual(self._pages('/iaas/api/machines'), 3)
+
+    def test_06_prefetch_is_bounded_and_stops_early(self):
+        '''
+        Story: User reads a lazy prefetching list of many pages and stops
+        on the second page. Nothing is prefetched while the first page is
+        read, and then no more than prefetch pages are requested ahead.
+        '''
+        import time
+        from itertools import islice
+        with self._session() as session:
+            machines = session._paginate(f'{session.baseurl}/iaas/api/machines',
+                                         page_size=10, prefetch=3)
+            self.assertEqual(len(list(islice(machines, 10))), 10)
+            self.assertEqual(self._pages('/iaas/api/machines'), 1)
+            self.assertEqual(next(machines)['id'], 'machine-10')
+            machines.close()
+            time.sleep(0.1)
+        self.assertLessEqual(self._pages('/iaas/api/machines'), 4)
+
+    def test_07_failed_page_raises(self):
+        '''
+        Story: The second page of machines fails after retries. Listing
+        raises HTTPError, with or without prefetch, instead of returning
+        the first page as if it were the whole collection.
+        '''
+        import requests
+        from unittest import mock
+        from caspyr import Machine
+        with self._session() as session:
+            request = session._request
+
+            def failing(url, **kwargs):
+                return None if '$skip=200' in url else request(url, **kwargs)
+
+            with mock.patch.object(session, '_request', side_effect=failing):
+                for prefetch in (0, 4):
+                    with self.assertRaises(requests.exceptions.HTTPError):
+                        Machine.list(session, prefetch=prefetch)
+
+    def test_08_stream_follows_every_page(self):
+        '''
+        Story: User streams 450 machines. Each page is streamed in turn
+        and no machine is dropped.
+        '''
+        from caspyr import Machine
+        with self._session() as session:
+            machines = list(Machine.list(session, stream=True))
+        self.assertEqual([m['id'] for m in machines],
+                         [f'machine-{i}' for i in range(450)])
+        self.assertEqual(self._pages('/iaas/api/machines'), 3)
+
+
+    def test_09_server_caps_page_size(self):
+        '''
+        Story: The server serves at most 100 items a page, whatever is
+        asked for. Listing, prefetching and streaming 450 machines, and
+        listing 250 deployments paged with page and size, still return
+        every item by following totalElements.
+        '''
+        from caspyr import Deployment, Machine
+        self.server.max_page_size = 100
+        for i in range(250):
+            self.server.add('/deployment/api/deployments', {'name': f'd{i}'})
+        expected = [f'machine-{i}' for i in range(450)]
+        with self._session() as session:
+            for prefetch in (0, 4):
+                machines = Machine.list(session, prefetch=prefetch)
+                self.assertEqual([m['id'] for m in machines], expected)
+            machines = list(Machine.list(session, stream=True))
+            self.assertEqual([m['id'] for m in machines], expected)
+            deployments = Deployment.list(session)
+        self.assertEqual(len({d['id'] for d in deployments}), 250)
+        self.assertEqual(self._pages('/deployment/api/deployments'), 3)
@@ -0,0 +1,111 @@
+import threading
+import time
+from unittest import mock
+
+from tests.support import FakeCASTestCase
+
+
+class Pool_tests(FakeCASTestCase):
+    '''
+    This set of tests checks the multi-org session pool against the
+    local fake CAS API.
+    '''
+
+    def _pool(self, **kwargs):
+        from caspyr import SessionPool
+        return SessionPool(baseurl=self.server.url,
+                           csp_url=self.server.url,
+                           auto_refresh=False,
+                           **kwargs)
+
+    def _authorizations(self):
+        return self.server.hits[('POST',
+                                 '/csp/gateway/am/api/auth/api-tokens/authorize')]
+
+    def test_01_lazy_login_and_shared_transport(self):
+        '''
+        Story: Ten threads use the sessions of two orgs. Each org logs in
+        once, and both sessions send through one connection pool.
+        '''
+        with self._pool() as pool:
+            self.assertEqual(len(pool), 0)
+
+            def work(org):
+                with pool.session(f'refresh-{org}') as s:
+                    s._request(f'{s.baseurl}/iaas/api/projects')
+
+            threads = [threading.Thread(target=work, args=(i % 2,))
+                       for i in range(10)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            a, b = pool.get('refresh-0'), pool.get('refresh-1')
+            self.assertIsNot(a, b)
+            self.assertIs(a._http.get_adapter(a.baseurl),
+                          b._http.get_adapter(b.baseurl))
+        self.assertEqual(pool.logins, 2)
+        self.assertEqual(self._authorizations(), 2)
+
+    def test_02_per_org_limit(self):
+        '''
+        Story: With max_per_org=2, no more than two callers use one org's
+        session at a time, while another org is not held up.
+        '''
+        active = {'a': 0, 'b': 0}
+        peak = {'a': 0, 'b': 0}
+        lock = threading.Lock()
+        with self._pool(max_per_org=2) as pool:
+
+            def work(org):
+                with pool.session(org):
+                    with lock:
+                        active[org] += 1
+                        peak[org] = max(peak[org], active[org])
+                    time.sleep(0.02)
+                    with lock:
+                        active[org] -= 1
+
+            threads = [threading.Thread(target=work, args=(org,))
+                       for org in 'aaaaaabb']
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(peak, {'a': 2, 'b': 2})
+
+    def test_03_idle_sessions_are_evicted(self):
+        '''
+        Story: An org's session goes unused for longer than the idle
+        timeout. It is dropped and logged in again on next use.
+        '''
+        with self._pool(idle_timeout=60) as pool:
+            with mock.patch('caspyr.pool.time.monotonic', return_value=0):
+                first = pool.get('refresh')
+            with mock.patch('caspyr.pool.time.monotonic', return_value=30):
+                self.assertIs(pool.get('refresh'), first)
+            with mock.patch('caspyr.pool.time.monotonic', return_value=80):
+                pool.get('other')
+                self.assertEqual(len(pool), 2)
+            with mock.patch('caspyr.pool.time.monotonic', return_value=200):
+                self.assertIsNot(pool.get('refresh'), first)
+                self.assertEqual(len(pool), 1)
+        self.assertEqual(pool.logins, 3)
+
+    def test_04_failed_login_keeps_shared_connections(self):
+        '''
+        Story: One org's refresh token is rejected, and another org's
+        session is closed on its own. The remaining org keeps using its
+        kept-alive connection through the shared transport.
+        '''
+        import requests
+        with self._pool() as pool:
+            s = pool.get('refresh-0')
+            s._request(f'{s.baseurl}/iaas/api/projects')
+            pools = pool._adapter.poolmanager.pools
+            self.assertEqual(len(pools), 1)
+            with self.assertRaises(requests.exceptions.HTTPError):
+                pool.get('')
+            pool.get('refresh-1').close()
+            self.assertEqual(len(pools), 1)
+            self.assertIsNotNone(s._request(f'{s.baseurl}/iaas/api/projects'))
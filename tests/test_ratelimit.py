@@ -0,0 +1,47 @@
+import unittest
+
+
+class RateLimiter_tests(unittest.TestCase):
+    '''
+    This set of tests checks the per-host token bucket limiter.
+    '''
+
+    def test_01_burst_then_steady_rate(self):
+        '''
+        Story: A host allows a burst of 3 at 10 requests per second.
+        The first three requests pass, the fourth waits about 0.1s.
+        '''
+        from caspyr import RateLimiter
+        limiter = RateLimiter(rate=10, burst=3)
+        url = 'https://api.mgmt.cloud.vmware.com/iaas/api/zones'
+        delays = [limiter.reserve(url) for _ in range(4)]
+        self.assertEqual(delays[:3], [0, 0, 0])
+        self.assertAlmostEqual(delays[3], 0.1, places=2)
+
+    def test_02_hosts_are_limited_separately(self):
+        '''
+        Story: The CSP console has its own limit and an unlisted host is
+        not throttled when no default rate is set.
+        '''
+        from caspyr import RateLimiter
+        limiter = RateLimiter(limits={'console.cloud.vmware.com': (1, 1)})
+        csp = 'https://console.cloud.vmware.com/csp/gateway/am/api/orgs/1'
+        cas = 'https://api.mgmt.cloud.vmware.com/iaas/api/zones'
+        self.assertEqual(limiter.reserve(csp), 0)
+        self.assertGreater(limiter.reserve(csp), 0)
+        self.assertEqual([limiter.reserve(cas) for _ in range(5)], [0] * 5)
+
+    def test_03_sessions_share_a_limiter(self):
+        '''
+        Story: Two sessions given the same limiter draw from one bucket.
+        '''
+        from caspyr import RateLimiter, Session
+        limiter = RateLimiter(rate=1, burst=1)
+        a = Session('a', rate_limiter=limiter)
+        b = Session('b', rate_limiter=limiter)
+        self.assertEqual(a.rate_limiter.reserve(a.baseurl), 0)
+        self.assertGreater(b.rate_limiter.reserve(b.baseurl), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from tests.support import request_document
+
+
+class Request_tests(unittest.TestCase):
+    '''
+    This set of tests checks finding blueprint requests still in progress.
+    '''
+
+    def test_01_status_filter_on_documents(self):
+        '''
+        Story: User lists the incomplete requests among 450. The API
+        filters on status, so no request is described.
+        '''
+        from caspyr import Request, Session
+        from caspyr.fakeserver import FakeCAS
+        with FakeCAS(tokens=('token',)) as server:
+            for i in range(450):
+                server.add('/blueprint/api/blueprint-requests',
+                           request_document(f'r-{i}',
+                                             'STARTED' if i % 3 == 0 else 'FINISHED'))
+            with Session('token', baseurl=server.url) as session:
+                incomplete = Request.list_incomplete(session)
+            hits = dict(server.hits)
+        self.assertEqual(incomplete, [{'id': f'r-{i}'} for i in range(0, 450, 3)])
+        self.assertEqual(sum(hits.values()), 1)
+
+    def test_02_parallel_describes_for_links(self):
+        '''
+        Story: The API answers with links only. Each request is described
+        with at most max_workers in flight, and matches are streamed.
+        '''
+        from caspyr import Request, Session
+        session = Session('token')
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request(url, **kwargs):
+            if '$filter' in url:
+                return {'links': [f'/blueprint/api/blueprint-requests/r-{i}'
+                                  for i in range(40)]}
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            id = url.rsplit('/', 1)[1]
+            status = 'STARTED' if int(id[2:]) % 4 == 0 else 'FINISHED'
+            return request_document(id, status)
+
+        with mock.patch.object(session, '_request', side_effect=request):
+            started = time.monotonic()
+            matches = Request.list_incomplete(session, stream=True,
+                                              max_workers=5)
+            incomplete = sorted(m['id'] for m in matches)
+            elapsed = time.monotonic() - started
+        self.assertEqual(incomplete, sorted(f'r-{i}' for i in range(0, 40, 4)))
+        self.assertEqual(peak[0], 5)
+        self.assertLess(elapsed, 40 * 0.02 / 2)
+
+    def test_03_documents_are_paged_once(self):
+        '''
+        Story: 450 requests are in progress, over three pages. Each page
+        is fetched once, with no probe of the collection beforehand.
+        '''
+        from caspyr import Request, Session
+        from caspyr.fakeserver import FakeCAS
+        with FakeCAS(tokens=('token',)) as server:
+            for i in range(450):
+                server.add('/blueprint/api/blueprint-requests',
+                           request_document(f'r-{i}', 'STARTED'))
+            with Session('token', baseurl=server.url) as session:
+                incomplete = Request.list_incomplete(session)
+            hits = dict(server.hits)
+        self.assertEqual(len(incomplete), 450)
+        self.assertEqual(sum(hits.values()), 3)
@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+
+from tests.support import response
+
+
+class RetryPolicy_tests(unittest.TestCase):
+    '''
+    This set of tests checks when the RetryPolicy allows a retry.
+    '''
+
+    def test_01_only_idempotent_methods_are_retried(self):
+        '''
+        Story: A throttled POST is not retried, a throttled GET is.
+        '''
+        from caspyr.retry import RetryPolicy
+        policy = RetryPolicy()
+        self.assertIsNone(policy.sleep_for('POST', 0, 0, status=429))
+        self.assertIsNotNone(policy.sleep_for('GET', 0, 0, status=429))
+        self.assertIsNone(policy.sleep_for('GET', 0, 0, status=404))
+
+    def test_02_backoff_is_capped_and_jittered(self):
+        '''
+        Story: Waits stay within the exponential cap for the attempt.
+        '''
+        from caspyr.retry import RetryPolicy
+        policy = RetryPolicy(total=10, backoff_factor=1, max_backoff=4)
+        for attempt in range(10):
+            delay = policy.sleep_for('GET', attempt, 0, status=503)
+            self.assertLessEqual(delay, min(4, 2 ** attempt))
+
+    def test_03_retry_after_and_budget(self):
+        '''
+        Story: Retry-After is honoured unless it would exceed the budget.
+        '''
+        from caspyr.retry import RetryPolicy
+        policy = RetryPolicy(budget=10)
+        self.assertEqual(policy.sleep_for('GET', 0, 0, 429, '7'), 7)
+        self.assertIsNone(policy.sleep_for('GET', 0, 5, 429, '7'))
+        self.assertEqual(policy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+
+class Session_retry_tests(unittest.TestCase):
+    '''
+    This set of tests checks that Session._request retries throttled calls.
+    '''
+
+    def test_01_get_is_retried_until_success(self):
+        '''
+        Story: A GET receives a 429 and then a 200.
+        The caller receives the JSON of the successful response.
+        '''
+        from caspyr import Session
+        session = Session('token')
+        responses = [response(429, headers={'Retry-After': '0'}),
+                     response(200, b'{"content": []}')]
+        with mock.patch.object(session._http, 'request',
+                               side_effect=responses) as request:
+            self.assertEqual(session._request('https://example/iaas/api/zones'),
+                             {'content': []})
+        self.assertEqual(request.call_count, 2)
+
+    def test_02_post_is_not_retried(self):
+        '''
+        Story: A POST receives a 503. It is sent once only.
+        '''
+        from caspyr import Session
+        session = Session('token')
+        with mock.patch.object(session._http, 'request',
+                               return_value=response(503)) as request:
+            self.assertIsNone(session._request('https://example/iaas/api/zones',
+                                               request_method='POST',
+                                               payload={'name': 'zone'}))
+        self.assertEqual(request.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
@@ -0,0 +1,76 @@
+import unittest
+
+
+class Session_transport_tests(unittest.TestCase):
+    '''
+    This set of tests checks the Session transport without contacting
+    VMware Cloud Services.
+    '''
+
+    def test_01_session_mounts_pooled_adapter(self):
+        '''
+        Story: User creates a session with a custom pool size.
+        The pooled adapter serving https:// uses the requested size.
+        '''
+        from caspyr import Session
+        session = Session('token', pool_connections=2, pool_maxsize=20)
+        adapter = session._http.get_adapter('https://api.mgmt.cloud.vmware.com')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 20)
+        session.close()
+
+    def test_02_session_closes_as_context_manager(self):
+        '''
+        Story: User uses the session as a context manager.
+        The pooled connections are released when the block exits.
+        '''
+        from caspyr import Session
+        with Session('token') as session:
+            adapter = session._http.get_adapter('https://api.mgmt.cloud.vmware.com')
+            adapter.poolmanager.connection_from_url(session.baseurl)
+            self.assertEqual(len(adapter.poolmanager.pools), 1)
+        self.assertEqual(len(adapter.poolmanager.pools), 0)
+
+
+class Session_codec_tests(unittest.TestCase):
+    '''
+    This set of tests checks that request and response bodies go through
+    the session codec.
+    '''
+
+    def test_01_payload_and_response_use_codec(self):
+        '''
+        Story: User supplies a custom codec.
+        The POST payload is encoded and the response decoded with it.
+        '''
+        import json
+        from unittest import mock
+        import requests
+        from caspyr import Session
+
+        class Codec(object):
+            calls = []
+
+            def dumps(self, obj):
+                self.calls.append('dumps')
+                return json.dumps(obj)
+
+            def loads(self, data):
+                self.calls.append('loads')
+                return json.loads(data)
+
+        r = requests.Response()
+        r.status_code = 200
+        r._content = b'{"id": "bp"}'
+        session = Session('token', codec=Codec())
+        with mock.patch.object(session._http, 'request', return_value=r) as request:
+            j = session._request(f'{session.baseurl}/blueprint/api/blueprints',
+                                 request_method='POST',
+                                 payload={'name': 'bp'})
+        self.assertEqual(j, {'id': 'bp'})
+        self.assertEqual(Codec.calls, ['dumps', 'loads'])
+        self.assertEqual(request.call_args[1]['data'], '{"name": "bp"}')
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from tests.support import run
+
+
+class SingleFlight_tests(unittest.TestCase):
+    '''
+    This set of tests checks that identical concurrent calls are coalesced.
+    '''
+
+    def test_01_threads_share_one_call(self):
+        '''
+        Story: Eight threads ask for Project.list at the same time.
+        One request is sent and every thread receives its result.
+        '''
+        from caspyr import Project, Session, SingleFlight
+        session = Session('token', single_flight=SingleFlight())
+        barrier = threading.Barrier(8)
+
+        def slow_request(*args, **kwargs):
+            time.sleep(0.2)
+            r = requests.Response()
+            r.status_code = 200
+            r._content = b'{"content": [{"id": "p"}]}'
+            return r
+
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(Project.list(session))
+
+        with mock.patch.object(session._http, 'request',
+                               side_effect=slow_request) as request:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(session.single_flight.coalesced, 7)
+        self.assertEqual(results, [[{'id': 'p'}]] * 8)
+
+    def test_02_coroutines_share_one_call_and_error(self):
+        '''
+        Story: Three coroutines await the same key and the call fails.
+        The call runs once and every coroutine receives the error.
+        '''
+        from caspyr import SingleFlight
+        flight = SingleFlight()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            raise ValueError('boom')
+
+        async def main():
+            return await asyncio.gather(*[flight.do_async('k', failing)
+                                          for _ in range(3)],
+                                        return_exceptions=True)
+
+        results = run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.coalesced, 2)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
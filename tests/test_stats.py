@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+from tests.support import response
+
+
+class Stats_tests(unittest.TestCase):
+    '''
+    This set of tests checks the per-endpoint request statistics.
+    '''
+
+    def test_01_routes_are_normalized(self):
+        '''
+        Story: Calls for different machines are counted under one route,
+        while API versions and collection names are kept.
+        '''
+        from caspyr.stats import route
+        self.assertEqual(route('https://h/iaas/api/machines/8f2c-11e9?$top=1'),
+                         '/iaas/api/machines/{id}')
+        self.assertEqual(route('https://h/iaas/api/machines/m-1/network-interfaces/0'),
+                         '/iaas/api/machines/{id}/network-interfaces/{id}')
+        self.assertEqual(route('https://h/csp/gateway/portal/api/v2/orgs/a1b2/users'),
+                         '/csp/gateway/portal/api/v2/orgs/{id}/users')
+
+    def test_02_session_records_calls(self):
+        '''
+        Story: User describes two machines, one of which fails, and
+        creates a project. stats() reports counts, errors, bytes and
+        latencies per method and route.
+        '''
+        from caspyr import Session
+        session = Session('token')
+        responses = [response(200, b'{"id": "m-1"}'),
+                     response(404, b'{"message": "not found"}'),
+                     response(201, b'{"id": "p-1"}')]
+        with mock.patch.object(session._http, 'request', side_effect=responses):
+            session._request(f'{session.baseurl}/iaas/api/machines/m-1')
+            session._request(f'{session.baseurl}/iaas/api/machines/m-2')
+            session._request(f'{session.baseurl}/iaas/api/projects',
+                             request_method='POST', payload={'name': 'p'})
+        stats = session.stats()
+        machines = stats[('GET', '/iaas/api/machines/{id}')]
+        self.assertEqual(machines['count'], 2)
+        self.assertEqual(machines['errors'], 1)
+        self.assertEqual(machines['bytes_in'], len(b'{"id": "m-1"}') +
+                         len(b'{"message": "not found"}'))
+        self.assertEqual(sum(machines['latency_buckets'].values()), 2)
+        projects = stats[('POST', '/iaas/api/projects')]
+        self.assertEqual(projects['bytes_out'],
+                         len(session.codec.dumps({'name': 'p'})))
+
+    def test_03_prometheus_text(self):
+        '''
+        Story: Operator scrapes the stats in Prometheus format. The
+        histogram buckets are cumulative and end with +Inf.
+        '''
+        from caspyr import RequestStats
+        stats = RequestStats()
+        stats.record('GET', 'https://h/iaas/api/zones', 0.02)
+        stats.record('GET', 'https://h/iaas/api/zones', 0.3, error=True)
+        text = stats.prometheus()
+        labels = 'method="GET",route="/iaas/api/zones"'
+        self.assertIn(f'caspyr_requests_total{{{labels}}} 2', text)
+        self.assertIn(f'caspyr_request_errors_total{{{labels}}} 1', text)
+        self.assertIn(f'caspyr_request_duration_seconds_bucket{{{labels},le="0.025"}} 1', text)
+        self.assertIn(f'caspyr_request_duration_seconds_bucket{{{labels},le="0.5"}} 2', text)
+        self.assertIn(f'caspyr_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f'caspyr_request_duration_seconds_count{{{labels}}} 2', text)
@@ -0,0 +1,66 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+
+class ArrayItems_tests(unittest.TestCase):
+    '''
+    This set of tests checks incremental decoding of list responses.
+    '''
+
+    def test_01_items_decode_across_any_chunking(self):
+        '''
+        Story: A listing with escapes, nested brackets and multi-byte
+        characters arrives split at every possible size.
+        The same items come out as from a full decode.
+        '''
+        from caspyr.stream import iter_items
+        doc = {'links': ['/a', '/b'],
+               'content': [{'id': str(i), 'name': f'vm-é-{i}',
+                            'tags': [{'key': ']}",', 'value': i * 1.5}]}
+                           for i in range(50)],
+               'totalElements': 50}
+        body = json.dumps(doc, ensure_ascii=False).encode()
+        for size in (1, 2, 3, 5, 64, len(body)):
+            chunks = [body[i:i + size] for i in range(0, len(body), size)]
+            self.assertEqual(list(iter_items(chunks)), doc['content'])
+
+    def test_02_truncated_body_raises(self):
+        '''
+        Story: The connection drops in the middle of the array.
+        '''
+        from caspyr.stream import iter_items
+        with self.assertRaises(ValueError):
+            list(iter_items([b'{"content": [{"id": "1"}, {"id"']))
+
+
+class Session_stream_tests(unittest.TestCase):
+    '''
+    This set of tests checks streamed listing through the Session.
+    '''
+
+    def test_01_list_orphaned_streams_document_links(self):
+        '''
+        Story: User streams Machine.list_orphaned.
+        The document links are yielded from a streamed response.
+        '''
+        from caspyr import Machine, Session
+        session = Session('token')
+        r = requests.Response()
+        r.status_code = 200
+        r.raw = io.BytesIO(b'{"documentLinks": ["/resources/compute/1", '
+                           b'"/resources/compute/2"], "documentCount": 2}')
+        with mock.patch.object(session._http, 'request',
+                               return_value=r) as request:
+            links = list(Machine.list_orphaned(session, stream=True))
+        self.assertEqual(links, ['/resources/compute/1',
+                                 '/resources/compute/2'])
+        self.assertTrue(request.call_args[1]['stream'])
+        self.assertIn('gzip', request.call_args[1]['headers']['Accept-Encoding'])
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
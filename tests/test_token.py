@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+
+def _authorize_response(token, expires_in=1799):
+    r = requests.Response()
+    r.status_code = 200
+    r._content = (f'{{"access_token": "{token}", '
+                  f'"expires_in": {expires_in}}}').encode()
+    return r
+
+
+class Token_lifetime_tests(unittest.TestCase):
+    '''
+    This set of tests checks token expiry tracking and refresh.
+    '''
+
+    def test_01_login_records_expiry(self):
+        '''
+        Story: User logs in and CSP grants a token for 1799 seconds.
+        The session records when it expires and when it will refresh.
+        '''
+        from caspyr import Session
+        with mock.patch('requests.Session.post',
+                        return_value=_authorize_response('a')):
+            session = Session.login('refresh', auto_refresh=False)
+        self.assertEqual(session.token, 'a')
+        self.assertAlmostEqual(session.expires_at, time.time() + 1799, delta=5)
+        self.assertAlmostEqual(session._refresh_at,
+                               session.expires_at - Session.refresh_margin,
+                               delta=1)
+        session.close()
+
+    def test_02_stale_token_is_refreshed_before_request(self):
+        '''
+        Story: A request is made after the refresh point has passed.
+        The token is refreshed first and the request uses the new token.
+        '''
+        from caspyr import Session
+        with mock.patch('requests.Session.post',
+                        side_effect=[_authorize_response('a', 10),
+                                     _authorize_response('b')]):
+            session = Session.login('refresh', auto_refresh=False)
+            session._refresh_at = time.time() - 1
+            ok = requests.Response()
+            ok.status_code = 200
+            ok._content = b'{}'
+            with mock.patch.object(session._http, 'request',
+                                   return_value=ok) as request:
+                session._request(f'{session.baseurl}/iaas/api/zones')
+        self.assertEqual(request.call_args[1]['headers']['csp-auth-token'], 'b')
+        session.close()
+
+
+class TokenCache_tests(unittest.TestCase):
+    '''
+    This set of tests checks that processes share a cached access token.
+    '''
+
+    def test_01_second_login_reuses_cached_token(self):
+        '''
+        Story: Two sessions log in with the same refresh token and cache.
+        Only the first calls /auth/api-tokens/authorize.
+        '''
+        from caspyr import Session, TokenCache
+        with tempfile.TemporaryDirectory() as d:
+            cache = TokenCache(os.path.join(d, 'tokens.json'))
+            with mock.patch('requests.Session.post',
+                            return_value=_authorize_response('a')) as post:
+                first = Session.login('refresh', token_cache=cache,
+                                      auto_refresh=False)
+                second = Session.login('refresh', token_cache=cache,
+                                       auto_refresh=False)
+            self.assertEqual(post.call_count, 1)
+            self.assertEqual(second.token, 'a')
+            self.assertEqual(os.stat(cache.path).st_mode & 0o777, 0o600)
+            self.assertNotIn('refresh', open(cache.path).read())
+            first.close()
+            second.close()
+
+
+if __name__ == '__main__':
+    unittest.main(warnings='ignore')
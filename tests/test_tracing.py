@@ -0,0 +1,137 @@
+import contextlib
+import unittest
+from unittest import mock
+
+import requests
+
+from tests.support import response
+
+
+class _Span(object):
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class _Tracer(object):
+    '''An in-memory tracer with the OpenTelemetry span API caspyr uses.'''
+
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = _Span(name, self._stack[-1] if self._stack else None, attributes)
+        self.spans.append(span)
+        self._stack.append(span)
+        try:
+            yield span
+        finally:
+            self._stack.pop()
+
+
+class Tracing_tests(unittest.TestCase):
+    '''
+    This set of tests checks request hooks and tracing spans.
+    '''
+
+    def test_01_hooks_see_every_attempt(self):
+        '''
+        Story: A GET is throttled once and then succeeds. on_request and
+        on_response are called for both attempts.
+        '''
+        from caspyr import RetryPolicy, Session
+        calls = []
+        session = Session('token',
+                          retry=RetryPolicy(backoff_factor=0),
+                          on_request=lambda m, u, h, d: calls.append(('request', m)),
+                          on_response=lambda m, u, r, e: calls.append(('response', r.status_code)))
+        with mock.patch.object(session._http, 'request',
+                               side_effect=[response(429), response(200)]):
+            session._request(f'{session.baseurl}/iaas/api/zones')
+        self.assertEqual(calls, [('request', 'GET'), ('response', 429),
+                                 ('request', 'GET'), ('response', 200)])
+
+    def test_02_on_error(self):
+        '''
+        Story: A connection fails. on_error receives the exception and the
+        exception still reaches the caller.
+        '''
+        from caspyr import RetryPolicy, Session
+        errors = []
+        session = Session('token',
+                          retry=RetryPolicy(total=0),
+                          on_error=lambda m, u, e, elapsed: errors.append(e))
+        error = requests.exceptions.ConnectionError('refused')
+        with mock.patch.object(session._http, 'request', side_effect=error):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                session._request(f'{session.baseurl}/iaas/api/zones')
+        self.assertEqual(errors, [error])
+
+    def test_03_helper_spans_nest_http_spans(self):
+        '''
+        Story: Machine.get_ip describes a machine, then its network
+        interface. Its HTTP spans nest under one Machine.get_ip span.
+        '''
+        from caspyr import Machine, Session
+        tracer = _Tracer()
+        session = Session('token', tracer=tracer)
+        machine = (b'{"id": "m-1", "_links": {"network-interfaces": '
+                   b'{"hrefs": ["/iaas/api/machines/m-1/network-interfaces/n-1"]}}}')
+        responses = [response(200, machine),
+                     response(200, b'{"addresses": ["10.0.0.5"]}')]
+        with mock.patch.object(session._http, 'request', side_effect=responses):
+            address = Machine.get_ip(session, 'm-1')
+        self.assertEqual(address, '10.0.0.5')
+        parent = tracer.spans[0]
+        self.assertEqual(parent.name, 'Machine.get_ip')
+        self.assertEqual([s.name for s in tracer.spans[1:]],
+                         ['GET /iaas/api/machines/{id}',
+                          'GET /iaas/api/machines/{id}/network-interfaces/{id}'])
+        self.assertTrue(all(s.parent is parent for s in tracer.spans[1:]))
+        self.assertEqual(tracer.spans[1].attributes['http.status_code'], 200)
+
+    def test_04_helper_called_with_keywords(self):
+        '''
+        Story: User calls a traced helper with the session and the other
+        arguments by keyword. Its span is still opened on the session.
+        '''
+        from caspyr import Machine, Session
+        tracer = _Tracer()
+        session = Session('token', tracer=tracer)
+        machine = (b'{"id": "m-1", "_links": {"network-interfaces": '
+                   b'{"hrefs": ["/iaas/api/machines/m-1/network-interfaces/n-1"]}}}')
+        responses = [response(200, machine),
+                     response(200, b'{"addresses": ["10.0.0.5"]}')]
+        with mock.patch.object(session._http, 'request', side_effect=responses):
+            address = Machine.get_ip(session=session, machine_id='m-1')
+        self.assertEqual(address, '10.0.0.5')
+        self.assertEqual(tracer.spans[0].name, 'Machine.get_ip')
+
+    def test_05_streamed_helper_spans_its_requests(self):
+        '''
+        Story: User streams the incomplete requests over two pages. No
+        request is made until the stream is read, and both page requests
+        nest under one Request.list_incomplete span.
+        '''
+        from caspyr import Request, Session
+        tracer = _Tracer()
+        session = Session('token', tracer=tracer)
+        pages = [b'{"content": [%s], "totalElements": 201}' % b', '.join(
+                     b'{"id": "r-%d", "status": "STARTED"}' % i
+                     for i in range(start, end))
+                 for start, end in ((0, 200), (200, 201))]
+        with mock.patch.object(session._http, 'request',
+                               side_effect=[response(200, p) for p in pages]):
+            matches = Request.list_incomplete(session, stream=True)
+            self.assertEqual(tracer.spans, [])
+            self.assertEqual(len(list(matches)), 201)
+        parent = tracer.spans[0]
+        self.assertEqual(parent.name, 'Request.list_incomplete')
+        self.assertEqual(len(tracer.spans), 3)
+        self.assertTrue(all(s.parent is parent for s in tracer.spans[1:]))